@@ -0,0 +1,195 @@
+import argparse
+import concurrent.futures
+import contextlib
+import csv
+import datetime
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+from keyword_matcher import KeywordMatcher, load_rules
+from log_generator import write_log
+from main import RUN_SIZE, _spill_run, generate_markdown_report, merge_runs, read_and_print_log
+from timestamp_parser import parse_timestamp
+
+try:
+    import resource
+except ImportError:  # Windows에는 resource 모듈이 없음
+    resource = None
+
+# 로그 분석기의 단계별(parse, classify, sort, report) 성능과 전체 실행 성능을 로그 크기별로 측정하는 벤치마크.
+# 측정 결과(처리량, 최대 메모리 사용량)는 bench_results.csv에 이어서 기록하고,
+# 같은 크기/단계의 이전 결과보다 처리량이 기준 이상 떨어지면 회귀(regression)로 표시함.
+# 실행: python bench_analyzer.py --sizes 10000,1000000,10000000
+
+RESULTS_FILENAME = 'bench_results.csv'
+RESULTS_FIELDS = ['date', 'lines', 'stage', 'seconds', 'lines_per_sec', 'peak_rss_kb']
+DEFAULT_SIZES = '10000,1000000,10000000'
+
+def _peak_rss_kb():
+    # 현재 프로세스의 최대 상주 메모리(KiB). Linux는 KiB, macOS는 바이트 단위로 알려줌
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+def _iter_lines(log_path):
+    with open(log_path, 'r', encoding='utf-8') as f:
+        f.readline()
+        for line in f:
+            yield line.rstrip('\n')
+
+def bench_parse(log_path):
+    # 타임스탬프 파싱: 라인을 읽는 시간을 포함
+    started = time.perf_counter()
+    for line in _iter_lines(log_path):
+        parse_timestamp(line)
+    return time.perf_counter() - started
+
+def bench_classify(log_path):
+    # 문제 이벤트 분류: 라인을 읽는 시간을 포함하며 규칙 컴파일은 제외
+    matcher = KeywordMatcher(load_rules())
+    started = time.perf_counter()
+    for line in _iter_lines(log_path):
+        matcher.match(line)
+    return time.perf_counter() - started
+
+def bench_sort(log_path):
+    # 시간 역순 external merge sort: run 정렬/임시 파일 쓰기와 병합 시간만 측정 (읽기와 파싱은 제외)
+    elapsed = 0.0
+    with tempfile.TemporaryDirectory() as run_dir:
+        run = []
+        run_paths = []
+        for line in _iter_lines(log_path):
+            ts = parse_timestamp(line)
+            if ts is not None:
+                run.append((ts, line))
+                if len(run) >= RUN_SIZE:
+                    started = time.perf_counter()
+                    _spill_run(run, run_dir, run_paths)
+                    elapsed += time.perf_counter() - started
+        started = time.perf_counter()
+        if run:
+            _spill_run(run, run_dir, run_paths)
+        for _ in merge_runs(run_paths):
+            pass
+        elapsed += time.perf_counter() - started
+    return elapsed
+
+def bench_report(log_path):
+    # Markdown 보고서 생성: 분석은 미리 해두고 보고서를 쓰는 시간만 측정
+    stats, templates, chains = read_and_print_log(log_path, print_lines=False)
+    started = time.perf_counter()
+    generate_markdown_report(stats, templates, chains)
+    return time.perf_counter() - started
+
+def bench_total(log_path):
+    # 전체 실행: 분석 + 시간 역순 출력(/dev/null로 버림) + 보고서
+    started = time.perf_counter()
+    with open(os.devnull, 'w', encoding='utf-8') as devnull, contextlib.redirect_stdout(devnull):
+        stats, templates, chains = read_and_print_log(log_path)
+    generate_markdown_report(stats, templates, chains)
+    return time.perf_counter() - started
+
+_STAGE_FUNCTIONS = {
+    'parse': bench_parse,
+    'classify': bench_classify,
+    'sort': bench_sort,
+    'report': bench_report,
+    'total': bench_total,
+}
+
+def _run_stage(task):
+    # 자식 프로세스에서 단계 하나를 측정하고 (소요 시간, 최대 메모리)를 반환
+    stage, log_path = task
+    elapsed = _STAGE_FUNCTIONS[stage](log_path)
+    return elapsed, _peak_rss_kb()
+
+def measure(stage, log_path):
+    # 단계마다 새 프로세스(spawn)에서 실행하여 최대 메모리 사용량이 다른 단계의 영향을 받지 않도록 함
+    context = multiprocessing.get_context('spawn')
+    with concurrent.futures.ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+        return executor.submit(_run_stage, (stage, log_path)).result()
+
+def load_previous_results(results_path):
+    # 이전 결과 파일에서 (라인 수, 단계)별 가장 최근의 처리량을 읽어옴
+    previous = {}
+    try:
+        with open(results_path, 'r', encoding='utf-8', newline='') as f:
+            for row in csv.DictReader(f):
+                previous[(int(row['lines']), row['stage'])] = float(row['lines_per_sec'])
+    except FileNotFoundError:
+        pass
+    return previous
+
+def append_results(results_path, rows):
+    is_new = not os.path.exists(results_path)
+    with open(results_path, 'a', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=RESULTS_FIELDS)
+        if is_new:
+            writer.writeheader()
+        writer.writerows(rows)
+
+def main():
+    parser = argparse.ArgumentParser(description='로그 분석기 단계별 벤치마크')
+    parser.add_argument('--sizes', default=DEFAULT_SIZES, help='측정할 로그 라인 수 목록 (기본값: ' + DEFAULT_SIZES + ')')
+    parser.add_argument('--stages', default=','.join(_STAGE_FUNCTIONS), help='측정할 단계 목록 (기본값: 전체)')
+    parser.add_argument('--malformed', type=float, default=0.01, help='형식이 잘못된 라인의 비율 (기본값: 0.01)')
+    parser.add_argument('--results', default=RESULTS_FILENAME, help='결과를 이어서 기록할 CSV 파일')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='이전 결과보다 처리량이 이 비율 이상 떨어지면 회귀로 표시 (기본값: 0.2)')
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(',')]
+    stages = [stage.strip() for stage in args.stages.split(',')]
+    for stage in stages:
+        if stage not in _STAGE_FUNCTIONS:
+            parser.error('알 수 없는 단계입니다: ' + stage)
+    results_path = os.path.abspath(args.results)
+    previous = load_previous_results(results_path)
+    date = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    regressions = 0
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        # 분석기는 현재 디렉터리에 problematic.log와 log_analysis.md를 쓰므로 임시 디렉터리에서 실행
+        os.chdir(work_dir)
+        for size in sizes:
+            log_path = os.path.join(work_dir, 'synthetic_mission.log')
+            print('합성 로그 생성 중: %d lines' % size)
+            write_log(log_path, size, malformed_ratio=args.malformed, disorder_seconds=5)
+
+            print('--- 분석기 벤치마크 (%d lines) ---' % size)
+            rows = []
+            for stage in stages:
+                elapsed, peak_rss_kb = measure(stage, log_path)
+                throughput = size / elapsed if elapsed > 0 else float('inf')
+                rows.append({
+                    'date': date,
+                    'lines': size,
+                    'stage': stage,
+                    'seconds': '%.4f' % elapsed,
+                    'lines_per_sec': '%.0f' % throughput,
+                    'peak_rss_kb': peak_rss_kb if peak_rss_kb is not None else '',
+                })
+                note = ''
+                baseline = previous.get((size, stage))
+                if baseline:
+                    ratio = throughput / baseline
+                    note = '  이전 대비 %.2fx' % ratio
+                    if ratio < 1 - args.threshold:
+                        note += '  << 회귀'
+                        regressions += 1
+                rss = '%8d KiB' % peak_rss_kb if peak_rss_kb is not None else '%12s' % '-'
+                print('%-9s %9.3f s  %12.0f lines/s  peak %s%s' % (stage, elapsed, throughput, rss, note))
+            append_results(results_path, rows)
+            os.remove(log_path)
+
+    print('\n결과를 %s에 기록했습니다.' % results_path)
+    if regressions:
+        print('처리량이 %d%% 이상 떨어진 항목: %d개' % (args.threshold * 100, regressions))
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
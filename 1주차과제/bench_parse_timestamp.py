@@ -0,0 +1,53 @@
+import datetime
+import random
+import timeit
+
+from timestamp_parser import parse_timestamp
+
+# parse_timestamp()의 고정 형식 파서와 기존 strptime 경로의 속도를 비교하는 마이크로 벤치마크.
+# 실행: python bench_parse_timestamp.py
+
+LINE_COUNT = 200000
+REPEAT = 5
+
+def strptime_parse_timestamp(line):
+    # 비교 기준: 기존 구현과 동일하게 매 라인마다 strptime을 호출
+    try:
+        return datetime.datetime.strptime(line[:19], '%Y-%m-%d %H:%M:%S')
+    except ValueError:
+        return None
+
+def make_lines(count):
+    # 며칠에 걸친 미션 로그와 비슷한 형태의 라인을 생성 (1% 정도는 타임스탬프가 없는 라인)
+    start = datetime.datetime(2023, 8, 27, 10, 0, 0)
+    lines = []
+    for i in range(count):
+        if random.random() < 0.01:
+            lines.append('malformed line without timestamp')
+            continue
+        ts = start + datetime.timedelta(seconds=i * 3)
+        lines.append(ts.strftime('%Y-%m-%d %H:%M:%S') + ',INFO,Telemetry packet received.')
+    return lines
+
+def bench(label, func, lines):
+    # REPEAT번 측정한 값 중 가장 빠른 값을 라인당 나노초로 출력
+    best = min(timeit.repeat(lambda: [func(line) for line in lines], number=1, repeat=REPEAT))
+    print('%-28s %8.1f ns/line  %10.0f lines/s' % (label, best / len(lines) * 1e9, len(lines) / best))
+    return best
+
+def main():
+    random.seed(0)
+    lines = make_lines(LINE_COUNT)
+
+    # 두 구현의 결과가 모든 라인에서 같은지 먼저 확인
+    for line in lines:
+        assert parse_timestamp(line) == strptime_parse_timestamp(line), line
+
+    print('--- parse_timestamp 벤치마크 (%d lines) ---' % LINE_COUNT)
+    baseline = bench('strptime', strptime_parse_timestamp, lines)
+    fast = bench('parse_timestamp', parse_timestamp, lines)
+    epoch = bench('parse_timestamp(as_epoch)', lambda line: parse_timestamp(line, as_epoch=True), lines)
+    print('speedup: %.1fx (datetime), %.1fx (epoch)' % (baseline / fast, baseline / epoch))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+import argparse
+import os
+import tempfile
+import time
+
+from log_generator import write_log
+from main import read_and_print_log
+
+# read_and_print_log()를 --workers 1부터 N까지 바꿔가며 실행하여 병렬 분석의 확장성을 측정하는 벤치마크.
+# 실행: python bench_workers.py --lines 10000000 --max-workers 8
+
+def main():
+    parser = argparse.ArgumentParser(description='병렬 로그 분석 벤치마크')
+    parser.add_argument('--lines', type=int, default=10000000, help='합성 로그의 라인 수 (기본값: 10,000,000)')
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count() or 1, help='측정할 최대 프로세스 수')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        # read_and_print_log()는 현재 디렉터리에 problematic.log를 쓰므로 임시 디렉터리에서 실행
+        os.chdir(work_dir)
+        log_path = os.path.join(work_dir, 'synthetic_mission.log')
+        print('합성 로그 생성 중: %d lines' % args.lines)
+        write_log(log_path, args.lines, disorder_seconds=5)
+
+        print('--- 병렬 분석 벤치마크 (%d lines) ---' % args.lines)
+        # 1, 2, 4, ... 배수로 늘려가며 측정하고, 마지막에는 항상 --max-workers 값으로 측정
+        worker_counts = [1]
+        while worker_counts[-1] * 2 < args.max_workers:
+            worker_counts.append(worker_counts[-1] * 2)
+        if args.max_workers > 1:
+            worker_counts.append(args.max_workers)
+
+        baseline = None
+        for workers in worker_counts:
+            started = time.perf_counter()
+            stats, _, _ = read_and_print_log(log_path, workers=workers, print_lines=False)
+            elapsed = time.perf_counter() - started
+            if baseline is None:
+                baseline = elapsed
+            print('workers=%-3d %8.2f s  %10.0f lines/s  speedup %.2fx'
+                  % (workers, elapsed, stats['total'] / elapsed, baseline / elapsed))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,125 @@
+from collections import deque
+
+from timestamp_parser import format_epoch
+
+# 문제 이벤트가 정해진 순서대로, 정해진 시간 안에 이어서 발생한 연쇄(chain)를 찾는 모듈.
+# 예: oxygen_tank_unstable → oxygen_tank_explosion 이 10분 안에 발생
+# 라인을 읽는 즉시 한 건씩 처리하므로 전체 분석과 follow 모드 모두에서 사용할 수 있음.
+
+# 연쇄 규칙 파일. 한 줄에 하나의 규칙을 'name,steps,within_seconds,description' 형식으로 작성 (첫 줄은 헤더)
+# steps는 problem_rules.csv의 규칙 이름을 '>'로 이어서 순서를 나타냄.
+CHAIN_RULES_FILENAME = 'chain_rules.csv'
+
+# 규칙 파일이 없을 때 사용하는 기본 연쇄 규칙
+DEFAULT_CHAIN_RULES = [
+    ('oxygen_tank_failure', ('oxygen_tank_unstable', 'oxygen_tank_explosion'), 600, '산소 탱크 불안정 후 폭발'),
+]
+# 규칙별로 진행 중인 연쇄를 최대 몇 개까지 기억할지 (넘으면 가장 오래된 것부터 버림)
+MAX_PENDING = 10000
+# 보고서에 인용하기 위해 규칙별로 기억하는 최근 완성된 연쇄 수
+MAX_RECENT = 20
+
+def load_chain_rules(rules_filename=CHAIN_RULES_FILENAME):
+    # 연쇄 규칙 파일을 읽어 (이름, 단계 튜플, 제한 시간(초), 설명) 튜플의 리스트로 반환.
+    # 파일이 없으면 기본 규칙을 사용하고, 형식이 잘못된 줄은 경고를 출력한 뒤 건너뜀.
+    try:
+        with open(rules_filename, 'r', encoding='utf-8') as f:
+            f.readline()  # CSV 헤더: 'name,steps,within_seconds,description'
+            rows = [line.rstrip('\n') for line in f]
+    except FileNotFoundError:
+        return list(DEFAULT_CHAIN_RULES)
+
+    rules = []
+    for row in rows:
+        if not row.strip() or row.startswith('#'):
+            continue
+        fields = [field.strip() for field in row.split(',', 3)]
+        try:
+            name, steps, within = fields[0], tuple(step.strip() for step in fields[1].split('>')), int(fields[2])
+        except (IndexError, ValueError):
+            print('잘못된 연쇄 규칙을 건너뜁니다:', row)
+            continue
+        if len(steps) < 2 or within < 0:
+            print('잘못된 연쇄 규칙을 건너뜁니다:', row)
+            continue
+        rules.append((name, steps, within, fields[3] if len(fields) > 3 else name))
+    return rules
+
+class ChainDetector:
+    """
+    ChainDetector 클래스는 (epoch 초, 일치한 규칙 이름들) 형태의 이벤트를 시간순으로 받아
+    연쇄 규칙의 단계가 순서대로, 첫 단계로부터 제한 시간 안에 모두 발생한 경우를 찾습니다.
+    규칙마다 '다음 단계를 기다리는 연쇄'를 단계별 deque에 보관하며, 제한 시간이 지난 연쇄는
+    deque 앞쪽에서 바로 버리므로 이벤트 하나를 처리하는 비용은 규칙의 단계 수에 비례합니다.
+    to_dict()/from_dict()로 상태를 저장했다가 이어서 처리할 수 있습니다 (follow 모드).
+    """
+    def __init__(self, rules):
+        self.rules = [(name, tuple(steps), within, description) for name, steps, within, description in rules]
+        # pending[r][i]: 규칙 r의 i + 1번째 단계를 기다리는 연쇄들 (각 연쇄는 단계별 발생 시각 리스트)
+        self.pending = [[deque() for _ in steps[1:]] for _, steps, _, _ in self.rules]
+        self.counts = {name: 0 for name, _, _, _ in self.rules}
+        self.recent = {name: deque(maxlen=MAX_RECENT) for name, _, _, _ in self.rules}
+
+    def add(self, epoch, rule_names):
+        # 이벤트 하나를 처리하고, 이번 이벤트로 완성된 연쇄를 (규칙 이름, 단계별 발생 시각 리스트) 리스트로 반환
+        completed = []
+        if epoch is None or not rule_names:
+            return completed
+        for rule_index, (name, steps, within, _) in enumerate(self.rules):
+            waiting = self.pending[rule_index]
+            # 제한 시간이 지난 연쇄는 버림 (deque는 첫 단계 시각 순서로 쌓이므로 앞쪽만 확인)
+            for queue in waiting:
+                while queue and epoch - queue[0][0] > within:
+                    queue.popleft()
+            # 뒤 단계부터 처리해야 한 이벤트가 같은 연쇄를 두 단계 연속으로 진행시키지 않음
+            for step in range(len(steps) - 1, 0, -1):
+                queue = waiting[step - 1]
+                if steps[step] not in rule_names or not queue or epoch < queue[0][-1]:
+                    continue
+                chain = queue.popleft() + [epoch]
+                if step == len(steps) - 1:
+                    self.counts[name] += 1
+                    self.recent[name].append(chain)
+                    completed.append((name, chain))
+                else:
+                    self._push(waiting[step], chain)
+            if steps[0] in rule_names:
+                self._push(waiting[0], [epoch])
+        return completed
+
+    def _push(self, queue, chain):
+        if len(queue) >= MAX_PENDING:
+            queue.popleft()
+        queue.append(chain)
+
+    def describe(self):
+        # 보고서용: 완성된 연쇄가 있는 규칙마다 (설명, 규칙 이름, 단계 이름들, 건수, 최근 연쇄들)을 반환.
+        # 최근 연쇄는 단계별 발생 시각을 'YYYY-MM-DD HH:MM:SS' 문자열로 바꾼 리스트.
+        result = []
+        for name, steps, _, description in self.rules:
+            if self.counts[name]:
+                chains = [[format_epoch(epoch) for epoch in chain] for chain in self.recent[name]]
+                result.append((description, name, steps, self.counts[name], chains))
+        return result
+
+    def to_dict(self):
+        # JSON으로 저장할 수 있는 상태
+        return {
+            'rules': [[name, list(steps), within, description] for name, steps, within, description in self.rules],
+            'pending': [[list(queue) for queue in waiting] for waiting in self.pending],
+            'counts': self.counts,
+            'recent': {name: list(chains) for name, chains in self.recent.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data, rules=None):
+        # 저장된 상태를 복원. 규칙이 바뀌었으면(rules가 저장된 규칙과 다르면) 새 규칙으로 처음부터 시작
+        saved_rules = [(name, tuple(steps), within, description) for name, steps, within, description in data['rules']]
+        if rules is not None and [tuple(rule[:3]) for rule in rules] != [tuple(rule[:3]) for rule in saved_rules]:
+            return cls(rules)
+        detector = cls(saved_rules if rules is None else rules)
+        detector.pending = [[deque(queue) for queue in waiting] for waiting in data['pending']]
+        detector.counts.update(data['counts'])
+        for name, chains in data['recent'].items():
+            detector.recent[name].extend(chains)
+        return detector
@@ -0,0 +1,93 @@
+from collections import deque
+
+# 문제 이벤트 탐지 규칙 파일. 한 줄에 하나의 규칙을 'name,keyword,severity' 형식으로 작성 (첫 줄은 헤더)
+RULES_FILENAME = 'problem_rules.csv'
+
+# 규칙 파일이 없을 때 사용하는 기본 규칙 (기존에 하드코딩되어 있던 'unstable', 'explosion' 키워드)
+DEFAULT_RULES = [
+    ('unstable', 'unstable', 'WARNING'),
+    ('explosion', 'explosion', 'CRITICAL'),
+    ('oxygen_tank_unstable', 'oxygen tank unstable', 'WARNING'),
+    ('oxygen_tank_explosion', 'oxygen tank explosion', 'CRITICAL'),
+]
+
+def load_rules(rules_filename=RULES_FILENAME):
+    # 규칙 파일을 읽어 (이름, 키워드, 심각도) 튜플의 리스트로 반환.
+    # 파일이 없으면 기본 규칙을 사용하고, 형식이 잘못된 줄은 경고를 출력한 뒤 건너뜀.
+    try:
+        with open(rules_filename, 'r', encoding='utf-8') as f:
+            f.readline()  # CSV 헤더: 'name,keyword,severity'
+            rows = [line.rstrip('\n') for line in f]
+    except FileNotFoundError:
+        return list(DEFAULT_RULES)
+
+    rules = []
+    for row in rows:
+        if not row.strip() or row.startswith('#'):
+            continue
+        fields = [field.strip() for field in row.split(',')]
+        if len(fields) != 3 or not fields[1]:
+            print('잘못된 규칙을 건너뜁니다:', row)
+            continue
+        rules.append((fields[0], fields[1], fields[2].upper()))
+    return rules
+
+class KeywordMatcher:
+    """
+    KeywordMatcher 클래스는 여러 키워드 규칙을 Aho-Corasick 오토마톤으로 한 번만 컴파일해 두고,
+    로그 라인을 한 번 훑는 것만으로 일치하는 모든 규칙을 찾아냅니다.
+    규칙 수가 수백 개로 늘어나도 라인당 검사 비용은 라인 길이에만 비례합니다.
+    키워드 비교는 대소문자를 구분하지 않습니다.
+    """
+    def __init__(self, rules):
+        self.rules = list(rules)
+        self.names = [name for name, _, _ in self.rules]
+        self.severities = [severity for _, _, severity in self.rules]
+
+        # 1. 키워드들로 트라이(goto 함수)를 만들고, 키워드가 끝나는 상태에 규칙 번호를 기록
+        goto = [{}]
+        output = [set()]
+        for index, (_, keyword, _) in enumerate(self.rules):
+            state = 0
+            for ch in keyword.lower():
+                next_state = goto[state].get(ch)
+                if next_state is None:
+                    next_state = len(goto)
+                    goto.append({})
+                    output.append(set())
+                    goto[state][ch] = next_state
+                state = next_state
+            output[state].add(index)
+
+        # 2. 너비 우선 탐색으로 실패 링크를 계산하고, 실패 링크를 따라 전이를 미리 펼쳐둔 전이표(delta)를 만듦.
+        #    전이표에 없는 문자는 항상 루트(0)로 돌아가므로, 검색 시 실패 링크를 따라갈 필요가 없음.
+        fail = [0] * len(goto)
+        delta = [dict(edges) for edges in goto]
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            output[state] |= output[fail[state]]
+            for ch, target in delta[fail[state]].items():
+                delta[state].setdefault(ch, target)
+            for ch, next_state in goto[state].items():
+                fail[next_state] = delta[fail[state]].get(ch, 0)
+                queue.append(next_state)
+
+        self._delta = delta
+        self._output = [tuple(sorted(indices)) for indices in output]
+
+    def match(self, text):
+        # 텍스트에서 일치하는 모든 규칙의 번호를 규칙 파일 순서대로 튜플로 반환 (일치하는 규칙이 없으면 빈 튜플)
+        delta = self._delta
+        output = self._output
+        state = 0
+        matched = None
+        for ch in text.lower():
+            state = delta[state].get(ch, 0)
+            if output[state]:
+                if matched is None:
+                    matched = set()
+                matched.update(output[state])
+        if matched is None:
+            return ()
+        return tuple(sorted(matched))
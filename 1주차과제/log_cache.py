@@ -0,0 +1,270 @@
+import array
+import hashlib
+import mmap
+import os
+import shutil
+import struct
+import tempfile
+
+from timestamp_parser import format_epoch, parse_timestamp
+
+# 파싱한 미션 로그를 열(column) 단위 이진 파일로 저장해 두는 캐시.
+# 로그 옆에 mission_computer_main.log.cache로 저장되며, 로그 파일의 경로/크기/수정 시각과
+# 문제 이벤트 규칙이 같으면 다음 실행부터는 텍스트를 다시 파싱하지 않고 캐시를 mmap으로 바로 사용함.
+#
+# 열 구성:
+#   - epochs: 각 라인의 타임스탬프(epoch 초, int64). 타임스탬프가 없는 라인은 앞 라인의 값을 이어받음
+#   - codes: event 열의 범주 코드(uint16). 0은 타임스탬프가 없는 라인, 1은 형식이 다른 라인(원문 그대로 저장)
+#   - offsets + blob: message 열 문자열(UTF-8)을 하나로 이어 붙인 blob과 각 문자열의 시작 위치(int64, 라인 수 + 1개)
+#   - problematic: 문제 이벤트 규칙과 일치한 라인 번호(int64)
+
+CACHE_MAGIC = b'MLOGCOL1'
+# 헤더: 매직, 로그 크기, 로그 수정 시각(ns), 라인 수, 범주 수, blob 크기, 문제 라인 수, 정렬 여부, 경로 길이, 규칙 해시
+_HEADER = struct.Struct('<8sQqQQQQQQ20s')
+CODE_NO_TIMESTAMP = 0
+CODE_RAW = 1
+_MAX_CATEGORIES = 65536
+# 열 데이터를 임시 파일로 내보내는 단위(라인 수)
+_FLUSH_ROWS = 65536
+
+def cache_filename_for(log_filename):
+    # 로그 파일에 대응하는 캐시 파일 이름 (예: mission_computer_main.log.cache)
+    return log_filename + '.cache'
+
+def rules_fingerprint(matcher):
+    # 규칙이 바뀌면 문제 라인 목록을 다시 만들어야 하므로 규칙 내용의 해시를 캐시 키에 포함
+    return hashlib.sha1(repr(matcher.rules).encode('utf-8')).digest()
+
+def _pad8(f):
+    # 다음 열이 8바이트 경계에서 시작하도록 0으로 채움
+    remainder = f.tell() % 8
+    if remainder:
+        f.write(b'\0' * (8 - remainder))
+
+class LogColumns:
+    """
+    LogColumns 클래스는 mmap으로 연 로그 캐시 파일의 열들을 읽기 전용으로 제공합니다.
+    epochs, codes, offsets는 memoryview이므로 필요한 라인만 디코딩하며 파일 전체를 메모리에 올리지 않습니다.
+    """
+    def __init__(self, cache_filename):
+        self._file = open(cache_filename, 'rb')
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, self.log_size, self.log_mtime_ns, rows, category_count, blob_size,
+         problematic_count, is_sorted, path_length, self.rules_hash) = _HEADER.unpack_from(self._mm, 0)
+        if magic != CACHE_MAGIC:
+            self.close()
+            raise ValueError('로그 캐시 파일 형식이 아닙니다: ' + cache_filename)
+        self.is_sorted = bool(is_sorted)
+
+        view = memoryview(self._mm)
+        position = _HEADER.size
+        self.log_path = bytes(view[position:position + path_length]).decode('utf-8')
+        position += path_length
+        categories_size, = struct.unpack_from('<Q', self._mm, position)
+        position += 8
+        self.categories = bytes(view[position:position + categories_size]).decode('utf-8').split('\n')
+        position += categories_size
+
+        def column(fmt, count):
+            nonlocal position
+            position += -position % 8
+            size = struct.calcsize(fmt) * count
+            data = view[position:position + size].cast(fmt)
+            position += size
+            return data
+
+        self.epochs = column('q', rows)
+        self.codes = column('H', rows)
+        self._codes_range = (position - 2 * rows, position)
+        self.offsets = column('q', rows + 1)
+        self.problematic = column('q', problematic_count)
+        self.blob = view[position:position + blob_size]
+        self._views = [self.epochs, self.codes, self.offsets, self.problematic, self.blob, view]
+
+    def close(self):
+        # memoryview를 먼저 해제해야 mmap을 닫을 수 있음
+        for view in getattr(self, '_views', []):
+            view.release()
+        self._views = []
+        self._mm.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return len(self.epochs)
+
+    def message(self, row):
+        return bytes(self.blob[self.offsets[row]:self.offsets[row + 1]]).decode('utf-8')
+
+    def line(self, row):
+        # 열 값으로부터 원래 로그 라인을 그대로 복원
+        code = self.codes[row]
+        if code <= CODE_RAW:
+            return self.message(row)
+        return format_epoch(self.epochs[row]) + ',' + self.categories[code] + ',' + self.message(row)
+
+    def has_timestamp(self, row):
+        return self.codes[row] != CODE_NO_TIMESTAMP
+
+    def count_code(self, code):
+        # 특정 범주 코드를 가진 라인 수 (codes 열을 C 수준의 mmap.find()로 훑음)
+        return sum(1 for _ in self.find_code(code))
+
+    def find_code(self, code):
+        # codes 열에서 code 값을 가진 라인 번호를 차례로 반환 (2바이트 경계에 맞는 위치만 사용)
+        # codes 열을 복사하지 않고 mmap.find()로 바로 검색
+        start, end = self._codes_range
+        pattern = struct.pack('<H', code)
+        position = self._mm.find(pattern, start, end)
+        while position != -1:
+            if (position - start) % 2 == 0:
+                yield (position - start) // 2
+                position = self._mm.find(pattern, position + 2, end)
+            else:
+                position = self._mm.find(pattern, position + 1, end)
+
+    def filter(self, level=None, since=None, until=None):
+        # event 범주(level)와 시간 구간(since/until, epoch 초)으로 라인 번호를 골라 반환하는 제너레이터.
+        # 로그가 시간순이면 epochs 열을 이진 탐색하여 구간 밖의 라인은 보지 않음.
+        start, end = 0, len(self)
+        if self.is_sorted:
+            if since is not None:
+                start = self._bisect(since, start, end)
+            if until is not None:
+                end = self._bisect(until + 1, start, end)
+        if level is not None:
+            if level not in self.categories[2:]:
+                return
+            rows = (row for row in self.find_code(self.categories.index(level, 2)) if start <= row < end)
+        else:
+            rows = range(start, end)
+        for row in rows:
+            if not self.has_timestamp(row) and (since is not None or until is not None):
+                continue
+            epoch = self.epochs[row]
+            if (since is not None and epoch < since) or (until is not None and epoch > until):
+                continue
+            yield row
+
+    def _bisect(self, epoch, low, high):
+        # epochs[row] >= epoch 인 첫 번째 라인 번호
+        epochs = self.epochs
+        while low < high:
+            middle = (low + high) // 2
+            if epochs[middle] < epoch:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+def _split_line(line, epoch):
+    # 라인을 (범주 이름, message 문자열)로 나눔. 원문 그대로 복원할 수 없는 형식이면 (None, line)을 반환
+    if epoch is None or line[19:20] != ',' or line[:19] != format_epoch(epoch):
+        return None, line
+    comma = line.find(',', 20)
+    if comma == -1:
+        return None, line
+    return line[20:comma], line[comma + 1:]
+
+def build_cache(log_filename, matcher, cache_filename=None):
+    # 로그 파일을 한 번 파싱하여 열 단위 캐시 파일을 만듦.
+    # 열 데이터는 일정 라인 수마다 임시 파일로 내보내므로 로그가 커도 메모리 사용량이 일정함.
+    if cache_filename is None:
+        cache_filename = cache_filename_for(log_filename)
+    file_stat = os.stat(log_filename)
+    categories = ['', '']  # 0, 1번 코드는 예약 (CODE_NO_TIMESTAMP, CODE_RAW)
+    category_codes = {}
+    rows = 0
+    blob_size = 0
+    problematic_count = 0
+    is_sorted = True
+    last_epoch = None
+
+    with tempfile.TemporaryDirectory(dir=os.path.dirname(os.path.abspath(cache_filename))) as work_dir:
+        names = ['epochs', 'codes', 'offsets', 'problematic', 'blob']
+        parts = {name: open(os.path.join(work_dir, name), 'w+b') for name in names}
+        try:
+            epochs = array.array('q')
+            codes = array.array('H')
+            offsets = array.array('q', [0])
+            problematic = array.array('q')
+
+            def flush():
+                for name, column in (('epochs', epochs), ('codes', codes), ('offsets', offsets), ('problematic', problematic)):
+                    column.tofile(parts[name])
+                    del column[:]
+
+            with open(log_filename, 'r', encoding='utf-8') as f:
+                # 첫 번째 줄은 헤더라고 가정하여 건너뜁니다.
+                f.readline()
+                for line in f:
+                    line = line.rstrip('\n')
+                    epoch = parse_timestamp(line, as_epoch=True)
+                    if epoch is None:
+                        code, message = CODE_NO_TIMESTAMP, line
+                        epoch = last_epoch if last_epoch is not None else 0
+                    else:
+                        if last_epoch is not None and epoch < last_epoch:
+                            is_sorted = False
+                        last_epoch = epoch
+                        category, message = _split_line(line, epoch)
+                        code = category_codes.get(category, CODE_RAW)
+                        if category is not None and code == CODE_RAW and len(categories) < _MAX_CATEGORIES:
+                            code = category_codes[category] = len(categories)
+                            categories.append(category)
+                        if code == CODE_RAW:
+                            message = line
+                    encoded = message.encode('utf-8')
+                    parts['blob'].write(encoded)
+                    blob_size += len(encoded)
+                    epochs.append(epoch)
+                    codes.append(code)
+                    offsets.append(blob_size)
+                    if matcher.match(line):
+                        problematic.append(rows)
+                        problematic_count += 1
+                    rows += 1
+                    if len(epochs) >= _FLUSH_ROWS:
+                        flush()
+            flush()
+
+            # 헤더와 각 열을 하나의 캐시 파일로 합친 뒤 교체
+            temp_filename = cache_filename + '.tmp'
+            path_bytes = os.path.abspath(log_filename).encode('utf-8')
+            categories_bytes = '\n'.join(categories).encode('utf-8')
+            with open(temp_filename, 'wb') as out:
+                out.write(_HEADER.pack(CACHE_MAGIC, file_stat.st_size, file_stat.st_mtime_ns, rows, len(categories),
+                                       blob_size, problematic_count, int(is_sorted), len(path_bytes),
+                                       rules_fingerprint(matcher)))
+                out.write(path_bytes)
+                out.write(struct.pack('<Q', len(categories_bytes)))
+                out.write(categories_bytes)
+                for name in names:
+                    _pad8(out)
+                    parts[name].seek(0)
+                    shutil.copyfileobj(parts[name], out)
+        finally:
+            for part in parts.values():
+                part.close()
+    os.replace(temp_filename, cache_filename)
+
+def load_or_build_cache(log_filename, matcher, cache_filename=None):
+    # 캐시 키(경로, 크기, 수정 시각, 규칙 해시)가 맞는 캐시가 있으면 mmap으로 열고, 없거나 오래되었으면 새로 만든 뒤 염.
+    if cache_filename is None:
+        cache_filename = cache_filename_for(log_filename)
+    file_stat = os.stat(log_filename)
+    try:
+        columns = LogColumns(cache_filename)
+        if (columns.log_path == os.path.abspath(log_filename) and columns.log_size == file_stat.st_size
+                and columns.log_mtime_ns == file_stat.st_mtime_ns and columns.rules_hash == rules_fingerprint(matcher)):
+            return columns
+        columns.close()
+    except (OSError, ValueError, struct.error):
+        pass
+    build_cache(log_filename, matcher, cache_filename)
+    return LogColumns(cache_filename)
@@ -0,0 +1,110 @@
+import argparse
+import datetime
+import random
+
+# 분석기 벤치마크와 테스트용 합성 미션 로그 생성기.
+# mission_computer_main.log와 같은 'timestamp,event,message' 형식으로 원하는 라인 수만큼 생성하며,
+# event 비율, 형식이 잘못된 라인의 비율, 시간 순서가 섞이는 정도를 조절할 수 있음.
+# 실행: python log_generator.py --lines 1000000 --mix INFO=0.9,WARNING=0.07,ERROR=0.03 --malformed 0.01
+
+# event별 메시지. '{n}'은 라인마다 다른 숫자로 바뀌어 실제 로그처럼 메시지가 조금씩 달라짐.
+MESSAGES = {
+    'INFO': [
+        'Telemetry packet {n} received.',
+        'Navigation systems show nominal performance.',
+        'Life support systems nominal.',
+        'Power systems online. Batteries at {n}% charge.',
+        'Communication established with mission control.',
+        'Orbital operations initiated. Satellite deployment upcoming.',
+        'Heat shield performing as expected during reentry.',
+        'Cargo bay secured and sealed properly.',
+    ],
+    'WARNING': [
+        'Oxygen tank unstable.',
+        'Cabin pressure fluctuating at {n} kPa.',
+        'Thruster {n} responding slowly.',
+    ],
+    'ERROR': [
+        'Oxygen tank explosion.',
+        'Lost contact with sensor {n}.',
+    ],
+}
+# 기본 event 비율 (합이 1이 아니어도 비율로 사용)
+DEFAULT_EVENT_MIX = {'INFO': 0.9, 'WARNING': 0.07, 'ERROR': 0.03}
+DEFAULT_START = datetime.datetime(2023, 8, 27, 10, 0, 0)
+
+def parse_event_mix(text):
+    # 'INFO=0.9,WARNING=0.07,ERROR=0.03' 형식의 문자열을 {event: 비율} dict로 변환
+    mix = {}
+    for item in text.split(','):
+        event, _, weight = item.partition('=')
+        event = event.strip()
+        if event not in MESSAGES:
+            raise ValueError('알 수 없는 event입니다: ' + event)
+        mix[event] = float(weight)
+    return mix
+
+def _malformed_line(rng, timestamp, message):
+    # 분석기가 타임스탬프를 찾지 못해야 하는 라인을 여러 형태 중 하나로 만듦
+    kind = rng.randrange(4)
+    if kind == 0:
+        # 앞 라인에 이어지는 여러 줄 메시지
+        return '    at subsystem ' + str(rng.randrange(100))
+    if kind == 1:
+        # 존재하지 않는 날짜
+        return '2023-13-' + timestamp[8:] + ',INFO,' + message
+    if kind == 2:
+        # 잘린 타임스탬프
+        return timestamp[:rng.randrange(1, 19)]
+    return 'corrupted:' + message
+
+def generate_log_lines(line_count, event_mix=None, malformed_ratio=0.0, disorder_seconds=0, interval_seconds=1,
+                       start=DEFAULT_START, seed=0):
+    # 헤더를 제외한 합성 로그 라인을 line_count개 반환하는 제너레이터.
+    #   - event_mix: {event: 비율} (None이면 DEFAULT_EVENT_MIX)
+    #   - malformed_ratio: 형식이 잘못된 라인(타임스탬프 없음, 잘못된 날짜 등)의 비율
+    #   - disorder_seconds: 각 라인의 시각을 ±이 값(초) 안에서 무작위로 흔들어 시간 순서를 섞음
+    #   - interval_seconds: 라인 사이의 기본 시간 간격(초)
+    # 같은 seed로 만든 로그는 항상 같으므로 벤치마크 결과를 서로 비교할 수 있음.
+    rng = random.Random(seed)
+    mix = event_mix if event_mix is not None else DEFAULT_EVENT_MIX
+    events = list(mix)
+    weights = [mix[event] for event in events]
+    for i in range(line_count):
+        offset = i * interval_seconds
+        if disorder_seconds:
+            offset = max(0, offset + rng.randint(-disorder_seconds, disorder_seconds))
+        timestamp = (start + datetime.timedelta(seconds=offset)).strftime('%Y-%m-%d %H:%M:%S')
+        event = rng.choices(events, weights)[0]
+        message = rng.choice(MESSAGES[event])
+        if '{n}' in message:
+            message = message.replace('{n}', str(rng.randrange(1000)))
+        if malformed_ratio and rng.random() < malformed_ratio:
+            yield _malformed_line(rng, timestamp, message)
+        else:
+            yield timestamp + ',' + event + ',' + message
+
+def write_log(path, line_count, **options):
+    # 헤더와 함께 합성 로그를 path에 저장 (options는 generate_log_lines()의 인자)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('timestamp,event,message\n')
+        for line in generate_log_lines(line_count, **options):
+            f.write(line + '\n')
+
+def main():
+    parser = argparse.ArgumentParser(description='합성 미션 로그 생성기')
+    parser.add_argument('output', help='생성할 로그 파일 경로')
+    parser.add_argument('--lines', type=int, default=10000, help='생성할 라인 수 (기본값: 10,000)')
+    parser.add_argument('--mix', type=parse_event_mix, default=None,
+                        help='event 비율 (예: INFO=0.9,WARNING=0.07,ERROR=0.03)')
+    parser.add_argument('--malformed', type=float, default=0.0, help='형식이 잘못된 라인의 비율 (예: 0.01)')
+    parser.add_argument('--disorder', type=int, default=0, help='시간 순서를 섞는 정도(초)')
+    parser.add_argument('--seed', type=int, default=0, help='난수 시드 (기본값: 0)')
+    args = parser.parse_args()
+
+    write_log(args.output, args.lines, event_mix=args.mix, malformed_ratio=args.malformed,
+              disorder_seconds=args.disorder, seed=args.seed)
+    print('합성 로그를 생성했습니다:', args.output, '(%d lines)' % args.lines)
+
+if __name__ == '__main__':
+    main()
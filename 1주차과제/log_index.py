@@ -0,0 +1,155 @@
+import array
+import bisect
+import mmap
+import os
+import struct
+
+from timestamp_parser import parse_timestamp
+
+# 로그 파일 옆에 저장하는 희소(sparse) 타임스탬프 인덱스.
+# 약 INDEX_STEP 바이트마다 (타임스탬프의 epoch 초, 라인 시작 바이트 오프셋)을 하나씩 기록해 두고,
+# 시간 구간 조회 시 인덱스를 이진 탐색하여 해당 구간 근처부터만 로그를 읽음.
+# 로그는 시간 순서대로 기록된다고 가정함 (미션 컴퓨터 로그는 항상 뒤에 이어서 쓰임).
+
+INDEX_MAGIC = b'MLOGIDX1'
+# 헤더: 매직, 로그 파일의 inode, 인덱싱한 로그 크기, 샘플 간격(바이트), 샘플 수
+_HEADER = struct.Struct('<8sQQQQ')
+# 샘플 간격(바이트). 조회 시 최대 이 정도만 구간 밖의 데이터를 읽게 됨
+INDEX_STEP = 64 * 1024
+# 샘플 위치에서 타임스탬프가 있는 라인을 찾기 위해 읽어볼 최대 라인 수
+_MAX_PROBE_LINES = 64
+
+def index_filename_for(log_filename):
+    # 로그 파일에 대응하는 인덱스 파일 이름 (예: mission_computer_main.log.idx)
+    return log_filename + '.idx'
+
+def _new_index(inode, step):
+    return {
+        'inode': inode,
+        'indexed_size': 0,
+        'step': step,
+        'epochs': array.array('q'),
+        'offsets': array.array('q'),
+    }
+
+def load_index(index_filename):
+    # 인덱스 파일을 읽어 dict로 반환 (파일이 없거나 형식이 맞지 않으면 None)
+    try:
+        with open(index_filename, 'rb') as f:
+            magic, inode, indexed_size, step, count = _HEADER.unpack(f.read(_HEADER.size))
+            if magic != INDEX_MAGIC:
+                return None
+            index = _new_index(inode, step)
+            index['indexed_size'] = indexed_size
+            index['epochs'].fromfile(f, count)
+            index['offsets'].fromfile(f, count)
+            return index
+    except (OSError, EOFError, struct.error):
+        return None
+
+def save_index(index, index_filename):
+    # 인덱스를 임시 파일에 쓴 뒤 교체하여, 저장 도중 중단되어도 이전 인덱스가 깨지지 않도록 함
+    temp_filename = index_filename + '.tmp'
+    with open(temp_filename, 'wb') as f:
+        f.write(_HEADER.pack(INDEX_MAGIC, index['inode'], index['indexed_size'], index['step'], len(index['epochs'])))
+        index['epochs'].tofile(f)
+        index['offsets'].tofile(f)
+    os.replace(temp_filename, index_filename)
+
+def build_index(log_filename, index_filename=None, step=INDEX_STEP):
+    # 인덱스를 만들거나, 이미 있으면 마지막 샘플 이후에 추가된 부분만 이어서 인덱싱한 뒤 저장하고 반환.
+    # 로그 파일이 교체(inode 변경)되었거나 인덱싱한 크기보다 작아졌으면 처음부터 다시 만듦.
+    # 샘플 위치마다 한 번씩 seek하여 몇 줄만 읽으므로, 파일 전체를 파싱하지 않고도 인덱스를 만들 수 있음.
+    if index_filename is None:
+        index_filename = index_filename_for(log_filename)
+    file_stat = os.stat(log_filename)
+    size = file_stat.st_size
+
+    index = load_index(index_filename)
+    if (index is None or index['inode'] != file_stat.st_ino or index['step'] != step
+            or size < index['indexed_size']):
+        index = _new_index(file_stat.st_ino, step)
+    if size == index['indexed_size']:
+        return index
+
+    epochs = index['epochs']
+    offsets = index['offsets']
+    with open(log_filename, 'rb') as f:
+        # 첫 번째 줄은 헤더라고 가정하여 건너뜁니다.
+        f.readline()
+        data_start = f.tell()
+        position = offsets[-1] + step if offsets else data_start
+        while position < size:
+            if position > data_start:
+                # 샘플 위치 바로 앞 바이트부터 한 줄을 읽어 넘기면 다음 라인의 시작 위치로 맞춰짐
+                f.seek(position - 1)
+                f.readline()
+            else:
+                f.seek(position)
+            epoch = None
+            unterminated = False
+            for _ in range(_MAX_PROBE_LINES):
+                line_start = f.tell()
+                raw = f.readline()
+                # 파일 끝이거나 아직 다 쓰이지 않은 마지막 라인은 다음 갱신 때 인덱싱
+                if not raw.endswith(b'\n'):
+                    unterminated = True
+                    break
+                epoch = parse_timestamp(raw[:19].decode('utf-8', 'replace'), as_epoch=True)
+                if epoch is not None:
+                    break
+            if unterminated:
+                break
+            if epoch is None:
+                # 타임스탬프가 없는 라인이 이어지는 구간은 샘플 없이 건너뛰고 다음 샘플 위치에서 계속 인덱싱
+                position += step
+                continue
+            # 이진 탐색이 가능하도록 샘플의 타임스탬프는 감소하지 않게 유지
+            epochs.append(max(epoch, epochs[-1]) if epochs else epoch)
+            offsets.append(line_start)
+            position = line_start + step
+
+    index['indexed_size'] = size
+    save_index(index, index_filename)
+    return index
+
+def query_time_window(log_filename, since=None, until=None, index=None):
+    # since <= 타임스탬프 <= until 인 로그 라인을 반환하는 제너레이터 (since/until은 epoch 초, None이면 제한 없음).
+    # 인덱스를 이진 탐색하여 since 직전 샘플 위치로 바로 이동한 뒤, mmap으로 구간 안의 라인만 디코딩.
+    # 구간 안에서 타임스탬프가 없는 라인은 앞 라인에 이어진 내용으로 보고 함께 반환.
+    if index is None:
+        index = build_index(log_filename)
+    size = os.path.getsize(log_filename)
+    if size == 0:
+        return
+
+    with open(log_filename, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        sample = bisect.bisect_left(index['epochs'], since) - 1 if since is not None else -1
+        if sample >= 0:
+            position = index['offsets'][sample]
+        else:
+            # 첫 번째 줄은 헤더라고 가정하여 건너뜁니다.
+            position = mm.find(b'\n') + 1
+            if position == 0:
+                return
+
+        in_window = False
+        while position < size:
+            line_end = mm.find(b'\n', position)
+            if line_end == -1:
+                break
+            line = mm[position:line_end].decode('utf-8').removesuffix('\r')
+            position = line_end + 1
+
+            epoch = parse_timestamp(line, as_epoch=True)
+            if epoch is None:
+                if in_window:
+                    yield line
+                continue
+            if since is not None and epoch < since:
+                in_window = False
+                continue
+            if until is not None and epoch > until:
+                break
+            in_window = True
+            yield line
@@ -0,0 +1,87 @@
+import bz2
+import glob
+import gzip
+import heapq
+import lzma
+import os
+import re
+
+from timestamp_parser import parse_timestamp
+
+# 교체(rotation)되어 압축된 로그 묶음을 한 번에 읽는 모듈.
+# 예: mission_computer_main.log, mission_computer_main.log.1.gz, mission_computer_main.log.2.bz2, ...log.3.xz
+# 각 파일은 디스크에 압축을 풀지 않고 스트림으로 읽으며, 이미 시간순으로 정렬된 파일들을 heapq.merge로 병합.
+
+# 확장자별 스트림 열기 함수
+_OPENERS = {
+    '.gz': gzip.open,
+    '.bz2': bz2.open,
+    '.xz': lzma.open,
+    '.lzma': lzma.open,
+}
+# 'mission_computer_main.log.3.gz'의 3처럼 교체 번호를 찾는 정규식
+_ROTATION_PATTERN = re.compile(r'\.log\.(\d+)')
+# 로그 묶음에 들어가는 파일 이름: <이름>.log, 교체 번호(.N)와 압축 확장자는 선택
+_MEMBER_PATTERN = re.compile(r'^(?P<stem>.+)\.log(\.\d+)?(\.(gz|bz2|xz|lzma))?$', re.IGNORECASE)
+# 분석기가 로그 옆에 만드는 파일 (색인, 열 캐시, 임시 파일, follow 모드 체크포인트, 문제 이벤트 로그)은 로그 묶음에서 제외
+_SIDECAR_SUFFIXES = ('.idx', '.cache', '.tmp', '.checkpoint.json')
+_SIDECAR_STEMS = ('problematic',)
+
+def is_log_set(path):
+    # 일반 로그 파일 하나가 아니라 디렉터리, glob 패턴 또는 압축 파일이면 True
+    return (os.path.isdir(path) or glob.has_magic(path)
+            or os.path.splitext(path)[1].lower() in _OPENERS)
+
+def _rotation_number(path):
+    # 교체 번호가 클수록 오래된 로그 (번호가 없는 현재 로그는 0)
+    match = _ROTATION_PATTERN.search(os.path.basename(path))
+    return int(match.group(1)) if match else 0
+
+def _is_log_member(name):
+    # 로그 파일(교체/압축된 로그 포함)이면 True, 분석기가 만든 부속 파일이면 False
+    if name.lower().endswith(_SIDECAR_SUFFIXES):
+        return False
+    match = _MEMBER_PATTERN.match(name)
+    return match is not None and match.group('stem') not in _SIDECAR_STEMS
+
+def expand_log_set(path):
+    # 디렉터리 또는 glob 패턴을 로그 파일 목록으로 펼침 (오래된 로그부터 정렬)
+    if os.path.isdir(path):
+        members = [os.path.join(path, name) for name in os.listdir(path) if _is_log_member(name)]
+    elif glob.has_magic(path):
+        members = [member for member in glob.glob(path) if _is_log_member(os.path.basename(member))]
+    else:
+        members = [path]
+    members = [member for member in members if os.path.isfile(member)]
+    members.sort(key=lambda member: (-_rotation_number(member), member))
+    return members
+
+def open_log_member(path):
+    # 확장자에 맞는 압축 해제 스트림(gzip/bz2/lzma)을 텍스트 모드로 열어 반환
+    opener = _OPENERS.get(os.path.splitext(path)[1].lower(), open)
+    return opener(path, 'rt', encoding='utf-8')
+
+def iter_member_lines(path):
+    # 로그 파일 하나를 한 줄씩 읽어 (정렬 키, 로그 문자열)을 반환하는 제너레이터.
+    # 정렬 키는 epoch 초이며, 타임스탬프가 없는 라인은 바로 앞 라인의 키를 이어받아 앞 라인 바로 뒤에 병합됨.
+    last_key = float('-inf')
+    with open_log_member(path) as f:
+        # 첫 번째 줄은 헤더라고 가정하여 건너뜁니다. (CSV 헤더: 'timestamp,event,message')
+        f.readline()
+        for line in f:
+            line = line.rstrip('\n')
+            epoch = parse_timestamp(line, as_epoch=True)
+            if epoch is not None:
+                last_key = epoch
+            yield last_key, line
+
+def iter_log_set(path):
+    # 로그 묶음 전체를 시간순으로 한 줄씩 반환하는 제너레이터.
+    # 각 파일에서 한 줄씩만 힙에 올리는 k-way 병합이므로 파일 수와 크기에 관계없이 메모리 사용량이 일정함.
+    # 같은 시각의 라인은 오래된 파일의 라인이 먼저 나옴.
+    members = expand_log_set(path)
+    if not members:
+        raise FileNotFoundError('로그 파일을 찾을 수 없습니다: ' + path)
+    streams = [iter_member_lines(member) for member in members]
+    for _, line in heapq.merge(*streams, key=lambda x: x[0]):
+        yield line
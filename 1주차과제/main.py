@@ -1,88 +1,453 @@
-import datetime
+import argparse
+import concurrent.futures
+import heapq
+import json
+import os
+import tempfile
+import time
+from datetime import datetime
 
-def parse_timestamp(line):
-    # 이 함수는 로그 파일의 각 줄에서 처음 19글자(예: "2023-08-27 10:00:00")를 읽어, 날짜와 시간 정보를 파싱
-    # 제약조건: 로그 항목의 타임스탬프가 'YYYY-MM-DD HH:MM:SS' 형식임을 가정하고 파싱합니다.
-    try:
-        # 기본 문자열 표기는 ''를 사용 (PEP 8 준수), 로그 라인의 처음 19글자를 추출
-        timestamp_str = line[:19]
-        # datetime 모듈의 strptime 함수를 사용하여 문자열을 날짜/시간 객체로 변환
-        timestamp = datetime.datetime.strptime(timestamp_str, '%Y-%m-%d %H:%M:%S')
-        return timestamp
-    except ValueError:
-        # 예외 처리: 파싱 실패 시 None 반환 (파일 처리 예외를 처리하는 부분)
-        return None 
-# 안써도ㅠ됨
-
-def read_and_print_log():
-    # 이 함수는 로그 파일 mission_computer_main.log를 열어 내용을 읽고,
+from chain_detector import ChainDetector, load_chain_rules
+from keyword_matcher import KeywordMatcher, load_rules
+from log_cache import CODE_NO_TIMESTAMP, load_or_build_cache
+from log_index import query_time_window
+from log_set import is_log_set, iter_log_set
+from template_miner import TemplateMiner
+from timestamp_parser import format_epoch, parse_timestamp
+
+# 파일 이름은 요구사항에 따라 mission_computer_main.log로 지정
+LOG_FILENAME = 'mission_computer_main.log'
+# external merge sort에서 한 번에 메모리에 올려 정렬할 최대 라인 수 (run 크기)
+RUN_SIZE = 100000
+# follow 모드에서 마지막으로 처리한 위치(바이트 오프셋, inode)와 누적 집계값을 저장하는 체크포인트 파일
+CHECKPOINT_FILENAME = 'mission_log.checkpoint.json'
+
+def iter_chunk_lines(log_filename, start, end):
+    # read 단계(병렬 처리용): 로그 파일의 [start, end) 바이트 구간에 속한 라인만 읽어 반환하는 제너레이터.
+    # start와 end는 항상 라인의 시작 위치에 맞춰져 있어야 함 (split_into_chunks() 참고).
+    with open(log_filename, 'rb') as f:
+        f.seek(start)
+        position = start
+        while position < end:
+            raw = f.readline()
+            if not raw:
+                break
+            position += len(raw)
+            # 텍스트 모드와 동일하게 줄 끝의 개행 문자('\n' 또는 '\r\n')를 제거
+            yield raw.decode('utf-8').rstrip('\n').removesuffix('\r')
+
+def split_into_chunks(log_filename, chunk_count):
+    # 로그 파일을 (헤더를 제외하고) chunk_count개의 바이트 구간으로 나눔.
+    # 각 경계는 바로 다음 라인의 시작 위치로 옮겨서 한 라인이 두 구간에 걸치지 않도록 함.
+    size = os.path.getsize(log_filename)
+    with open(log_filename, 'rb') as f:
+        # 첫 번째 줄은 헤더라고 가정하여 건너뜁니다.
+        f.readline()
+        data_start = f.tell()
+        bounds = [data_start]
+        for i in range(1, chunk_count):
+            boundary = data_start + (size - data_start) * i // chunk_count
+            if boundary <= bounds[-1]:
+                continue
+            # 경계 바로 앞 바이트부터 한 줄을 읽어 넘기면 경계가 다음 라인의 시작 위치로 맞춰짐
+            f.seek(boundary - 1)
+            f.readline()
+            boundary = f.tell()
+            if bounds[-1] < boundary < size:
+                bounds.append(boundary)
+        bounds.append(size)
+    return list(zip(bounds[:-1], bounds[1:]))
+
+def _spill_run(run, run_dir, run_paths, prefix='run', key_text=datetime.isoformat):
+    # 메모리에 모인 (타임스탬프, 로그 문자열) 묶음(run)을 시간 역순으로 정렬해 임시 파일로 내보냄.
+    # 정렬 키는 key_text로 만든 문자열(기본값: ISO 형식)로 저장하며, 이 형식은 문자열 비교 순서가 시간 순서와 같아야 함.
+    run.sort(key=lambda x: x[0], reverse=True)
+    run_path = os.path.join(run_dir, '%s_%06d.txt' % (prefix, len(run_paths)))
+    with open(run_path, 'w', encoding='utf-8') as rf:
+        for ts, line in run:
+            rf.write(key_text(ts) + '\t' + line + '\n')
+    run_paths.append(run_path)
+    run.clear()
+
+def _read_run(run_path):
+    # 임시 파일로 내보낸 run을 (정렬 키, 로그 문자열) 형태로 한 줄씩 다시 읽어오는 제너레이터
+    with open(run_path, 'r', encoding='utf-8') as rf:
+        for row in rf:
+            key, line = row.rstrip('\n').split('\t', 1)
+            yield key, line
+
+def merge_runs(run_paths):
+    # external merge sort의 병합 단계: 이미 정렬된 run들을 heapq.merge로 한 줄씩 병합하여 시간 역순으로 반환.
+    # 각 run에서 한 줄씩만 메모리에 올리므로 전체 로그 크기와 관계없이 메모리 사용량이 일정함.
+    # heapq.merge는 안정(stable) 병합이므로 같은 시각의 로그는 원래 파일 순서를 유지함.
+    runs = [_read_run(run_path) for run_path in run_paths]
+    for _, line in heapq.merge(*runs, key=lambda x: x[0], reverse=True):
+        yield line
+
+def _new_stats(matcher):
+    # 집계값(stats)의 초기 상태를 만듦
+    return {
+        'total': 0,  # 전체 로그 항목 수
+        'with_timestamp': 0,  # 타임스탬프 파싱에 성공한 로그 항목 수
+        'without_timestamp': 0,  # 타임스탬프 파싱에 실패한 로그 항목 수
+        'problematic': 0,  # 문제 이벤트 수
+        'rule_counts': {name: 0 for name in matcher.names},  # 규칙별로 일치한 라인 수
+        'severity_counts': {severity: 0 for severity in matcher.severities},  # 심각도별로 일치한 라인 수
+    }
+
+def _merge_stats(stats, partial):
+    # 구간별로 집계한 값(partial)을 전체 집계값(stats)에 더함
+    # (partial에 아직 stats에 없는 규칙 이름이 있어도 되도록 get()으로 더함)
+    for key, value in partial.items():
+        if isinstance(value, dict):
+            for name, count in value.items():
+                stats[key][name] = stats[key].get(name, 0) + count
+        else:
+            stats[key] += value
+
+def _aggregate_line(line, matcher, stats):
+    # parse → classify → aggregate 단계를 라인 하나에 대해 수행하고 (타임스탬프, 일치한 규칙 번호들)을 반환
+    ts = parse_timestamp(line)
+    stats['total'] += 1
+    if ts is not None:
+        stats['with_timestamp'] += 1
+    else:
+        stats['without_timestamp'] += 1
+
+    # classify 단계: 라인 하나를 한 번만 훑어 일치하는 모든 규칙을 찾음
+    matched = matcher.match(line)
+    _count_matches(matched, matcher, stats)
+    return ts, matched
+
+def _count_matches(matched, matcher, stats):
+    # 라인 하나에서 일치한 규칙 번호들을 규칙별/심각도별 집계값에 반영
+    if matched:
+        stats['problematic'] += 1
+        for index in matched:
+            stats['rule_counts'][matcher.names[index]] += 1
+        for severity in {matcher.severities[index] for index in matched}:
+            stats['severity_counts'][severity] += 1
+
+def _record_problematic(line, matched, matcher, templates, chains):
+    # 문제 라인 하나를 템플릿 마이너와 연쇄 탐지기에 반영 (문제 라인은 원래 로그 순서, 즉 시간순으로 들어옴)
+    templates.add_line(line)
+    chains.add(parse_timestamp(line, as_epoch=True), {matcher.names[index] for index in matched})
+
+def analyze_lines(lines, run_dir, prefix, run_size, matcher):
+    # 라인 스트림 하나를 한 번만 훑으면서(parse → classify → aggregate) 결과를 run_dir 아래 임시 파일로 남김.
+    # 파일 전체를 처리할 때와 병렬 처리에서 구간 하나를 처리할 때 모두 이 함수를 사용하며, 반환값은 다음과 같음:
+    #   - stats: 집계값
+    #   - run_paths: 시간 역순으로 정렬되어 내보낸 run 파일 목록
+    #   - no_timestamp_path: 타임스탬프 파싱에 실패한 라인을 원래 순서대로 모은 파일
+    #   - problematic_path: 문제 이벤트 라인을 원래 순서대로 모은 파일
+    stats = _new_stats(matcher)
+    run = []  # 아직 정렬되지 않은 (타임스탬프, 로그 문자열) 묶음
+    run_paths = []  # 정렬되어 임시 파일로 내보낸 run의 경로 목록
+    no_timestamp_path = os.path.join(run_dir, prefix + '_no_timestamp.txt')
+    problematic_path = os.path.join(run_dir, prefix + '_problematic.txt')
+
+    with open(problematic_path, 'w', encoding='utf-8') as pf, \
+            open(no_timestamp_path, 'w', encoding='utf-8') as nf:
+        for line in lines:
+            ts, matched = _aggregate_line(line, matcher, stats)
+            if ts is not None:
+                run.append((ts, line))
+                if len(run) >= run_size:
+                    _spill_run(run, run_dir, run_paths, prefix)
+            else:
+                nf.write(line + '\n')
+            if matched:
+                pf.write(line + '\n')
+        if run:
+            _spill_run(run, run_dir, run_paths, prefix)
+
+    return {
+        'stats': stats,
+        'run_paths': run_paths,
+        'no_timestamp_path': no_timestamp_path,
+        'problematic_path': problematic_path,
+    }
+
+def _analyze_chunk(task):
+    # 프로세스 풀의 작업 단위: 로그 파일의 한 바이트 구간을 분석 (pickle 가능한 최상위 함수여야 함)
+    log_filename, start, end, run_dir, chunk_index, run_size, matcher = task
+    lines = iter_chunk_lines(log_filename, start, end)
+    return analyze_lines(lines, run_dir, 'chunk_%04d' % chunk_index, run_size, matcher)
+
+def read_and_print_log(log_filename=LOG_FILENAME, run_size=RUN_SIZE, matcher=None, workers=1, print_lines=True,
+                       chain_rules=None):
+    # 이 함수는 로그 파일 mission_computer_main.log를 한 번만 훑으면서(read → parse → classify → aggregate),
     # 각 로그 항목을 타임스탬프 기반으로 분류 및 정렬한 후, 터미널에 출력.
-    # "unstable" 또는 "explosion" 같은 키워드가 포함된 문제 이벤트를 problematic_lines 리스트에 따로 저장한 후, 이들을 problematic.log 파일에 기록.
-    # 전체 로그 항목과 문제 이벤트 목록을 반환하여 보고서 생성에 활용.
+    # 규칙 파일(problem_rules.csv)의 키워드("unstable", "explosion" 등)가 포함된 문제 이벤트는 problematic.log 파일에 기록.
+    # 키워드 검사는 규칙들을 한 번 컴파일한 KeywordMatcher(Aho-Corasick)로 라인당 한 번만 수행하고, 규칙별 탐지 건수를 집계.
+    # 전체 라인을 메모리에 보관하지 않고 집계값(stats), 문제 이벤트 템플릿(TemplateMiner)과
+    # 연쇄 규칙(chain_rules.csv)으로 찾은 연쇄 이벤트(ChainDetector)만 반환하여 보고서 생성에 활용.
+    # 시간 역순 정렬은 run_size 줄 단위로 정렬한 run을 임시 파일로 내보낸 뒤 병합하는 external merge sort로 수행.
+    # workers가 2 이상이면 파일을 라인 경계에 맞춘 바이트 구간으로 나누어 프로세스 풀에서 병렬로 분석한 뒤,
+    # 구간 순서대로 결과를 합치므로 출력과 보고서는 workers 값과 관계없이 항상 같음.
+    # log_filename이 디렉터리, glob 패턴 또는 압축 파일이면 교체된 로그 묶음 전체를 시간순으로 병합한
+    # 스트림 하나로 분석함 (압축 파일은 바이트 구간으로 나눌 수 없으므로 workers 값은 사용하지 않음).
+    if matcher is None:
+        matcher = KeywordMatcher(load_rules())
+    stats = _new_stats(matcher)
+    # 보너스 과제: 문제 이벤트는 라인을 그대로 모아두는 대신 메시지 템플릿별로 묶어서 보고서에 사용
+    templates = TemplateMiner()
+    chains = ChainDetector(chain_rules if chain_rules is not None else load_chain_rules())
+
+    with tempfile.TemporaryDirectory() as run_dir:
+        try:
+            if is_log_set(log_filename):
+                results = [analyze_lines(iter_log_set(log_filename), run_dir, 'log_set', run_size, matcher)]
+            else:
+                tasks = [(log_filename, start, end, run_dir, chunk_index, run_size, matcher)
+                         for chunk_index, (start, end) in enumerate(split_into_chunks(log_filename, workers))]
+                if workers > 1 and len(tasks) > 1:
+                    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+                        results = list(executor.map(_analyze_chunk, tasks))
+                else:
+                    results = [_analyze_chunk(task) for task in tasks]
+
+            # 보너스 과제 조건: 문제가 되는 이벤트를 별도의 파일로 저장 (파일명: problematic.log)
+            # 구간별 결과를 파일 순서대로 이어 붙이므로 원래 로그의 순서가 유지됨
+            with open('problematic.log', 'w', encoding='utf-8') as pf:
+                for result in results:
+                    _merge_stats(stats, result['stats'])
+                    with open(result['problematic_path'], 'r', encoding='utf-8') as chunk_file:
+                        for line in chunk_file:
+                            pf.write(line)
+                            line = line.rstrip('\n')
+                            _record_problematic(line, matcher.match(line), matcher, templates, chains)
+        # 파일을 열거나 읽는 중에 문제가 발생하면, 오류 메시지를 출력하고 함수를 종료.
+        except Exception as e:
+            print('로그 파일을 처리하는 중 오류가 발생했습니다:', e)
+            return None, None, None
+
+        if print_lines:
+            print('--- 로그 파일 출력 (시간의 역순 정렬) ---')
+            run_paths = [run_path for result in results for run_path in result['run_paths']]
+            for line in merge_runs(run_paths):
+                print(line)
+            # 타임스탬프 파싱 실패한 라인들도 출력
+            for result in results:
+                with open(result['no_timestamp_path'], 'r', encoding='utf-8') as nf:
+                    for line in nf:
+                        print(line.rstrip('\n'))
+
+    # 집계값, 문제 이벤트 템플릿과 연쇄 이벤트를 반환 (Markdown 보고서 생성에 사용)
+    return stats, templates, chains
+
+def _iter_cached_lines_descending(columns, run_size=RUN_SIZE):
+    # 캐시에서 타임스탬프가 있는 라인을 시간 역순으로 반환 (같은 시각이면 원래 순서 유지).
+    # 로그가 이미 시간순이면 정렬 없이 뒤에서부터 같은 시각의 라인 묶음 단위로 읽고,
+    # 아니면 read_and_print_log()와 같은 external merge sort를 사용하므로 메모리 사용량은 run_size로 제한됨.
+    if columns.is_sorted:
+        group = []
+        for row in range(len(columns) - 1, -1, -1):
+            if not columns.has_timestamp(row):
+                continue
+            if group and columns.epochs[row] != columns.epochs[group[-1]]:
+                for grouped_row in reversed(group):
+                    yield columns.line(grouped_row)
+                group.clear()
+            group.append(row)
+        for grouped_row in reversed(group):
+            yield columns.line(grouped_row)
+        return
 
-    # 파일 이름은 요구사항에 따라 mission_computer_main.log로 지정
-    log_filename = 'mission_computer_main.log'
-    problematic_lines = []  # 보너스 과제: 문제 이벤트를 따로 저장
-    lines_with_timestamp = [] #타임스탬프 파싱에 성공한 로그 항목을 (타임스탬프, 로그 문자열)의 튜플 형태로 저장합. 이후 시간 역순 정렬에 사용합니다.
-    lines_without_timestamp = [] #타임스탬프 파싱에 실패한 로그 항목들을 별도로 저장.
-    total_lines = []  # 전체 로그 항목 저장 (보고서 작성을 위한 데이터)
+    with tempfile.TemporaryDirectory() as run_dir:
+        run = []
+        run_paths = []
+        for row in range(len(columns)):
+            if columns.has_timestamp(row):
+                run.append((columns.epochs[row], columns.line(row)))
+                if len(run) >= run_size:
+                    _spill_run(run, run_dir, run_paths, key_text=format_epoch)
+        if run:
+            _spill_run(run, run_dir, run_paths, key_text=format_epoch)
+        yield from merge_runs(run_paths)
+
+def read_and_print_log_cached(log_filename=LOG_FILENAME, matcher=None, print_lines=True, chain_rules=None,
+                              run_size=RUN_SIZE):
+    # read_and_print_log()와 같은 출력/보고서 데이터를 열 단위 캐시(mission_computer_main.log.cache)로부터 만듦.
+    # 캐시가 로그와 맞으면 텍스트를 다시 파싱하지 않고 mmap한 열만 사용하며, 집계값은 열에서 바로 계산하고
+    # 규칙 검사는 캐시에 기록된 문제 라인에만 다시 수행함.
+    if matcher is None:
+        matcher = KeywordMatcher(load_rules())
+    stats = _new_stats(matcher)
+    # 보너스 과제: 문제 이벤트는 라인을 그대로 모아두는 대신 메시지 템플릿별로 묶어서 보고서에 사용
+    templates = TemplateMiner()
+    chains = ChainDetector(chain_rules if chain_rules is not None else load_chain_rules())
 
     try:
-        # 파일 입출력 시 예외 처리를 통해 안전하게 파일을 읽음
-        with open(log_filename, 'r', encoding='utf-8') as f:
-            # 첫 번째 줄은 헤더라고 가정하여 건너뜁니다.
-            header = f.readline()  # CSV 헤더: 'timestamp,event,message'
-            lines = f.readlines()  # # 나머지 모든 로그 항목을 읽어옴.
-    
-    # 파일을 열거나 읽는 중에 문제가 발생하면, 오류 메시지를 출력하고 함수를 종료.
+        columns = load_or_build_cache(log_filename, matcher)
     except Exception as e:
-        print('로그 파일을 여는 중 오류가 발생했습니다:', e)
-        return None, None
-    
-    #읽어온 각 로그 라인에 대해 여러 작업 수행
-    # 각 로그 라인마다 처리: 타임스탬프 파싱 및 문제 판별
-    for line in lines:
-        # 문자열 내 기본 개행 문자 제거, '' 사용
-        line = line.rstrip('\n') # 줄 끝의 개행 문자(엔터)를 제거
-        total_lines.append(line) #total_lines 리스트에 각 로그 라인을 추가. 나중에 보고서를 작성할 때 전체 로그 수를 요약하는 데 사용.
-        # parse_timestamp(line) 함수를 호출해 로그의 처음 19글자(타임스탬프)를 읽어 datetime 객체로 변환 시도.
-        ts = parse_timestamp(line)
-        if ts is not None:
-            # 타임스탬프가 파싱된 경우 리스트에 저장 (보너스: 시간 역순 정렬을 위해)
-            lines_with_timestamp.append((ts, line))
-        else:
-            lines_without_timestamp.append(line)
+        print('로그 캐시를 만드는 중 오류가 발생했습니다:', e)
+        return None, None, None
 
-        # 보너스 과제 조건: 문제가 되는 이벤트만 별도로 추출
-        # 문자열 내 'unstable' 또는 'explosion'이 포함된 경우 해당 라인을 problematic_lines 리스트에 추가
-        if 'unstable' in line.lower() or 'explosion' in line.lower():
-            problematic_lines.append(line)
+    with columns:
+        stats['total'] = len(columns)
+        stats['without_timestamp'] = columns.count_code(CODE_NO_TIMESTAMP)
+        stats['with_timestamp'] = stats['total'] - stats['without_timestamp']
+        try:
+            # 보너스 과제 조건: 문제가 되는 이벤트를 별도의 파일로 저장 (파일명: problematic.log)
+            with open('problematic.log', 'w', encoding='utf-8') as pf:
+                for row in columns.problematic:
+                    line = columns.line(row)
+                    matched = matcher.match(line)
+                    _count_matches(matched, matcher, stats)
+                    _record_problematic(line, matched, matcher, templates, chains)
+                    pf.write(line + '\n')
+        except Exception as e:
+            print('문제가 되는 부분을 저장하는 중 오류가 발생했습니다:', e)
 
-    # 타임스탬프를 기준으로 로그 항목을 최근 순(역순)으로 정렬 (보너스 과제)
-    lines_with_timestamp.sort(key=lambda x: x[0], reverse=True)
-    
-    print('--- 로그 파일 출력 (시간의 역순 정렬) ---')
-    for ts, line in lines_with_timestamp:
-        print(line)
-    # 타임스탬프 파싱 실패한 라인들도 출력
-    for line in lines_without_timestamp:
-        print(line)
+        if print_lines:
+            print('--- 로그 파일 출력 (시간의 역순 정렬) ---')
+            for line in _iter_cached_lines_descending(columns, run_size):
+                print(line)
+            # 타임스탬프 파싱 실패한 라인들도 출력
+            for row in columns.find_code(CODE_NO_TIMESTAMP):
+                print(columns.line(row))
 
-    # 보너스 과제 조건: 문제가 되는 이벤트를 별도의 파일로 저장 (파일명: problematic.log)
-    # 파일을 쓰기 모드('w')로 열고, UTF-8 인코딩으로 문제 이벤트를 한 줄씩 기록.
+    return stats, templates, chains
+
+def load_checkpoint(checkpoint_filename=CHECKPOINT_FILENAME):
+    # follow 모드의 체크포인트를 읽어 dict로 반환 (파일이 없거나 손상된 경우 None)
     try:
-        with open('problematic.log', 'w', encoding='utf-8') as pf:
-            for line in problematic_lines:
-                pf.write(line + '\n')
-    # 저장 도중 오류가 발생하면 오류 메시지를 출력
-    except Exception as e:
-        print('문제가 되는 부분을 저장하는 중 오류가 발생했습니다:', e)
+        with open(checkpoint_filename, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except (ValueError, OSError) as e:
+        print('체크포인트 파일을 읽는 중 오류가 발생했습니다. 처음부터 다시 분석합니다:', e)
+        return None
+
+def save_checkpoint(checkpoint, checkpoint_filename=CHECKPOINT_FILENAME):
+    # 체크포인트를 임시 파일에 쓴 뒤 교체하여, 저장 도중 중단되어도 이전 체크포인트가 깨지지 않도록 함
+    temp_filename = checkpoint_filename + '.tmp'
+    with open(temp_filename, 'w', encoding='utf-8') as f:
+        json.dump(checkpoint, f, ensure_ascii=False)
+    os.replace(temp_filename, checkpoint_filename)
 
-    # 전체 로그와 문제 이벤트 데이터를 반환 (Markdown 보고서 생성에 사용)
-    return total_lines, problematic_lines
+def _find_rotated_file(log_filename, inode):
+    # 로그 교체로 이름이 바뀐 이전 파일(예: mission_computer_main.log.1)을 같은 디렉터리에서 inode로 찾음 (없으면 None)
+    directory = os.path.dirname(os.path.abspath(log_filename))
+    basename = os.path.basename(log_filename)
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.name != basename and entry.name.startswith(basename) and entry.inode() == inode:
+                    return entry.path
+    except OSError:
+        pass
+    return None
+
+def _read_new_lines(f, offset, matcher, stats, templates, chains, pf, final=False):
+    # 열린 로그 파일 f의 offset 이후 라인을 분석하고 (새 오프셋, 처리한 라인 수)를 반환.
+    # 아직 개행 문자로 끝나지 않은 마지막 라인은 final이 아니면 다음 단계에서 처리하도록 남겨둠.
+    processed = 0
+    if offset == 0:
+        # 첫 번째 줄은 헤더라고 가정하여 건너뜁니다. (헤더가 아직 다 쓰이지 않았으면 다음 단계에서 다시 시도)
+        header = f.readline()
+        if header.endswith(b'\n'):
+            offset = f.tell()
+    f.seek(offset)
+    while offset > 0:
+        raw = f.readline()
+        if not raw or (not raw.endswith(b'\n') and not final):
+            break
+        offset += len(raw)
+        line = raw.decode('utf-8').rstrip('\n').removesuffix('\r')
+        _, matched = _aggregate_line(line, matcher, stats)
+        if matched:
+            pf.write(line + '\n')
+            _record_problematic(line, matched, matcher, templates, chains)
+        print(line)
+        processed += 1
+    return offset, processed
 
-def generate_markdown_report(total_lines, problematic_lines):
+def process_new_lines(log_filename=LOG_FILENAME, matcher=None, checkpoint_filename=CHECKPOINT_FILENAME, chain_rules=None):
+    # follow 모드의 한 단계: 체크포인트에 저장된 바이트 오프셋 이후에 추가된 라인만 읽어 분석.
+    # 문제 이벤트는 problematic.log에 이어 쓰고(append), 누적 집계값, 문제 이벤트 템플릿,
+    # 진행 중인 연쇄 이벤트 상태와 새 오프셋을 체크포인트에 저장.
+    # 파일의 inode가 바뀌었거나 크기가 오프셋보다 작아졌으면 로그 교체(rotation)로 보고 새 파일의 처음부터 읽음.
+    # inode가 바뀐 경우, 교체된 이전 파일이 같은 디렉터리에 남아 있으면 마지막 단계 이후 추가된 라인을 먼저 끝까지 읽음.
+    # 아직 개행 문자로 끝나지 않은 마지막 라인은 다음 단계에서 처리하도록 남겨둠.
+    # 반환값: (누적 집계값, 누적 문제 이벤트 템플릿, 연쇄 이벤트, 이번 단계에서 처리한 라인 수)
+    if matcher is None:
+        matcher = KeywordMatcher(load_rules())
+    if chain_rules is None:
+        chain_rules = load_chain_rules()
+    stats = _new_stats(matcher)
+    checkpoint = load_checkpoint(checkpoint_filename)
+    if checkpoint is None or checkpoint.get('log_filename') != os.path.abspath(log_filename):
+        # 처음 실행하는 경우: 이전 실행 결과가 섞이지 않도록 problematic.log를 비우고 시작
+        open('problematic.log', 'w', encoding='utf-8').close()
+        checkpoint = {'log_filename': os.path.abspath(log_filename), 'inode': None, 'offset': 0}
+        templates = TemplateMiner()
+        chains = ChainDetector(chain_rules)
+    else:
+        # 규칙 파일이 바뀌었으면 지금 규칙에 없는 규칙 이름/심각도의 누적값은 버림
+        saved = checkpoint['stats']
+        saved['rule_counts'] = {name: count for name, count in saved['rule_counts'].items()
+                                if name in stats['rule_counts']}
+        saved['severity_counts'] = {severity: count for severity, count in saved['severity_counts'].items()
+                                    if severity in stats['severity_counts']}
+        _merge_stats(stats, saved)
+        templates = TemplateMiner.from_dict(checkpoint['templates'])
+        chains = ChainDetector.from_dict(checkpoint['chains'], chain_rules)
+
+    file_stat = os.stat(log_filename)
+    offset = checkpoint['offset']
+    processed = 0
+    with open('problematic.log', 'a', encoding='utf-8') as pf:
+        if checkpoint['inode'] is not None and (file_stat.st_ino != checkpoint['inode'] or file_stat.st_size < offset):
+            rotated_filename = None
+            if file_stat.st_ino != checkpoint['inode']:
+                rotated_filename = _find_rotated_file(log_filename, checkpoint['inode'])
+            if rotated_filename is not None:
+                # 교체된 파일은 더 이상 쓰이지 않으므로 개행 문자로 끝나지 않은 마지막 라인까지 처리
+                with open(rotated_filename, 'rb') as f:
+                    _, count = _read_new_lines(f, offset, matcher, stats, templates, chains, pf, final=True)
+                processed += count
+            print('로그 파일 교체(rotation)가 감지되어 새 파일의 처음부터 분석합니다.')
+            offset = 0
+
+        with open(log_filename, 'rb') as f:
+            offset, count = _read_new_lines(f, offset, matcher, stats, templates, chains, pf)
+        processed += count
+
+    checkpoint.update({'inode': file_stat.st_ino, 'offset': offset, 'stats': stats, 'templates': templates.to_dict(),
+                       'chains': chains.to_dict()})
+    save_checkpoint(checkpoint, checkpoint_filename)
+    return stats, templates, chains, processed
+
+def follow_log(log_filename=LOG_FILENAME, interval=1.0, once=False, matcher=None):
+    # tail -f처럼 로그 파일을 계속 지켜보면서 새로 추가된 라인만 분석하고, 그때마다 log_analysis.md를 다시 생성.
+    # 보고서는 로그 전체를 다시 읽지 않고 체크포인트의 누적 집계값과 문제 이벤트 템플릿만으로 만듦.
+    # once=True이면 한 번만 처리하고 종료 (cron 등으로 주기적으로 실행할 때 사용). Ctrl+C로 중단.
+    if matcher is None:
+        matcher = KeywordMatcher(load_rules())
+    first = True
+    try:
+        while True:
+            try:
+                stats, templates, chains, processed = process_new_lines(log_filename, matcher)
+            except Exception as e:
+                print('로그 파일을 처리하는 중 오류가 발생했습니다:', e)
+                return
+            if processed or first:
+                generate_markdown_report(stats, templates, chains)
+                first = False
+            if once:
+                return
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        print('\nfollow 모드를 종료합니다.')
+
+def generate_markdown_report(stats, templates, chains):
     # 분석된 로그 데이터를 기반으로 Markdown 형식의 보고서 log_analysis.md( 로그의 전체 요약과 문제 발생 이벤트, 그리고 사고 원인 분석)를 생성.
+    # 전체 로그 라인 대신 read_and_print_log()가 집계한 값(stats)과 문제 이벤트 템플릿(TemplateMiner)만 사용.
+    # 문제 이벤트가 수백만 건이어도 읽을 수 있도록 라인을 그대로 나열하지 않고 템플릿별로 요약함.
     # Markdown은 텍스트 기반의 경량 마크업 언어로, 간단한 문법으로 서식을 지정할 수 있음.
     # 제목, 부제목, 리스트 등 기본 문법을 사용하여 보고서를 작성
 
@@ -96,24 +461,42 @@ def generate_markdown_report(total_lines, problematic_lines):
             
             report_file.write('## 로그 요약\n')
             # 파일에 저장되는 문자열은 기본적으로 '' 사용 (문자열 내에서 필요한 경우 " "도 사용)
-            report_file.write('- 총 로그 항목 수: ' + str(len(total_lines)) + '\n')
-            report_file.write('- 문제 발생 로그 수: ' + str(len(problematic_lines)) + '\n\n')
+            report_file.write('- 총 로그 항목 수: ' + str(stats['total']) + '\n')
+            report_file.write('- 문제 발생 로그 수: ' + str(stats['problematic']) + '\n\n')
             
+            report_file.write('## 규칙별 탐지 현황\n')
+            # 규칙 파일(problem_rules.csv)에 정의된 규칙별/심각도별로 일치한 로그 수를 기록
+            for name, count in stats['rule_counts'].items():
+                report_file.write('- ' + name + ': ' + str(count) + '\n')
+            for severity, count in stats['severity_counts'].items():
+                report_file.write('- 심각도 ' + severity + ': ' + str(count) + '\n')
+            report_file.write('\n')
+
             report_file.write('## 문제 발생 이벤트\n')
-            # 로그 데이터 중 문제가 되는 이벤트(예: 'unstable', 'explosion' 포함)를 목록으로 기록.
-            if problematic_lines:
-                for line in problematic_lines:
-                    report_file.write('- ' + line + '\n')
+            # 로그 데이터 중 문제가 되는 이벤트(규칙 파일의 키워드 포함)를 메시지 템플릿별 표로 기록.
+            if templates.clusters:
+                report_file.write('| 템플릿 | 건수 | 최초 발생 | 최종 발생 | 예시 |\n')
+                report_file.write('| --- | --- | --- | --- | --- |\n')
+                for template, count, first_seen, last_seen, example in templates.templates():
+                    cells = [template, str(count), first_seen, last_seen, example]
+                    # 표 안의 '|' 문자는 열 구분자로 해석되지 않도록 이스케이프
+                    report_file.write('| ' + ' | '.join(cell.replace('|', '\\|') for cell in cells) + ' |\n')
             else:
                 report_file.write('문제가 되는 이벤트는 발견되지 않았습니다.\n')
             
             report_file.write('\n## 사고 원인 분석\n')
-            if problematic_lines:
+            if stats['problematic']:
                 report_file.write('로그 데이터를 분석한 결과, 사고의 원인은 다음과 같이 추정됩니다:\n\n')
-                if any('oxygen tank unstable' in line.lower() for line in problematic_lines):
+                # 문제 라인을 다시 훑지 않고 파싱 단계에서 집계한 규칙별 탐지 건수를 사용
+                if stats['rule_counts'].get('oxygen_tank_unstable'):
                     report_file.write('- 산소 탱크 불안정성이 확인되었습니다.\n')
-                if any('oxygen tank explosion' in line.lower() for line in problematic_lines):
+                if stats['rule_counts'].get('oxygen_tank_explosion'):
                     report_file.write('- 산소 탱크 폭발이 발생하였습니다.\n')
+                # 연쇄 규칙(chain_rules.csv)으로 실제로 확인된 연쇄 이벤트를 발생 시각과 함께 인용
+                for description, name, steps, count, recent in chains.describe():
+                    report_file.write('- ' + description + ' (' + name + '): ' + str(count) + '건 확인\n')
+                    for chain in recent:
+                        report_file.write('  - ' + ' → '.join(timestamp + ' ' + step for timestamp, step in zip(chain, steps)) + '\n')
                 report_file.write('\n이로 미루어 볼 때, 산소 탱크 관련 문제가 전체 미션에 치명적인 영향을 미쳤을 가능성이 높습니다.\n')
             else:
                 report_file.write('문제가 되는 이벤트가 없어 추가 분석이 필요합니다.\n')
@@ -121,14 +504,67 @@ def generate_markdown_report(total_lines, problematic_lines):
         print('보고서를 생성하는 중 오류가 발생했습니다:', e)
 
 def main():
+    # 명령행 옵션: --workers로 병렬 분석에 사용할 프로세스 수를 지정 (기본값 1, 순차 처리)
+    parser = argparse.ArgumentParser(description='mission_computer_main.log 분석기')
+    parser.add_argument('log', nargs='?', default=LOG_FILENAME,
+                        help='로그 파일, 교체된 로그가 모인 디렉터리 또는 glob 패턴 (기본값: mission_computer_main.log)')
+    parser.add_argument('--workers', type=int, default=1, help='로그 분석에 사용할 프로세스 수 (기본값: 1)')
+    parser.add_argument('--quiet', action='store_true', help='정렬된 로그를 터미널에 출력하지 않음')
+    parser.add_argument('--follow', action='store_true', help='새로 추가된 라인만 계속 분석 (체크포인트 사용)')
+    parser.add_argument('--interval', type=float, default=1.0, help='follow 모드에서 파일을 확인하는 주기(초)')
+    parser.add_argument('--once', action='store_true', help='follow 모드에서 새 라인을 한 번만 처리하고 종료')
+    parser.add_argument('--since', help="이 시각 이후의 로그만 조회 ('YYYY-MM-DD HH:MM:SS')")
+    parser.add_argument('--until', help="이 시각 이전의 로그만 조회 ('YYYY-MM-DD HH:MM:SS')")
+    parser.add_argument('--cache', action='store_true', help='열 단위 캐시(.cache)를 만들어 두고 다음 실행부터 재사용')
+    parser.add_argument('--level', help='event 열 값(예: INFO)으로 로그를 조회 (캐시 사용)')
+    args = parser.parse_args()
+
     # Python 설치 확인: 'Hello Mars'를 출력 (설치 확인 및 간단한 출력 요구사항 충족)
     print('Hello Mars')
+
+    if (args.since or args.until or args.follow or args.cache or args.level) and is_log_set(args.log):
+        print('시간 구간 조회, follow 모드, 캐시는 압축되지 않은 단일 로그 파일에서만 사용할 수 있습니다.')
+        return
+
+    # 시각 옵션은 'YYYY-MM-DD HH:MM:SS' 형식의 문자열을 epoch 초로 변환하여 사용
+    since = parse_timestamp(args.since, as_epoch=True) if args.since else None
+    until = parse_timestamp(args.until, as_epoch=True) if args.until else None
+    if (args.since and since is None) or (args.until and until is None):
+        print("시각은 'YYYY-MM-DD HH:MM:SS' 형식으로 입력해야 합니다.")
+        return
+
+    if args.level or ((args.since or args.until) and args.cache):
+        # 캐시 조회: event 범주와 시간 구간을 열 단위 캐시에서 바로 걸러서 출력
+        try:
+            with load_or_build_cache(args.log, KeywordMatcher(load_rules())) as columns:
+                for row in columns.filter(args.level, since, until):
+                    print(columns.line(row))
+        except Exception as e:
+            print('로그 캐시를 조회하는 중 오류가 발생했습니다:', e)
+        return
+
+    if args.since or args.until:
+        # 시간 구간 조회: 희소 타임스탬프 인덱스(mission_computer_main.log.idx)를 사용해 해당 구간만 읽어서 출력
+        try:
+            for line in query_time_window(args.log, since, until):
+                print(line)
+        except Exception as e:
+            print('로그 파일을 조회하는 중 오류가 발생했습니다:', e)
+        return
+
+    if args.follow:
+        # follow 모드: 체크포인트 이후에 추가된 라인만 분석하고 보고서를 갱신
+        follow_log(args.log, interval=args.interval, once=args.once)
+        return
     
     # 로그 파일을 분석하고 출력하는 함수 호출 (예외 처리 포함)
-    total_lines, problematic_lines = read_and_print_log()
-    if total_lines is not None:
+    if args.cache:
+        stats, templates, chains = read_and_print_log_cached(args.log, print_lines=not args.quiet)
+    else:
+        stats, templates, chains = read_and_print_log(args.log, workers=max(1, args.workers), print_lines=not args.quiet)
+    if stats is not None:
         # Markdown 보고서 자동 생성 (요구사항: log_analysis.md로 저장, UTF-8 인코딩)
-        generate_markdown_report(total_lines, problematic_lines)
+        generate_markdown_report(stats, templates, chains)
         print('\nlog_analysis.md 보고서가 생성되었습니다.')
 
 # main.py 파일로 저장되어야 하며, 이 파일이 메인 실행 파일임을 명시 (PEP 8 준수)
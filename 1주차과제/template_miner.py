@@ -0,0 +1,165 @@
+from timestamp_parser import format_epoch, parse_timestamp
+
+# 로그 메시지를 템플릿(패턴)으로 묶는 스트리밍 템플릿 마이너.
+# Drain 알고리즘처럼 (토큰 수 → 앞쪽 토큰들) 순서의 고정 깊이 트리로 후보 템플릿을 좁힌 뒤,
+# 같은 위치의 토큰이 충분히 같으면 같은 템플릿으로 묶고 다른 위치는 '<*>'로 바꿈.
+# 라인 하나를 처리할 때 트리의 깊이와 잎(leaf)의 템플릿 수만큼만 비교하므로 라인당 비용이 일정함.
+
+WILDCARD = '<*>'
+
+class _Node:
+    __slots__ = ('children', 'cluster_ids')
+
+    def __init__(self):
+        self.children = {}
+        self.cluster_ids = []
+
+def _has_digit(token):
+    return any(ch.isdigit() for ch in token)
+
+def split_message(line):
+    # 'timestamp,event,message' 형식의 라인에서 (epoch 초, message)를 꺼냄.
+    # 형식이 다른 라인은 타임스탬프 None과 라인 전체를 message로 사용.
+    epoch = parse_timestamp(line, as_epoch=True)
+    if epoch is None:
+        return None, line
+    parts = line.split(',', 2)
+    if len(parts) < 3:
+        return epoch, line
+    return epoch, parts[2]
+
+class TemplateMiner:
+    """
+    TemplateMiner 클래스는 로그 라인을 한 줄씩 받아 메시지 템플릿별로 묶고,
+    템플릿마다 건수, 최초/최종 발생 시각, 예시 라인을 관리합니다.
+      - depth: 트리의 깊이 (토큰 수 노드 + 앞쪽 depth - 2개 토큰 노드 + 잎)
+      - similarity: 같은 템플릿으로 묶기 위한 최소 토큰 일치 비율
+      - max_children: 노드 하나의 최대 자식 수 (넘으면 '<*>' 자식으로 모음)
+    to_dict()/from_dict()로 상태를 저장했다가 이어서 처리할 수 있습니다 (follow 모드).
+    """
+    def __init__(self, depth=4, similarity=0.7, max_children=100):
+        self.depth = depth
+        self.similarity = similarity
+        self.max_children = max_children
+        self.clusters = []
+        self._root = _Node()
+
+    def add_line(self, line):
+        # 로그 라인 하나를 템플릿에 반영하고 해당 템플릿 번호를 반환
+        epoch, message = split_message(line)
+        return self.add(message, epoch, line)
+
+    def add(self, message, epoch=None, example=None):
+        tokens = message.split()
+        leaf = self._leaf(tokens)
+        cluster_id = self._best_cluster(leaf, tokens)
+        if cluster_id is None:
+            cluster_id = len(self.clusters)
+            self.clusters.append({
+                'tokens': [WILDCARD if _has_digit(token) else token for token in tokens],
+                'count': 0,
+                'first_seen': None,
+                'last_seen': None,
+                'example': example if example is not None else message,
+            })
+            leaf.cluster_ids.append(cluster_id)
+        else:
+            template = self.clusters[cluster_id]['tokens']
+            for i, token in enumerate(tokens):
+                if template[i] != token:
+                    template[i] = WILDCARD
+        self._record(self.clusters[cluster_id], epoch)
+        return cluster_id
+
+    def _record(self, cluster, epoch):
+        # 템플릿의 건수와 최초/최종 발생 시각을 갱신
+        cluster['count'] += 1
+        if epoch is not None:
+            if cluster['first_seen'] is None or epoch < cluster['first_seen']:
+                cluster['first_seen'] = epoch
+            if cluster['last_seen'] is None or epoch > cluster['last_seen']:
+                cluster['last_seen'] = epoch
+
+    def _leaf(self, tokens):
+        # 토큰 수와 앞쪽 토큰들로 트리를 내려가 잎 노드를 찾음 (없으면 만듦).
+        # 숫자가 들어간 토큰은 변수일 가능성이 높으므로 '<*>' 자식으로 보냄.
+        node = self._root.children.get(len(tokens))
+        if node is None:
+            node = self._root.children[len(tokens)] = _Node()
+        for token in tokens[:self.depth - 2]:
+            key = WILDCARD if _has_digit(token) else token
+            child = node.children.get(key)
+            if child is None:
+                if len(node.children) >= self.max_children:
+                    key = WILDCARD
+                    child = node.children.get(key)
+                if child is None:
+                    child = node.children[key] = _Node()
+            node = child
+        return node
+
+    def _best_cluster(self, leaf, tokens):
+        # 잎 노드의 템플릿 중 토큰 일치 비율이 가장 높은 템플릿을 찾음 (기준 미달이면 None)
+        best_id = None
+        best_score = -1.0
+        best_wildcards = 0
+        for cluster_id in leaf.cluster_ids:
+            template = self.clusters[cluster_id]['tokens']
+            if not tokens:
+                return cluster_id
+            same = 0
+            wildcards = 0
+            for template_token, token in zip(template, tokens):
+                if template_token == WILDCARD:
+                    wildcards += 1
+                elif template_token == token:
+                    same += 1
+            score = same / len(tokens)
+            if score > best_score or (score == best_score and wildcards < best_wildcards):
+                best_id, best_score, best_wildcards = cluster_id, score, wildcards
+        if best_id is not None and best_score >= self.similarity:
+            return best_id
+        return None
+
+    def templates(self):
+        # 건수가 많은 순서로 (템플릿 문자열, 건수, 최초 발생, 최종 발생, 예시 라인)을 반환
+        ordered = sorted(self.clusters, key=lambda cluster: -cluster['count'])
+        return [(' '.join(cluster['tokens']), cluster['count'], _format(cluster['first_seen']),
+                 _format(cluster['last_seen']), cluster['example']) for cluster in ordered]
+
+    def to_dict(self):
+        # JSON으로 저장할 수 있는 상태. 템플릿의 '<*>' 위치는 처음 트리에 넣을 때와 달라졌을 수 있으므로
+        # 템플릿으로 트리를 다시 만들지 않고 트리 구조를 그대로 저장함 (다시 시작해도 같은 잎으로 찾아가도록)
+        return {
+            'depth': self.depth,
+            'similarity': self.similarity,
+            'max_children': self.max_children,
+            'clusters': self.clusters,
+            'tree': _node_to_list(self._root),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        miner = cls(data['depth'], data['similarity'], data['max_children'])
+        miner.clusters = data['clusters']
+        if 'tree' in data:
+            miner._root = _node_from_list(data['tree'])
+        else:
+            # 트리 구조가 없는 이전 형식의 상태: 템플릿으로 트리를 다시 만듦
+            for cluster_id, cluster in enumerate(miner.clusters):
+                miner._leaf(cluster['tokens']).cluster_ids.append(cluster_id)
+        return miner
+
+def _node_to_list(node):
+    # 노드를 [템플릿 번호 목록, [[키, 자식], ...]]로 변환 (루트의 키는 토큰 수(int)이므로 dict 대신 쌍의 목록을 사용)
+    return [node.cluster_ids, [[key, _node_to_list(child)] for key, child in node.children.items()]]
+
+def _node_from_list(data):
+    node = _Node()
+    node.cluster_ids = list(data[0])
+    for key, child in data[1]:
+        node.children[key] = _node_from_list(child)
+    return node
+
+def _format(epoch):
+    return format_epoch(epoch) if epoch is not None else '-'
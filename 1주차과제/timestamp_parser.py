@@ -0,0 +1,70 @@
+import datetime
+import time
+
+# 로그 라인의 타임스탬프('YYYY-MM-DD HH:MM:SS') 파서.
+# main.py와 인덱스/캐시 등 로그를 다루는 다른 모듈이 같은 파서를 공유하도록 별도 모듈로 분리.
+
+# parse_timestamp()가 날짜 부분('YYYY-MM-DD')을 파싱한 결과를 기억해 두는 캐시.
+# 로그는 같은 날짜의 라인이 연속해서 나오므로 날짜는 한 번만 검증하고 이후에는 시/분/초만 잘라서 계산.
+_date_cache = {}
+_DATE_CACHE_LIMIT = 4096
+# date.toordinal() 기준 1970-01-01의 서수 (epoch 초 계산용)
+_EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+
+def _parse_date_prefix(date_str):
+    # 'YYYY-MM-DD' 문자열을 (연, 월, 일, 해당 날짜 0시의 epoch 초)로 변환하여 캐시에 저장.
+    # 잘못된 날짜(숫자가 아니거나 2월 30일 등)는 None으로 캐시하여 strptime 경로로 넘김.
+    cached = _date_cache.get(date_str, False)
+    if cached is not False:
+        return cached
+    digits = date_str[0:4] + date_str[5:7] + date_str[8:10]
+    cached = None
+    if digits.isdigit() and digits.isascii():
+        try:
+            date = datetime.date(int(date_str[0:4]), int(date_str[5:7]), int(date_str[8:10]))
+            cached = (date.year, date.month, date.day, (date.toordinal() - _EPOCH_ORDINAL) * 86400)
+        except ValueError:
+            cached = None
+    if len(_date_cache) >= _DATE_CACHE_LIMIT:
+        _date_cache.clear()
+    _date_cache[date_str] = cached
+    return cached
+
+def _parse_timestamp_strptime(timestamp_str, as_epoch=False):
+    # 고정 형식이 아닌 문자열은 기존과 동일하게 datetime 모듈의 strptime 함수로 파싱.
+    # strptime이 허용하는 입력(예: 한 자리 일자)과 거부하는 입력을 기존 동작과 똑같이 유지하기 위한 경로.
+    try:
+        timestamp = datetime.datetime.strptime(timestamp_str, '%Y-%m-%d %H:%M:%S')
+    except ValueError:
+        # 예외 처리: 파싱 실패 시 None 반환 (파일 처리 예외를 처리하는 부분)
+        return None
+    if as_epoch:
+        return (timestamp.toordinal() - _EPOCH_ORDINAL) * 86400 + timestamp.hour * 3600 + timestamp.minute * 60 + timestamp.second
+    return timestamp
+
+def parse_timestamp(line, as_epoch=False):
+    # 이 함수는 로그 파일의 각 줄에서 처음 19글자(예: "2023-08-27 10:00:00")를 읽어, 날짜와 시간 정보를 파싱
+    # 제약조건: 로그 항목의 타임스탬프가 'YYYY-MM-DD HH:MM:SS' 형식임을 가정하고 파싱합니다.
+    # strptime 대신 고정 위치의 숫자를 직접 잘라서 정수로 변환하고, 날짜 부분은 캐시를 사용.
+    # as_epoch=True이면 datetime 객체 대신 epoch 초(정수, 타임스탬프를 UTC로 간주)를 반환.
+    # 고정 형식에 맞지 않는 라인은 strptime 경로로 넘겨 기존과 똑같이 허용/거부함.
+    # 기본 문자열 표기는 ''를 사용 (PEP 8 준수), 로그 라인의 처음 19글자를 추출
+    timestamp_str = line[:19]
+    if (len(timestamp_str) == 19 and timestamp_str[10] == ' '
+            and timestamp_str[13] == ':' and timestamp_str[16] == ':'
+            and timestamp_str[4] == '-' and timestamp_str[7] == '-'):
+        date = _parse_date_prefix(timestamp_str[:10])
+        time_digits = timestamp_str[11:13] + timestamp_str[14:16] + timestamp_str[17:19]
+        if date is not None and time_digits.isdigit() and time_digits.isascii():
+            hour = int(timestamp_str[11:13])
+            minute = int(timestamp_str[14:16])
+            second = int(timestamp_str[17:19])
+            if hour < 24 and minute < 60 and second < 60:
+                if as_epoch:
+                    return date[3] + hour * 3600 + minute * 60 + second
+                return datetime.datetime(date[0], date[1], date[2], hour, minute, second)
+    return _parse_timestamp_strptime(timestamp_str, as_epoch)
+
+def format_epoch(epoch):
+    # epoch 초를 로그의 타임스탬프 형식('YYYY-MM-DD HH:MM:SS')으로 변환 (parse_timestamp와 같이 UTC로 간주)
+    return time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime(epoch))
@@ -0,0 +1,222 @@
+import math
+import mmap
+import os
+import struct
+import sys
+
+from inventory_store import COLUMN_KINDS, SUBSTANCE, InventoryStore, format_cell, row_hash
+
+# 인벤토리를 저장하는 이진 파일 형식 (Mars_Base_Inventory_List.bin).
+# 모든 값은 little-endian이며, 파일은 다음 구역으로 이루어짐:
+#   1. 헤더: 매직, 버전, 열 수, 행 수, 문자열 수, 원문 보존 칸 수, 각 구역의 시작 위치
+#   2. 열 디렉터리: 열마다 (타입, 열 이름의 문자열 번호, 열 데이터의 시작 위치)
+#   3. 열 데이터: 수치 열은 float64(null은 NaN), 문자열 열은 문자열 번호 uint32(null은 0xFFFFFFFF).
+#      모든 열이 고정 폭이므로 N번째 행의 값은 (열 시작 위치 + N * 폭)에서 바로 읽음
+#   4. 문자열 표: 중복을 제거한 문자열들의 시작 위치 표(uint32, 문자열 수 + 1개)와 UTF-8 blob
+#   5. 원문 보존 칸: CSV 원문이 값으로부터 다시 만들어지지 않는 칸(예: '1.50')의 (행, 열, 문자열 번호)
+#   6. 행 정보: 행마다 원래 CSV에서의 행 번호(uint32)와 행 내용 해시(8바이트).
+#      다음 실행 때 CSV와 비교하여 바뀐 행만 찾는 데 사용 (inventory_diff.py)
+# 읽을 때는 mmap으로 열어 필요한 칸만 디코딩하므로, 행 하나를 꺼내거나 인화성 열 하나를 훑을 때
+# 나머지 데이터는 읽지 않음.
+
+BINARY_MAGIC = b'MINVBIN1'
+BINARY_VERSION = 2
+# 헤더: 매직, 버전, 열 수, 행 수, 문자열 수, 원문 보존 칸 수,
+#       문자열 위치 표/문자열 blob/원문 보존 칸/원래 행 번호/행 해시 구역의 시작 위치
+_HEADER = struct.Struct('<8sHHIIIQQQQQ')
+HASH_SIZE = 8
+# 열 디렉터리 항목: 타입(0: 문자열, 1: 수치), 열 이름의 문자열 번호, 열 데이터의 시작 위치
+_COLUMN_ENTRY = struct.Struct('<BxxxIQ')
+_OVERRIDE = struct.Struct('<III')
+_KIND_CODES = {'text': 0, 'number': 1}
+_KIND_NAMES = {code: kind for kind, code in _KIND_CODES.items()}
+NULL_STRING = 0xFFFFFFFF
+
+def save_inventory_binary(inventory, filepath, rows=None):
+    # InventoryStore의 지정한 행들(기본값: 전체, 주어진 순서대로)을 이진 형식으로 저장.
+    # 각 행의 원래 행 번호(InventoryStore에서의 번호)와 내용 해시도 함께 저장함.
+    # 임시 파일에 쓴 뒤 교체하므로 저장 도중 중단되어도 이전 파일이 깨지지 않음.
+    if rows is None:
+        rows = range(len(inventory))
+    rows = list(rows)
+    strings = []
+    string_ids = {}
+
+    def string_id(text):
+        if text is None:
+            return NULL_STRING
+        index = string_ids.get(text)
+        if index is None:
+            index = string_ids[text] = len(strings)
+            strings.append(text)
+        return index
+
+    name_ids = [string_id(name) for name in inventory.header]
+    columns = []
+    for column, kind in enumerate(COLUMN_KINDS):
+        values = inventory.columns[column]
+        if kind == 'number':
+            columns.append(struct.pack('<%dd' % len(rows), *(values[row] for row in rows)))
+        else:
+            columns.append(struct.pack('<%dI' % len(rows), *(string_id(values[row]) for row in rows)))
+    overrides = []
+    for position, row in enumerate(rows):
+        for column in range(len(COLUMN_KINDS)):
+            raw = inventory.raw(row, column)
+            if raw is not None:
+                overrides.append(_OVERRIDE.pack(position, column, string_id(raw)))
+
+    source_rows = struct.pack('<%dI' % len(rows), *rows)
+    hashes = b''.join(row_hash(inventory.text_row(row)) for row in rows)
+
+    encoded = [text.encode('utf-8') for text in strings]
+    string_offsets = [0]
+    for data in encoded:
+        string_offsets.append(string_offsets[-1] + len(data))
+
+    position = _HEADER.size + _COLUMN_ENTRY.size * len(COLUMN_KINDS)
+    column_offsets = []
+    for data in columns:
+        column_offsets.append(position)
+        position += len(data)
+    string_table_offset = position
+    blob_offset = string_table_offset + 4 * len(string_offsets)
+    overrides_offset = blob_offset + string_offsets[-1]
+    source_rows_offset = overrides_offset + _OVERRIDE.size * len(overrides)
+    hashes_offset = source_rows_offset + len(source_rows)
+
+    temp_filepath = filepath + '.tmp'
+    with open(temp_filepath, 'wb') as f:
+        f.write(_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, len(COLUMN_KINDS), len(rows), len(strings), len(overrides),
+                             string_table_offset, blob_offset, overrides_offset, source_rows_offset, hashes_offset))
+        for kind, name_id, offset in zip(COLUMN_KINDS, name_ids, column_offsets):
+            f.write(_COLUMN_ENTRY.pack(_KIND_CODES[kind], name_id, offset))
+        for data in columns:
+            f.write(data)
+        f.write(struct.pack('<%dI' % len(string_offsets), *string_offsets))
+        f.write(b''.join(encoded))
+        f.write(b''.join(overrides))
+        f.write(source_rows)
+        f.write(hashes)
+    os.replace(temp_filepath, filepath)
+
+class InventoryBinary:
+    """
+    InventoryBinary 클래스는 이진 인벤토리 파일을 mmap으로 열어 읽기 전용으로 제공합니다.
+    행 하나(row/text_row)나 열 하나(column_values)를 읽을 때 해당 칸만 디코딩합니다.
+    with 문과 함께 사용하면 블록이 끝날 때 파일이 닫힙니다.
+    """
+    def __init__(self, filepath):
+        self._file = open(filepath, 'rb')
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # 빈 파일은 mmap으로 열 수 없음
+            self._file.close()
+            raise ValueError('이진 인벤토리 파일 형식이 아닙니다: ' + filepath)
+        try:
+            (magic, version, column_count, self.row_count, self.string_count, override_count,
+             self._string_table_offset, self._blob_offset, overrides_offset, self._source_rows_offset,
+             self._hashes_offset) = _HEADER.unpack_from(self._mm, 0)
+        except struct.error:
+            magic, version = None, None
+        if magic != BINARY_MAGIC or version != BINARY_VERSION:
+            self.close()
+            raise ValueError('이진 인벤토리 파일 형식이 아닙니다: ' + filepath)
+
+        self.kinds = []
+        name_ids = []
+        self._column_offsets = []
+        for column in range(column_count):
+            kind, name_id, offset = _COLUMN_ENTRY.unpack_from(self._mm, _HEADER.size + column * _COLUMN_ENTRY.size)
+            self.kinds.append(_KIND_NAMES[kind])
+            name_ids.append(name_id)
+            self._column_offsets.append(offset)
+        self.header = [self.string(name_id) for name_id in name_ids]
+        # 원문 보존 칸은 보통 몇 개 되지 않으므로 dict로 올려 둠
+        self._raw = {}
+        for row, column, index in _OVERRIDE.iter_unpack(
+                self._mm[overrides_offset:overrides_offset + override_count * _OVERRIDE.size]):
+            self._raw[row, column] = self.string(index)
+
+    def close(self):
+        self._mm.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return self.row_count
+
+    def string(self, index):
+        # 문자열 표에서 index번 문자열을 디코딩 (NULL_STRING이면 None)
+        if index == NULL_STRING:
+            return None
+        start, end = struct.unpack_from('<II', self._mm, self._string_table_offset + 4 * index)
+        return self._mm[self._blob_offset + start:self._blob_offset + end].decode('utf-8')
+
+    def value(self, row, column):
+        # 칸 하나의 값 (수치 열은 float, 문자열 열은 str, null이면 None)
+        if not 0 <= row < self.row_count:
+            raise IndexError('행 번호가 범위를 벗어났습니다: ' + str(row))
+        offset = self._column_offsets[column]
+        if self.kinds[column] == 'number':
+            value, = struct.unpack_from('<d', self._mm, offset + 8 * row)
+            return None if math.isnan(value) else value
+        index, = struct.unpack_from('<I', self._mm, offset + 4 * row)
+        return self.string(index)
+
+    def substance(self, row):
+        return self.value(row, SUBSTANCE)
+
+    def source_row(self, row):
+        # 저장할 때 이 행이 원래 몇 번째 행이었는지 (InventoryStore에서의 행 번호)
+        return struct.unpack_from('<I', self._mm, self._source_rows_offset + 4 * row)[0]
+
+    def row_hash(self, row):
+        # 저장할 때 계산해 둔 행 내용 해시 (inventory_store.row_hash()와 같은 값)
+        offset = self._hashes_offset + HASH_SIZE * row
+        return self._mm[offset:offset + HASH_SIZE]
+
+    def row(self, row):
+        return tuple(self.value(row, column) for column in range(len(self.kinds)))
+
+    def text_row(self, row):
+        # 행 하나를 CSV 원문과 같은 문자열 리스트로 복원
+        return [format_cell(column, self.value(row, column), self._raw.get((row, column)))
+                for column in range(len(self.kinds))]
+
+    def text_rows(self):
+        # 헤더와 전체 행을 문자열 리스트의 리스트로 반환
+        return [list(self.header)] + [self.text_row(row) for row in range(self.row_count)]
+
+    def column_values(self, column):
+        # 수치 열 하나를 복사하지 않고 float 시퀀스(memoryview)로 반환 (null은 NaN)
+        offset = self._column_offsets[column]
+        data = memoryview(self._mm)[offset:offset + 8 * self.row_count]
+        if sys.byteorder == 'little':
+            return data.cast('d')
+        return [value for value, in struct.iter_unpack('<d', data)]
+
+    def filter_rows(self, column, minimum=None, maximum=None):
+        # 수치 열 하나만 훑어 값이 minimum 이상, maximum 이하인 행 번호 목록을 반환 (null인 행은 제외)
+        values = self.column_values(column)
+        try:
+            return [row for row, value in enumerate(values)
+                    if not math.isnan(value)
+                    and (minimum is None or value >= minimum)
+                    and (maximum is None or value <= maximum)]
+        finally:
+            if isinstance(values, memoryview):
+                values.release()
+
+    def to_store(self):
+        # 전체 행을 InventoryStore로 읽어옴 (CSV에서 읽은 것과 같은 저장소가 됨)
+        store = InventoryStore(self.header)
+        for row in range(self.row_count):
+            store.append(self.text_row(row))
+        return store
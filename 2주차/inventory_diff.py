@@ -0,0 +1,97 @@
+import heapq
+import math
+
+from inventory_store import FLAMMABILITY, SUBSTANCE, row_hash
+
+# 이전 실행에서 저장한 이진 인벤토리(스냅샷)와 새로 읽은 CSV를 비교하는 모듈.
+# 이진 파일에 저장해 둔 행 해시와 새 행의 해시를 비교하여 추가/삭제/변경된 물질을 찾고,
+# 바뀐 행만으로 인화성 순 정렬 목록과 위험 항목 목록을 갱신함.
+# 같은 이름의 물질이 여러 번 나올 수 있으므로 (Substance, 몇 번째로 나왔는지)를 행의 키로 사용.
+
+def snapshot_keys(substances):
+    # 원래 순서대로 나열된 Substance 목록에 대해 (Substance, 같은 이름 중 몇 번째인지) 키 목록을 반환
+    seen = {}
+    keys = []
+    for substance in substances:
+        occurrence = seen.get(substance, 0)
+        seen[substance] = occurrence + 1
+        keys.append((substance, occurrence))
+    return keys
+
+class InventoryDelta:
+    """
+    InventoryDelta 클래스는 이전 스냅샷(InventoryBinary)과 새 인벤토리(InventoryStore)의 차이를 계산합니다.
+      - added, removed, changed: 추가/삭제/내용이 바뀐 물질 이름 목록
+      - row_map: 바뀌지 않은 행의 {스냅샷의 행 번호: 새 인벤토리의 행 번호}
+      - reordered: 바뀌지 않은 행들의 순서가 달라졌는지 여부
+    """
+    def __init__(self, inventory, binary):
+        self.inventory = inventory
+        self.binary = binary
+        # 스냅샷의 행은 정렬된 순서로 저장되어 있으므로 원래 행 번호 순서로 키를 매김
+        old_rows = sorted(range(len(binary)), key=binary.source_row)
+        old = {}
+        for old_row, key in zip(old_rows, snapshot_keys(binary.substance(row) for row in old_rows)):
+            old[key] = old_row
+        new_keys = snapshot_keys(inventory.value(row, SUBSTANCE) for row in range(len(inventory)))
+
+        self.added = []
+        self.changed = []
+        self.row_map = {}
+        self.delta_rows = []  # 새 인벤토리에서 추가되거나 바뀐 행 번호
+        for row, key in enumerate(new_keys):
+            old_row = old.pop(key, None)
+            if old_row is None:
+                self.added.append(key[0])
+                self.delta_rows.append(row)
+            elif binary.row_hash(old_row) != row_hash(inventory.text_row(row)):
+                self.changed.append(key[0])
+                self.delta_rows.append(row)
+            else:
+                self.row_map[old_row] = row
+        self.removed = [key[0] for key in old]
+        # 스냅샷에서 삭제되었거나 내용이 바뀐 행 번호
+        self.dropped_rows = [old_row for old_row in old_rows if old_row not in self.row_map]
+        mapped = [self.row_map[old_row] for old_row in old_rows if old_row in self.row_map]
+        self.reordered = any(earlier > later for earlier, later in zip(mapped, mapped[1:]))
+
+    @property
+    def unchanged(self):
+        # 스냅샷과 새 인벤토리가 행 순서까지 완전히 같으면 True
+        return not (self.added or self.removed or self.changed or self.reordered)
+
+    def _sort_key(self, row):
+        # 인화성 내림차순, 같은 값은 원래 행 순서, null은 맨 뒤 (InventoryStore 전체 정렬과 같은 순서)
+        value = self.inventory.columns[FLAMMABILITY][row]
+        return (1, 0.0, row) if math.isnan(value) else (0, -value, row)
+
+    def sorted_rows(self):
+        # 인화성 순으로 정렬한 새 인벤토리의 행 번호 목록.
+        # 스냅샷은 이미 정렬되어 있으므로 바뀌지 않은 행은 그 순서를 그대로 쓰고,
+        # 추가/변경된 행만 정렬하여 병합함 (O(n + d log d), d는 바뀐 행 수).
+        # 스냅샷의 순서가 새 정렬 기준과 맞지 않으면(예: 행 순서가 바뀜) None을 반환하며, 이때는 전체를 다시 정렬해야 함.
+        kept = [self.row_map[old_row] for old_row in range(len(self.binary)) if old_row in self.row_map]
+        keys = [self._sort_key(row) for row in kept]
+        if any(earlier > later for earlier, later in zip(keys, keys[1:])):
+            return None
+        delta = sorted(self.delta_rows, key=self._sort_key)
+        return list(heapq.merge(kept, delta, key=self._sort_key))
+
+    def danger_rows(self, old_index, threshold):
+        # 인화성 지수가 threshold 이상인 새 인벤토리의 행 번호 목록 (원래 순서).
+        # 스냅샷의 인화성 인덱스(old_index)로 이전 위험 항목을 찾은 뒤, 추가/변경된 행만 다시 검사함.
+        rows = [self.row_map[old_row] for old_row in old_index.at_least(threshold) if old_row in self.row_map]
+        values = self.inventory.columns[FLAMMABILITY]
+        rows.extend(row for row in self.delta_rows if not math.isnan(values[row]) and values[row] >= threshold)
+        return sorted(rows)
+
+    def danger_changed(self, threshold):
+        # 위험 항목 목록이 스냅샷 때와 달라졌는지 (삭제/변경/추가된 행 중 이전이나 지금 위험 항목인 행이 있는지)
+        if self.reordered:
+            return True
+        for old_row in self.dropped_rows:
+            value = self.binary.value(old_row, FLAMMABILITY)
+            if value is not None and value >= threshold:
+                return True
+        values = self.inventory.columns[FLAMMABILITY]
+        return any(not math.isnan(values[row]) and values[row] >= threshold for row in self.delta_rows)
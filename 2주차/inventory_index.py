@@ -0,0 +1,112 @@
+import array
+import bisect
+import math
+import os
+import struct
+import sys
+import zlib
+
+# 인화성 지수로 정렬해 둔 인벤토리 인덱스.
+# 인화성 지수가 큰 순서로 (인화성 지수, 행 번호)를 한 번만 정렬해 두고,
+# '0.7 이상', '0.5 이상 0.8 이하', '상위 20개' 같은 질의를 이진 탐색(bisect)으로 처리함.
+# 이진 인벤토리 파일 옆에 Mars_Base_Inventory_List.bin.idx로 저장하며, 이진 파일이 바뀌면 다시 만듦.
+# 수치 열은 고정 폭이라 값이 바뀌어도 파일 크기가 같으므로, 인덱싱한 열 내용의 CRC32로 바뀌었는지 확인함.
+
+INDEX_MAGIC = b'MINVIDX2'
+# 헤더: 매직, 항목 수, 인덱싱한 이진 파일의 크기, 인덱싱한 열의 CRC32
+_HEADER = struct.Struct('<8sQQI')
+
+def index_filepath_for(binary_filepath):
+    # 이진 인벤토리 파일에 대응하는 인덱스 파일 이름 (예: Mars_Base_Inventory_List.bin.idx)
+    return binary_filepath + '.idx'
+
+def column_checksum(values):
+    # 수치 열(InventoryBinary.column_values()의 결과)의 내용으로 계산한 CRC32 (little-endian float64 바이트 기준)
+    if isinstance(values, memoryview):
+        return zlib.crc32(values)
+    return zlib.crc32(struct.pack('<%dd' % len(values), *values))
+
+class FlammabilityIndex:
+    """
+    FlammabilityIndex 클래스는 인화성 지수가 null이 아닌 행들을 인화성 지수의 내림차순으로 보관합니다.
+    keys는 이진 탐색을 위해 인화성 지수의 부호를 바꾼 값(오름차순), rows는 같은 순서의 행 번호이며,
+    인화성 지수가 같은 행들은 원래 행 순서를 유지합니다.
+    질의 결과는 모두 인화성 지수의 내림차순 행 번호 목록입니다.
+    """
+    def __init__(self, keys, rows):
+        self.keys = keys
+        self.rows = rows
+
+    @classmethod
+    def build(cls, values):
+        # 수치 열(float 시퀀스, null은 NaN)로 인덱스를 만듦. 정렬은 여기서 한 번만 수행
+        order = sorted((row for row in range(len(values)) if not math.isnan(values[row])),
+                       key=lambda row: -values[row])
+        return cls(array.array('d', [-values[row] for row in order]), array.array('q', order))
+
+    def __len__(self):
+        return len(self.rows)
+
+    def descending(self):
+        # 전체 행 번호를 인화성 지수의 내림차순으로 반환
+        return list(self.rows)
+
+    def at_least(self, threshold):
+        # 인화성 지수가 threshold 이상인 행 번호 목록
+        return list(self.rows[:bisect.bisect_right(self.keys, -threshold)])
+
+    def between(self, minimum, maximum):
+        # 인화성 지수가 minimum 이상, maximum 이하인 행 번호 목록
+        start = bisect.bisect_left(self.keys, -maximum)
+        end = bisect.bisect_right(self.keys, -minimum)
+        return list(self.rows[start:end]) if start < end else []
+
+    def top(self, count):
+        # 인화성 지수가 가장 큰 count개의 행 번호 목록
+        return list(self.rows[:max(count, 0)])
+
+    def save(self, filepath, binary_filepath, checksum):
+        # 인덱스를 이진 인벤토리 파일의 크기, 인덱싱한 열의 CRC32와 함께 저장 (임시 파일에 쓴 뒤 교체)
+        temp_filepath = filepath + '.tmp'
+        with open(temp_filepath, 'wb') as f:
+            f.write(_HEADER.pack(INDEX_MAGIC, len(self.rows), os.path.getsize(binary_filepath), checksum))
+            for column in (self.keys, self.rows):
+                column = array.array(column.typecode, column)
+                if sys.byteorder != 'little':
+                    column.byteswap()
+                column.tofile(f)
+        os.replace(temp_filepath, filepath)
+
+def load_index(filepath, binary_filepath, checksum):
+    # 저장된 인덱스를 읽음. 파일이 없거나, 형식이 다르거나, 이진 파일의 크기나 열 내용(checksum)이 바뀌었으면 None
+    try:
+        size_now = os.path.getsize(binary_filepath)
+        with open(filepath, 'rb') as f:
+            magic, count, size, saved_checksum = _HEADER.unpack(f.read(_HEADER.size))
+            if magic != INDEX_MAGIC or size != size_now or saved_checksum != checksum:
+                return None
+            keys = array.array('d')
+            rows = array.array('q')
+            keys.fromfile(f, count)
+            rows.fromfile(f, count)
+    except (OSError, EOFError, struct.error):
+        return None
+    if sys.byteorder != 'little':
+        keys.byteswap()
+        rows.byteswap()
+    return FlammabilityIndex(keys, rows)
+
+def load_or_build_index(binary, binary_filepath, column, rebuild=False):
+    # 이진 인벤토리(InventoryBinary)에 맞는 저장된 인덱스가 있으면 읽고, 없거나 rebuild이면 column 열로 새로 만들어 저장
+    filepath = index_filepath_for(binary_filepath)
+    values = binary.column_values(column)
+    try:
+        checksum = column_checksum(values)
+        index = None if rebuild else load_index(filepath, binary_filepath, checksum)
+        if index is None:
+            index = FlammabilityIndex.build(values)
+            index.save(filepath, binary_filepath, checksum)
+    finally:
+        if isinstance(values, memoryview):
+            values.release()
+    return index
@@ -0,0 +1,174 @@
+import argparse
+
+from inventory_store import COLUMN_KINDS, FLAMMABILITY, NULL_MARKERS, SUBSTANCE, format_cell, parse_number
+from inventory_stream import iter_inventory_csv
+
+# 기지(habitat)마다 받은 여러 인벤토리 CSV를 Substance 기준으로 합치는 도구.
+# 각 파일을 한 번씩만 훑으면서 Substance를 키로 하는 해시 테이블(dict)에 합치므로(hash join),
+# 파일 수와 행 수가 늘어나도 행마다 한 번의 dict 조회만 필요함 (행끼리 비교하는 중첩 반복 없음).
+# 실행: python inventory_merge.py base_a.csv base_b.csv base_c.csv -o Mars_Base_Inventory_merged.csv
+
+MERGED_FILENAME = 'Mars_Base_Inventory_merged.csv'
+# 같은 Substance의 값이 파일마다 다를 때 사용할 수 있는 정책.
+# 문자열 열에는 first/last만 의미가 있으므로 다른 정책은 first로 처리.
+#   - first: 먼저 읽은 파일의 값 / last: 나중에 읽은 파일의 값
+#   - min/max: 가장 작은/큰 값 / mean: 평균
+POLICIES = ('first', 'last', 'min', 'max', 'mean')
+DEFAULT_POLICY = 'first'
+# 인화성 지수는 안전을 위해 기본적으로 가장 큰 값을 사용
+DEFAULT_COLUMN_POLICIES = {FLAMMABILITY: 'max'}
+# mean 정책의 평균값은 이 자리수에서 반올림하여 씀 (0.8500000000000001 같은 부동소수점 오차가 CSV에 남지 않도록)
+MEAN_DIGITS = 6
+
+def substance_key(substance):
+    # 조인 키: 앞뒤 공백과 대소문자 차이는 같은 물질로 봄
+    return substance.strip().casefold()
+
+class InventoryMerger:
+    """
+    InventoryMerger 클래스는 인벤토리 파일들을 차례로 받아 Substance별로 하나의 행으로 합칩니다.
+      - policy: 값이 충돌할 때의 기본 정책 (POLICIES 중 하나)
+      - column_policies: 열 번호별 정책 (지정하지 않은 열은 DEFAULT_COLUMN_POLICIES, 그다음 policy를 사용)
+      - sources: 파일별 통계 (행 수, 새 물질 수, 기존 물질과 합친 행 수, 값이 충돌한 칸 수)
+    null 값은 다른 파일의 값을 덮어쓰지 않으며, 결과 행은 처음 나온 순서대로 내보냅니다.
+    """
+    def __init__(self, policy=DEFAULT_POLICY, column_policies=None):
+        column_policies = column_policies or {}
+        self.policies = [column_policies.get(column, DEFAULT_COLUMN_POLICIES.get(column, policy))
+                         for column in range(len(COLUMN_KINDS))]
+        self.header = None
+        self.sources = []
+        # 조인 키 -> 열별 [값, 원문, 합계, 개수]
+        self._merged = {}
+
+    def add_file(self, filepath):
+        # 파일 하나를 한 번만 훑어 해시 테이블에 합치고, 이 파일의 통계를 반환
+        stats = {'source': filepath, 'rows': 0, 'new': 0, 'merged': 0, 'conflicts': 0}
+        rows = iter_inventory_csv(filepath)
+        header = next(rows)
+        if self.header is None:
+            self.header = header
+        elif header != self.header:
+            print('헤더가 다른 파일입니다. 열 순서가 같다고 보고 합칩니다:', filepath)
+        for fields in rows:
+            stats['rows'] += 1
+            self._check_numbers(fields)
+            key = substance_key(fields[SUBSTANCE])
+            cells = self._merged.get(key)
+            if cells is None:
+                self._merged[key] = [self._new_cell(column, text) for column, text in enumerate(fields)]
+                stats['new'] += 1
+                continue
+            stats['merged'] += 1
+            for column in range(1, len(COLUMN_KINDS)):
+                if self._merge_cell(column, cells[column], fields[column]):
+                    stats['conflicts'] += 1
+        self.sources.append(stats)
+        return stats
+
+    def _check_numbers(self, fields):
+        # 수치 열에 숫자가 아닌 값이 있으면 경고를 출력하고 null로 바꿈 (행은 그대로 합침)
+        for column, kind in enumerate(COLUMN_KINDS):
+            if kind == 'number' and fields[column] not in NULL_MARKERS and parse_number(fields[column]) is None:
+                print('숫자가 아닌 값을 null로 처리합니다:', self.header[column], '=', fields[column],
+                      '(' + fields[SUBSTANCE] + ')')
+                fields[column] = NULL_MARKERS[0]
+
+    def _new_cell(self, column, text):
+        value = self._parse(column, text)
+        return [value, text, value if isinstance(value, float) else 0.0, 0 if value is None else 1]
+
+    def _parse(self, column, text):
+        if COLUMN_KINDS[column] == 'number':
+            return parse_number(text)
+        return None if text in NULL_MARKERS else text
+
+    def _merge_cell(self, column, cell, text):
+        # 칸 하나에 새 값을 합치고, 두 값이 모두 있는데 서로 다르면 True(충돌)를 반환
+        value = self._parse(column, text)
+        if value is None:
+            return False
+        current = cell[0]
+        cell[2] += value if isinstance(value, float) else 0.0
+        cell[3] += 1
+        if current is None:
+            cell[0], cell[1] = value, text
+            return False
+        if value == current:
+            return False
+        policy = self.policies[column]
+        if COLUMN_KINDS[column] == 'text' and policy not in ('first', 'last'):
+            policy = 'first'
+        if (policy == 'last' or (policy == 'min' and value < current)
+                or (policy == 'max' and value > current)):
+            cell[0], cell[1] = value, text
+        elif policy == 'mean':
+            cell[0] = round(cell[2] / cell[3], MEAN_DIGITS)
+            cell[1] = None
+        return True
+
+    def iter_rows(self):
+        # 합친 결과를 헤더부터 한 행씩 문자열 리스트로 반환하는 제너레이터
+        yield list(self.header)
+        for cells in self._merged.values():
+            yield [text if text is not None else format_cell(column, value)
+                   for column, (value, text, _, _) in enumerate(cells)]
+
+    def __len__(self):
+        return len(self._merged)
+
+def merge_inventories(filepaths, output_filepath=MERGED_FILENAME, policy=DEFAULT_POLICY, column_policies=None):
+    # 여러 인벤토리 파일을 합쳐 output_filepath에 저장하고 InventoryMerger를 반환 (통계 확인용)
+    merger = InventoryMerger(policy, column_policies)
+    for filepath in filepaths:
+        merger.add_file(filepath)
+    with open(output_filepath, 'w', encoding='utf-8') as f:
+        for fields in merger.iter_rows():
+            f.write(','.join(fields) + '\n')
+    return merger
+
+def parse_column_policy(text, header):
+    # 'Flammability=max' 또는 '4=max' 형식을 (열 번호, 정책)으로 변환
+    name, _, policy = text.rpartition('=')
+    if policy not in POLICIES:
+        raise ValueError('알 수 없는 정책입니다: ' + policy)
+    if name.isdigit():
+        column = int(name)
+    elif name in header:
+        column = header.index(name)
+    else:
+        raise ValueError('알 수 없는 열입니다: ' + name)
+    if not 0 < column < len(COLUMN_KINDS):
+        raise ValueError('Substance 열에는 정책을 지정할 수 없습니다: ' + name)
+    return column, policy
+
+def print_source_stats(merger):
+    print('--- 파일별 통계 ---')
+    print('%-40s %10s %10s %10s %10s' % ('source', 'rows', 'new', 'merged', 'conflicts'))
+    for stats in merger.sources:
+        print('%-40s %10d %10d %10d %10d'
+              % (stats['source'], stats['rows'], stats['new'], stats['merged'], stats['conflicts']))
+    print('합친 결과: %d개 물질' % len(merger))
+
+def main():
+    parser = argparse.ArgumentParser(description='여러 기지의 인벤토리 CSV를 Substance 기준으로 합치는 도구')
+    parser.add_argument('inputs', nargs='+', help='합칠 인벤토리 CSV 파일들 (앞에 적은 파일부터 읽음)')
+    parser.add_argument('-o', '--output', default=MERGED_FILENAME, help='결과 파일 (기본값: ' + MERGED_FILENAME + ')')
+    parser.add_argument('--policy', choices=POLICIES, default=DEFAULT_POLICY,
+                        help='값이 충돌할 때의 기본 정책 (기본값: first, 단 Flammability는 max)')
+    parser.add_argument('--column-policy', action='append', default=[], metavar='COLUMN=POLICY',
+                        help='열별 정책 (예: Flammability=max, "Weight (g/cm³)=mean"). 여러 번 지정 가능')
+    args = parser.parse_args()
+
+    try:
+        header = next(iter_inventory_csv(args.inputs[0]))
+        column_policies = dict(parse_column_policy(text, header) for text in args.column_policy)
+        merger = merge_inventories(args.inputs, args.output, args.policy, column_policies)
+    except Exception as e:
+        print('인벤토리를 합치는 중 오류가 발생했습니다:', e)
+        return
+    print_source_stats(merger)
+    print('합친 인벤토리를 %s에 저장했습니다.' % args.output)
+
+if __name__ == '__main__':
+    main()
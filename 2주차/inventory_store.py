@@ -0,0 +1,131 @@
+import array
+import hashlib
+import math
+
+# 인벤토리 CSV를 한 번만 파싱하여 열(column)마다 파이썬 기본 타입으로 보관하는 저장소.
+# 수치 열은 array('d')에 float로 저장하므로 정렬/필터링할 때 문자열을 다시 float로 바꾸지 않음.
+# 'Various'처럼 값이 정해지지 않은 표시는 명시적인 null(수치 열은 NaN으로 저장, 읽을 때는 None)로 바꿈.
+
+# 열 번호 (Substance,Weight (g/cm³),Specific Gravity,Strength,Flammability)
+SUBSTANCE = 0
+WEIGHT = 1
+SPECIFIC_GRAVITY = 2
+STRENGTH = 3
+FLAMMABILITY = 4
+# 열별 타입: 'text'는 문자열, 'number'는 float
+COLUMN_KINDS = ('text', 'number', 'number', 'text', 'number')
+# null로 처리하는 표시. CSV로 다시 쓸 때는 NULL_TEXT로 씀
+NULL_MARKERS = ('Various', '')
+NULL_TEXT = 'Various'
+
+def parse_number(text):
+    # 수치 문자열을 float로 변환. null 표시이거나 숫자가 아니면 None
+    if text in NULL_MARKERS:
+        return None
+    try:
+        value = float(text)
+    except ValueError:
+        return None
+    return None if math.isnan(value) else value
+
+def format_number(value):
+    # float를 CSV에 쓸 문자열로 변환 (가장 짧은 표현을 사용하고, 정수 값은 '0'처럼 소수점 없이 씀)
+    if value is None:
+        return NULL_TEXT
+    text = repr(value)
+    return text[:-2] if text.endswith('.0') else text
+
+def format_cell(column, value, raw=None):
+    # 칸 하나의 값을 CSV에 쓸 문자열로 변환 (raw는 따로 기억해 둔 원문)
+    if raw is not None:
+        return raw
+    if COLUMN_KINDS[column] == 'number':
+        return format_number(value)
+    return NULL_TEXT if value is None else value
+
+def row_hash(fields):
+    # 행 하나(CSV 문자열 리스트)의 내용 해시 (8바이트). 스냅샷끼리 바뀐 행을 찾는 데 사용
+    return hashlib.blake2b('\x1f'.join(fields).encode('utf-8'), digest_size=8).digest()
+
+class InventoryStore:
+    """
+    InventoryStore 클래스는 인벤토리 데이터를 열 단위로 보관합니다.
+      - columns[i]: 수치 열은 array('d') (null은 NaN), 문자열 열은 list (null은 None)
+      - 원래 문자열이 format_number()/NULL_TEXT로 다시 만들어지지 않는 칸(예: '1.50', 'N/A')은
+        원문을 따로 기억하여 CSV로 다시 쓸 때 그대로 복원합니다.
+      - 숫자로 읽을 수 없는 값은 null로 처리하고 invalid에 (행 번호, 열 번호, 원문)으로 기록합니다.
+    """
+    def __init__(self, header):
+        self.header = list(header)
+        self.columns = [array.array('d') if kind == 'number' else [] for kind in COLUMN_KINDS]
+        self.invalid = []
+        self._raw = {}  # (행 번호, 열 번호) -> 원래 문자열
+
+    def __len__(self):
+        return len(self.columns[SUBSTANCE])
+
+    def append(self, fields):
+        # CSV 한 행(문자열 리스트)을 열별 타입으로 한 번만 변환하여 추가
+        row = len(self)
+        for column, (kind, text) in enumerate(zip(COLUMN_KINDS, fields)):
+            if kind == 'number':
+                value = parse_number(text)
+                if value is None and text not in NULL_MARKERS:
+                    self.invalid.append((row, column, text))
+                self.columns[column].append(math.nan if value is None else value)
+                if format_number(value) != text:
+                    self._raw[row, column] = text
+            else:
+                value = None if text in NULL_MARKERS else text
+                self.columns[column].append(value)
+                if value is None and text != NULL_TEXT:
+                    self._raw[row, column] = text
+
+    def value(self, row, column):
+        # 칸 하나의 값 (null이면 None)
+        value = self.columns[column][row]
+        if COLUMN_KINDS[column] == 'number' and math.isnan(value):
+            return None
+        return value
+
+    def row(self, row):
+        # 행 하나를 타입이 있는 값들의 튜플로 반환
+        return tuple(self.value(row, column) for column in range(len(COLUMN_KINDS)))
+
+    def raw(self, row, column):
+        # 따로 기억해 둔 칸의 원문 (값으로부터 원문이 그대로 만들어지는 칸이면 None)
+        return self._raw.get((row, column))
+
+    def text(self, row, column):
+        # 칸 하나를 CSV에 쓸 문자열로 반환 (원문이 따로 기억되어 있으면 원문)
+        return format_cell(column, self.value(row, column), self.raw(row, column))
+
+    def text_row(self, row):
+        return [self.text(row, column) for column in range(len(COLUMN_KINDS))]
+
+    def text_rows(self, rows=None):
+        # 헤더와 지정한 행들(기본값: 전체)을 문자열 리스트의 리스트로 반환 (CSV 저장/출력용)
+        if rows is None:
+            rows = range(len(self))
+        return [list(self.header)] + [self.text_row(row) for row in rows]
+
+    def null_rows(self, column):
+        # 수치 열의 값이 null인 행 번호 목록
+        values = self.columns[column]
+        return [row for row in range(len(self)) if math.isnan(values[row])]
+
+def load_inventory_csv(filepath):
+    # CSV 파일을 읽어 InventoryStore로 반환 (첫 줄은 헤더). 열 수가 맞지 않는 행은 경고를 출력한 뒤 건너뜀
+    with open(filepath, 'r', encoding='utf-8') as f:
+        header = f.readline().strip().split(',')
+        store = InventoryStore(header)
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            fields = line.split(',')
+            if len(fields) != len(COLUMN_KINDS):
+                print('열 수가 맞지 않는 행을 건너뜁니다:', line)
+                continue
+            store.append(fields)
+    return store
@@ -0,0 +1,111 @@
+import heapq
+import os
+import tempfile
+
+from inventory_store import COLUMN_KINDS, FLAMMABILITY, NULL_MARKERS, parse_number
+
+# 메모리에 다 올릴 수 없을 만큼 큰 인벤토리 CSV를 한 줄씩 처리하는 스트리밍 모듈.
+# 행은 필요할 때 하나씩 읽고(제너레이터), 인화성 순 정렬은 run_size 행 단위로 정렬한 run을
+# 임시 파일로 내보낸 뒤 heapq.merge로 병합하는 external merge sort로 수행하므로 메모리 사용량이 일정함.
+
+# 정렬할 때 메모리에 모아 두는 최대 행 수 (이 수만큼 모이면 정렬하여 임시 파일로 내보냄)
+RUN_SIZE = 100000
+# 인화성 지수가 null인 행의 정렬 키 (내림차순 정렬에서 맨 뒤로 감)
+_NULL_KEY = float('-inf')
+
+def iter_inventory_csv(filepath):
+    # 인벤토리 CSV를 한 줄씩 읽어 문자열 리스트로 반환하는 제너레이터. 첫 번째 값은 헤더.
+    # 빈 줄은 건너뛰고, 열 수가 맞지 않는 행은 경고를 출력한 뒤 건너뜀.
+    with open(filepath, 'r', encoding='utf-8') as f:
+        yield f.readline().strip().split(',')
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            fields = line.split(',')
+            if len(fields) != len(COLUMN_KINDS):
+                print('열 수가 맞지 않는 행을 건너뜁니다:', line)
+                continue
+            yield fields
+
+def flammability_key(fields):
+    # 정렬 키: 인화성 지수(float). null이거나 숫자가 아니면 _NULL_KEY
+    value = parse_number(fields[FLAMMABILITY])
+    return _NULL_KEY if value is None else value
+
+def iter_keyed_rows(rows):
+    # (인화성 지수 정렬 키, 문자열 리스트)를 반환. 숫자가 아닌 인화성 지수는 경고를 출력하고 null로 처리
+    for fields in rows:
+        key = flammability_key(fields)
+        if key == _NULL_KEY and fields[FLAMMABILITY] not in NULL_MARKERS:
+            print('숫자가 아닌 값을 null로 처리합니다:', fields[FLAMMABILITY], '(' + fields[0] + ')')
+        yield key, fields
+
+def _spill_run(run, run_dir, run_paths):
+    # 메모리에 모인 (정렬 키, 문자열 리스트) 묶음을 인화성 내림차순으로 정렬해 임시 파일로 내보냄
+    # (list.sort는 안정 정렬이므로 인화성 지수가 같은 행은 원래 순서를 유지)
+    run.sort(key=lambda item: item[0], reverse=True)
+    run_path = os.path.join(run_dir, 'run_%06d.txt' % len(run_paths))
+    with open(run_path, 'w', encoding='utf-8') as rf:
+        for key, fields in run:
+            rf.write(repr(key) + '\t' + ','.join(fields) + '\n')
+    run_paths.append(run_path)
+    run.clear()
+
+def _read_run(run_path):
+    with open(run_path, 'r', encoding='utf-8') as rf:
+        for row in rf:
+            key, line = row.rstrip('\n').split('\t', 1)
+            yield float(key), line.split(',')
+
+def external_sort(keyed_rows, run_size=RUN_SIZE, run_dir=None):
+    # (정렬 키, 문자열 리스트)를 정렬 키의 내림차순으로 반환하는 제너레이터 (external merge sort).
+    # 메모리에는 run_size 행과 run마다 한 줄씩만 올리며, 임시 파일은 병합이 끝나면 지움.
+    # heapq.merge는 앞쪽 run을 먼저 내보내는 안정 병합이므로 결과는 sorted(..., reverse=True)와 같음.
+    with tempfile.TemporaryDirectory(dir=run_dir) as work_dir:
+        run = []
+        run_paths = []
+        for item in keyed_rows:
+            run.append(item)
+            if len(run) >= run_size:
+                _spill_run(run, work_dir, run_paths)
+        if not run_paths:
+            # 한 run에 모두 들어가면 임시 파일 없이 메모리에서 정렬
+            run.sort(key=lambda item: item[0], reverse=True)
+            yield from run
+            return
+        if run:
+            _spill_run(run, work_dir, run_paths)
+        runs = [_read_run(run_path) for run_path in run_paths]
+        yield from heapq.merge(*runs, key=lambda item: item[0], reverse=True)
+
+def top_k(keyed_rows, count):
+    # 인화성 지수가 가장 큰 count개의 (정렬 키, 문자열 리스트)를 내림차순으로 반환.
+    # 전체를 정렬하지 않고 크기 count의 힙만 유지함 (heapq.nlargest, 같은 값은 원래 순서 유지)
+    rows = heapq.nlargest(count, keyed_rows, key=lambda item: item[0])
+    return [item for item in rows if item[0] != _NULL_KEY]
+
+def stream_danger_and_sort(filepath, danger_filepath, sorted_filepath, threshold=0.7, run_size=RUN_SIZE):
+    # 인벤토리 CSV를 한 번만 훑으면서 인화성 지수가 threshold 이상인 행을 danger_filepath에 바로 쓰고,
+    # 같은 스트림을 external merge sort로 정렬하여 sorted_filepath에 씀.
+    # 반환값: (전체 행 수, 위험 항목 수)
+    rows = iter_inventory_csv(filepath)
+    header = next(rows)
+    counts = {'total': 0, 'danger': 0}
+
+    def tee_danger(keyed_rows, danger_file):
+        # 정렬기로 넘기는 행 중 위험 항목은 그 자리에서 danger 파일에 씀
+        for key, fields in keyed_rows:
+            counts['total'] += 1
+            if key != _NULL_KEY and key >= threshold:
+                danger_file.write(','.join(fields) + '\n')
+                counts['danger'] += 1
+            yield key, fields
+
+    with open(danger_filepath, 'w', encoding='utf-8') as df, open(sorted_filepath, 'w', encoding='utf-8') as sf:
+        df.write(','.join(header) + '\n')
+        sf.write(','.join(header) + '\n')
+        run_dir = os.path.dirname(os.path.abspath(sorted_filepath))
+        for _, fields in external_sort(tee_danger(iter_keyed_rows(rows), df), run_size, run_dir):
+            sf.write(','.join(fields) + '\n')
+    return counts['total'], counts['danger']
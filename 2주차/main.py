@@ -1,10 +1,27 @@
+import argparse
+import os
+
+from inventory_binary import InventoryBinary, save_inventory_binary
+from inventory_diff import InventoryDelta
+from inventory_index import FlammabilityIndex, load_or_build_index
+from inventory_store import FLAMMABILITY, load_inventory_csv
+from inventory_stream import RUN_SIZE, iter_inventory_csv, iter_keyed_rows, stream_danger_and_sort, top_k
+
+INVENTORY_FILENAME = 'Mars_Base_Inventory_List.csv'
+DANGER_FILENAME = 'Mars_Base_Inventory_danger.csv'
+# 스트리밍 모드에서 인화성 순으로 정렬한 전체 목록을 저장하는 파일
+SORTED_FILENAME = 'Mars_Base_Inventory_sorted.csv'
+BINARY_FILENAME = 'Mars_Base_Inventory_List.bin'
+DANGER_THRESHOLD = 0.7
+
 def read_inventory_csv(filepath):
-    # Mars_Base_Inventory_List.csv 파일의 내용을 읽어, 각 줄을 ','로 분리한 파이썬 리스트(List) 객체로 변환
+    # Mars_Base_Inventory_List.csv 파일의 내용을 읽어, 각 열을 한 번만 타입에 맞게 변환한 InventoryStore로 반환
+    # (인화성 지수 등 수치 열은 float, 'Various'는 null)
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-        # 각 줄에서 개행 문자를 제거하고, ','로 분리하여 리스트로 변환 (첫 줄은 헤더)
-        return [line.strip().split(',') for line in lines]
+        inventory = load_inventory_csv(filepath)
+        for row, column, text in inventory.invalid:
+            print('숫자가 아닌 값을 null로 처리합니다:', inventory.header[column], '=', text, '(' + inventory.text(row, 0) + ')')
+        return inventory
     except Exception as e:
         print('CSV 파일 읽는 중 오류가 발생했습니다:', e)
         return None
@@ -14,13 +31,10 @@ def print_inventory(data):
     for row in data:
         print(','.join(row))
 
-def filter_danger_items(data, threshold=0.7):
-    # 헤더를 제외한 데이터에서 인화성 지수가 0.7 이상인 항목을 추출 (인화성 지수는 5번째 열, 인덱스 4)
-    try:
-        return [row for row in data[1:] if float(row[4]) >= threshold]
-    except Exception as e:
-        print('위험 항목 필터링 중 오류가 발생했습니다:', e)
-        return []
+def filter_danger_items(flammability_index, threshold=0.7):
+    # 인화성 지수가 threshold 이상인 항목의 행 번호를 원래 순서대로 추출
+    # (인화성 지수 인덱스를 이진 탐색하므로 전체 행을 훑지 않으며, null은 제외)
+    return sorted(flammability_index.at_least(threshold))
 
 def save_csv(data, filepath):
     # 리스트 데이터를 CSV 포맷으로 지정된 파일에 저장
@@ -31,54 +45,159 @@ def save_csv(data, filepath):
     except Exception as e:
         print('CSV 파일 저장 중 오류가 발생했습니다:', e)
 
-def save_binary(data, filepath):
-    # 리스트 데이터를 문자열로 변환 후, 이진 파일 형태로 저장
+def save_binary(inventory, rows, filepath):
+    # 인벤토리의 지정한 행들을 이진 형식(헤더, 고정 폭 수치 열, 중복 제거된 문자열 표)으로 저장
     try:
-        #이진 쓰기 모드 ='wb'
-        with open(filepath, 'wb') as f:
-            text = "\n".join([','.join(row) for row in data])
-            f.write(text.encode('utf-8'))
+        save_inventory_binary(inventory, filepath, rows)
+        # 반복 질의를 위해 인화성 지수 인덱스도 이진 파일 옆에 저장 (Mars_Base_Inventory_List.bin.idx).
+        # 이진 파일을 새로 썼으므로 저장된 인덱스는 재사용하지 않고 항상 다시 만듦
+        with InventoryBinary(filepath) as binary:
+            load_or_build_index(binary, filepath, FLAMMABILITY, rebuild=True)
     except Exception as e:
         print('이진 파일 저장 중 오류가 발생했습니다:', e)
 
 def read_binary(filepath):
-    # 이진 파일을 읽어 UTF-8 디코딩한 문자열로 반환
+    # 이진 파일을 mmap으로 열어 헤더와 각 행을 CSV 원문과 같은 문자열 리스트로 복원하여 반환
     try:
-        #이진 읽기 모드 ='rb'
-        with open(filepath, 'rb') as f:
-            content = f.read()
-        return content.decode('utf-8')
+        with InventoryBinary(filepath) as binary:
+            return binary.text_rows()
     except Exception as e:
         print('이진 파일 읽는 중 오류가 발생했습니다:', e)
         return None
 
+def compare_with_snapshot(inventory, binary_filepath, threshold):
+    # 이전 실행에서 저장한 이진 파일(스냅샷)과 새 인벤토리를 비교하여, 바뀐 행만으로 정렬 목록과 위험 항목을 갱신.
+    # 반환값: (InventoryDelta, 인화성 순 행 번호 목록, 위험 항목 행 번호 목록, 위험 항목이 바뀌었는지)
+    # 스냅샷이 없거나, 형식/헤더가 다르거나, 행 순서가 바뀌어 부분 갱신을 할 수 없으면 None
+    try:
+        binary = InventoryBinary(binary_filepath)
+    except (OSError, ValueError):
+        return None
+    with binary:
+        if binary.header != inventory.header:
+            return None
+        delta = InventoryDelta(inventory, binary)
+        sorted_rows = delta.sorted_rows()
+        if sorted_rows is None:
+            return None
+        old_index = load_or_build_index(binary, binary_filepath, FLAMMABILITY)
+        return delta, sorted_rows, delta.danger_rows(old_index, threshold), delta.danger_changed(threshold)
+
+def print_delta(delta):
+    # 스냅샷과 비교한 결과를 출력
+    print('\n--- 이전 스냅샷과 비교 ---')
+    if delta.unchanged:
+        print('바뀐 항목이 없습니다.')
+        return
+    for label, substances in (('추가', delta.added), ('삭제', delta.removed), ('변경', delta.changed)):
+        if substances:
+            print('%s %d개: %s' % (label, len(substances), ', '.join(substances)))
+
+def query_inventory(binary_filepath, minimum=None, maximum=None, top=None):
+    # 저장된 이진 파일과 인화성 지수 인덱스로 질의에 답함 (CSV를 다시 읽거나 전체 행을 정렬하지 않음).
+    # 결과는 인화성 지수의 내림차순이며, top이 있으면 그중 상위 top개만 반환
+    try:
+        with InventoryBinary(binary_filepath) as binary:
+            flammability_index = load_or_build_index(binary, binary_filepath, FLAMMABILITY)
+            if minimum is None and maximum is None:
+                rows = flammability_index.top(top) if top is not None else flammability_index.descending()
+            else:
+                rows = flammability_index.between(minimum if minimum is not None else float('-inf'),
+                                                  maximum if maximum is not None else float('inf'))
+                if top is not None:
+                    rows = rows[:max(top, 0)]
+            return [list(binary.header)] + [binary.text_row(row) for row in rows]
+    except Exception as e:
+        print('이진 파일을 조회하는 중 오류가 발생했습니다:', e)
+        return None
+
+def stream_inventory(filepath, top=None, run_size=RUN_SIZE):
+    # 스트리밍 모드: 인벤토리를 메모리에 모두 올리지 않고 한 줄씩 처리
+    #   - top이 없으면 위험 항목을 Mars_Base_Inventory_danger.csv에 바로 쓰면서,
+    #     전체 목록을 external merge sort로 정렬하여 Mars_Base_Inventory_sorted.csv에 저장
+    #   - top이 있으면 크기 top의 힙으로 인화성 지수가 가장 큰 top개만 골라 출력
+    try:
+        if top is not None:
+            rows = iter_inventory_csv(filepath)
+            header = next(rows)
+            print('--- 인화성 지수 상위 %d개 항목 ---' % top)
+            print_inventory([header] + [fields for _, fields in top_k(iter_keyed_rows(rows), top)])
+            return
+        total, danger = stream_danger_and_sort(filepath, DANGER_FILENAME, SORTED_FILENAME, DANGER_THRESHOLD, run_size)
+        print('전체 %d개 항목을 인화성 순으로 정렬하여 %s에 저장했습니다.' % (total, SORTED_FILENAME))
+        print('인화성 지수 %.1f 이상인 위험 항목 %d개를 %s에 저장했습니다.' % (DANGER_THRESHOLD, danger, DANGER_FILENAME))
+    except Exception as e:
+        print('인벤토리를 스트리밍으로 처리하는 중 오류가 발생했습니다:', e)
+
 def main():
+    parser = argparse.ArgumentParser(description='화성 기지 인벤토리 분석')
+    parser.add_argument('--input', default=INVENTORY_FILENAME, help='인벤토리 CSV 파일 (기본값: ' + INVENTORY_FILENAME + ')')
+    parser.add_argument('--stream', action='store_true',
+                        help='메모리에 모두 올리지 않고 한 줄씩 처리 (큰 인벤토리용, --top과 함께 쓰면 힙으로 상위 N개만 선택)')
+    parser.add_argument('--run-size', type=int, default=RUN_SIZE,
+                        help='스트리밍 정렬 시 메모리에서 한 번에 정렬하는 최대 행 수 (기본값: %d)' % RUN_SIZE)
+    parser.add_argument('--min', type=float, default=None, help='인화성 지수가 이 값 이상인 항목만 조회')
+    parser.add_argument('--max', type=float, default=None, help='인화성 지수가 이 값 이하인 항목만 조회')
+    parser.add_argument('--top', type=int, default=None, help='인화성 지수가 가장 큰 N개 항목만 조회')
+    args = parser.parse_args()
+
+    if args.stream:
+        if args.min is not None or args.max is not None:
+            parser.error('--stream 모드에서는 --min/--max를 사용할 수 없습니다.')
+        stream_inventory(args.input, args.top, args.run_size)
+        return
+
+    # 질의 옵션이 있으면 저장된 이진 파일과 인덱스로 바로 답함
+    if args.min is not None or args.max is not None or args.top is not None:
+        result = query_inventory(BINARY_FILENAME, args.min, args.max, args.top)
+        if result is not None:
+            print('--- 인화성 지수 조회 결과 (%d개) ---' % (len(result) - 1))
+            print_inventory(result)
+        return
+
     # 1. CSV 파일을 읽어 출력
-    inventory = read_inventory_csv('Mars_Base_Inventory_List.csv')
+    inventory = read_inventory_csv(args.input)
     if inventory is None:
         return
-    print('--- Mars_Base_Inventory_List.csv 내용 ---')
-    print_inventory(inventory)
+    print('--- ' + args.input + ' 내용 ---')
+    print_inventory(inventory.text_rows())
     
-    # 2. 인벤토리 데이터를 인화성 지수 기준(5번째 열, float 값)으로 내림차순 정렬 (헤더 제외)
-    header = inventory[0]
-    sorted_inventory = [header] + sorted(inventory[1:], key=lambda row: float(row[4]), reverse=True)
+    # 이전 실행의 이진 파일(스냅샷)이 있으면 바뀐 행만으로 정렬 목록과 위험 항목을 갱신
+    snapshot = compare_with_snapshot(inventory, BINARY_FILENAME, DANGER_THRESHOLD)
+    if snapshot is not None:
+        delta, sorted_rows, danger_rows, danger_changed = snapshot
+        print_delta(delta)
+    else:
+        # 2. 인벤토리 데이터를 인화성 지수 기준(5번째 열, float 값)으로 내림차순 정렬 (헤더 포함, null은 맨 뒤)
+        # 인화성 지수 인덱스를 한 번만 만들어 정렬과 위험 항목 추출에 함께 사용
+        delta = None
+        flammability_index = FlammabilityIndex.build(inventory.columns[FLAMMABILITY])
+        sorted_rows = flammability_index.descending() + inventory.null_rows(FLAMMABILITY)
+        danger_rows = filter_danger_items(flammability_index, DANGER_THRESHOLD)
+        danger_changed = True
+    sorted_inventory = inventory.text_rows(sorted_rows)
     print('\n--- 인화성 순으로 정렬된 목록 ---')
     print_inventory(sorted_inventory)
     
     # 3. 인화성 지수가 0.7 이상인 항목 추출 (헤더 포함)
-    danger_items = [header] + filter_danger_items(inventory, 0.7)
+    danger_items = inventory.text_rows(danger_rows)
     print('\n--- 인화성 지수 0.7 이상인 위험 항목 ---')
     print_inventory(danger_items)
     
     # 4. 위험 항목을 CSV 포맷으로 Mars_Base_Inventory_danger.csv에 저장
-    save_csv(danger_items, 'Mars_Base_Inventory_danger.csv')
-    
     # 보너스 과제: 정렬된 전체 목록을 이진 파일로 저장 후 다시 읽어 출력
-    save_binary(sorted_inventory, 'Mars_Base_Inventory_List.bin')
-    binary_content = read_binary('Mars_Base_Inventory_List.bin')
-    print('\n--- 이진 파일(Mars_Base_Inventory_List.bin) 읽은 내용 ---')
-    print(binary_content)
+    # 스냅샷과 같으면 두 파일 모두 다시 만들지 않고, 위험 항목이 그대로이면 위험 항목 파일은 그대로 둠
+    danger_exists = os.path.exists(DANGER_FILENAME)
+    if delta is not None and delta.unchanged and danger_exists:
+        print('\n인벤토리가 바뀌지 않아 %s와 %s를 다시 만들지 않습니다.' % (DANGER_FILENAME, BINARY_FILENAME))
+    else:
+        if danger_changed or not danger_exists:
+            save_csv(danger_items, DANGER_FILENAME)
+        save_binary(inventory, sorted_rows, BINARY_FILENAME)
+    binary_content = read_binary(BINARY_FILENAME)
+    if binary_content is not None:
+        print('\n--- 이진 파일(Mars_Base_Inventory_List.bin) 읽은 내용 ---')
+        print_inventory(binary_content)
     
 
 if __name__ == '__main__':
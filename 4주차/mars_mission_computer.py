@@ -1,10 +1,24 @@
+import argparse
+import asyncio
 import random
 import json
 import time
-import sys
-import select
+import threading
 from datetime import datetime
 
+from sensor_fleet import SensorFleetPoller, dummy_sensor_source
+from sensor_log_writer import acquire_default_log_writer, release_default_log_writer
+from sensor_rollup import SensorRollup
+from sensor_scheduler import DeadlineScheduler, watch_stdin
+from sensor_simulator import SENSOR_RANGES
+from sensor_sinks import BinarySink, ConsolePrettySink, CsvSink, NdjsonSink
+from sensor_store import STORE_DIRNAME, SensorStore
+from sensor_window import DEFAULT_WINDOWS, SensorRingBuffer, capacity_for
+
+SINK_FILENAMES = {'ndjson': 'sensor_readings.ndjson', 'csv': 'sensor_readings.csv', 'binary': 'sensor_readings.bin'}
+# sink를 지정하지 않았을 때의 출력 대상. 화면 출력(console)은 주기가 짧으면 병목이 되므로 지정했을 때만 사용
+DEFAULT_SINKS = ('ndjson',)
+
 class DummySensor:
     """
     DummySensor 클래스는 화성 기지의 환경 센서 데이터를 임의로 생성하여 저장하는 클래스입니다.
@@ -15,8 +29,17 @@ class DummySensor:
       - mars_base_external_illuminance (화성 기지 외부 광량)
       - mars_base_internal_co2 (화성 기지 내부 이산화탄소 농도)
       - mars_base_internal_oxygen (화성 기지 내부 산소 농도)
+    로그는 log_writer(BufferedLogWriter)의 큐에 넣기만 하므로 get_env()는 디스크 쓰기를 기다리지 않습니다.
+    log_writer를 지정하지 않으면 모든 DummySensor가 함께 쓰는 기본 writer(sensor_log.txt)를 사용하며,
+    close()는 기본 writer를 반납만 하고 마지막으로 반납될 때 닫힙니다. 지정받은 writer는 만든 쪽에서 닫습니다.
+    store(SensorStore)를 지정하면 get_env()로 읽은 값을 이진 저장소에도 추가합니다.
+    echo가 False이면 get_env()는 화면에 출력하지 않습니다 (MissionComputer는 sink로 출력하므로 False로 만듦).
     """
-    def __init__(self):
+    def __init__(self, log_writer=None, store=None, echo=True):
+        self._shares_writer = log_writer is None
+        self.log_writer = log_writer or acquire_default_log_writer()
+        self.store = store
+        self.echo = echo
         self.env_values = {
             'mars_base_internal_temperature': None,
             'mars_base_external_temperature': None,
@@ -35,20 +58,17 @@ class DummySensor:
           - 외부 광량: 500 ~ 715 W/m²
           - 내부 CO2: 0.02 ~ 0.1%
           - 내부 산소: 4 ~ 7%
+        범위는 sensor_simulator.SENSOR_RANGES에 정의되어 있으며, 대량 시뮬레이션도 같은 범위를 사용합니다.
         """
-        self.env_values['mars_base_internal_temperature'] = round(random.uniform(18, 30), 2)
-        self.env_values['mars_base_external_temperature'] = round(random.uniform(0, 21), 2)
-        self.env_values['mars_base_internal_humidity'] = round(random.uniform(50, 60), 2)
-        self.env_values['mars_base_external_illuminance'] = round(random.uniform(500, 715), 2)
-        self.env_values['mars_base_internal_co2'] = round(random.uniform(0.02, 0.1), 3)
-        self.env_values['mars_base_internal_oxygen'] = round(random.uniform(4, 7), 2)
+        for key, (low, high, digits) in SENSOR_RANGES.items():
+            self.env_values[key] = round(random.uniform(low, high), digits)
 
     def get_env(self):
         """
         현재의 센서 데이터를 반환합니다.
         만약 센서 데이터가 초기화되지 않은 경우, 경고 메시지를 출력하고 자동으로 set_env()를 호출합니다.
         보너스 과제로, 현재 날짜와 시간 및 각 센서 값을 개별 줄에 출력하고,
-        'sensor_log.txt' 파일에 로그로 기록합니다.
+        'sensor_log.txt' 파일에 로그로 기록합니다. (로그는 백그라운드 스레드가 모아서 씀)
         """
         # 센서 데이터가 초기화되지 않은 경우 자동으로 설정
         if any(value is None for value in self.env_values.values()):
@@ -58,81 +78,186 @@ class DummySensor:
         now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         sensor_lines = [f'{key}: {value}' for key, value in self.env_values.items()]
         output = f'{now}\n' + "\n".join(sensor_lines)
-        print(output)
+        if self.echo:
+            print(output)
   
-        try:
-            with open('sensor_log.txt', 'a', encoding='utf-8') as log_file:
-                log_file.write(output + "\n")
-        except Exception as e:
-            print(f'로그 파일 저장 중 오류: {e}')
+        self.log_writer.write(output)
+        if self.store is not None:
+            self.store.append(time.time(), self.env_values)
             
         return self.env_values
 
+    def close(self):
+        # 기본 writer를 반납 (다른 DummySensor가 쓰고 있으면 닫지 않음). 저장소가 있으면 버퍼를 파일에 씀
+        if self._shares_writer:
+            self._shares_writer = False
+            release_default_log_writer(self.log_writer)
+        if self.store is not None:
+            self.store.close()
+
 class MissionComputer:
     """
     MissionComputer 클래스는 미션 컴퓨터의 환경 센서 데이터를 주기적으로 수집하여 출력하고,
     JSON 형식으로 시스템 정보를 제공하는 기능을 갖습니다.
     
     - DummySensor 인스턴스를 사용하여 센서 데이터를 갱신합니다.
-    - 5초마다 센서 데이터를 출력하며, 5분마다 각 센서의 평균값을 계산하여 출력합니다.
+    - 5초마다(sample_interval, 1초 미만 가능) 센서 데이터를 sink(sensor_sinks.py)로 내보내며, 5분마다 각 센서의 평균값을 계산하여 출력합니다.
+      sink를 지정하지 않으면 측정값을 한 줄에 하나씩 sensor_readings.ndjson에 모아서 쓰며,
+      들여쓰기한 JSON을 화면에 출력하려면 ConsolePrettySink(실행 시 --sink console)를 지정합니다.
+    - 센서별 측정값은 고정 크기 ring buffer(SensorRingBuffer)에 보관하며, 설정한 시간 창
+      (기본값: 1분/5분/1시간)의 평균/최솟값/최댓값/분산을 O(1)로 구할 수 있습니다.
+    - 측정값마다 분 단위/시간 단위 집계(SensorRollup)를 갱신하며, get_history()로 긴 기간도 원본 없이 조회합니다.
+    - store(SensorStore)를 지정하면 측정값을 이진 세그먼트 파일에 저장하고 query_history()로 시간 범위를 조회합니다.
+    - collect_fleet()으로 여러 센서를 asyncio로 동시에 수집할 수 있습니다 (SensorFleetPoller).
     - 보너스: 사용자가 'q'를 입력하면 반복을 멈추고 'System stopped….' 메시지를 출력합니다.
     """
-    def __init__(self):
+    def __init__(self, sample_interval=5, windows=None, store=None, sinks=None):
+        if sample_interval <= 0:
+            raise ValueError('sample_interval은 0보다 커야 합니다.')
         self.env_values = {}
-        self.ds = DummySensor()
-        # 센서 데이터 히스토리를 저장하여 5분 평균을 계산하기 위한 딕셔너리
-        self.readings_history = {key: [] for key in self.ds.env_values.keys()}
-        self.last_avg_time = time.time()
+        self.store = store
+        self.ds = DummySensor(store=store, echo=False)
+        # 측정값을 내보낼 sink 목록. 지정하지 않으면 DEFAULT_SINKS(sensor_readings.ndjson에 모아서 씀)를 사용
+        self.sinks = list(sinks) if sinks is not None else make_sinks(DEFAULT_SINKS)
+        # 측정 주기(초)와 평균을 구할 시간 창 ({이름: 초})
+        self.sample_interval = sample_interval
+        self.windows = dict(windows or DEFAULT_WINDOWS)
+        # 센서별 ring buffer. 가장 긴 시간 창 동안의 측정값만 담을 수 있는 고정 크기로 만듦
+        capacity = capacity_for(self.windows, 1 / sample_interval)
+        self.sensor_windows = {key: SensorRingBuffer(capacity, self.windows) for key in self.ds.env_values.keys()}
+        # 분 단위/시간 단위 집계 (보관 기간이 정해져 있어 메모리 사용량이 일정함)
+        self.rollups = SensorRollup(self.ds.env_values.keys())
+        self.last_avg_time = time.monotonic()
+        self.scheduler = None
+        self.fleet_values = {}
+
+    def add_reading(self, values, timestamp=None):
+        # 측정값 하나(센서 이름: 값)를 센서별 ring buffer와 분/시간 단위 집계에 추가.
+        # timestamp는 초 단위이며, 지정하지 않으면 ring buffer는 monotonic 시각, 집계는 현재 시각(epoch 초)을 사용
+        self.rollups.add(time.time() if timestamp is None else timestamp, values)
+        if timestamp is None:
+            timestamp = time.monotonic()
+        for key, value in values.items():
+            if value is not None:
+                self.sensor_windows[key].add(timestamp, value)
+
+    def get_window_stats(self, window='5m'):
+        # 시간 창 하나에 대한 센서별 통계(count, mean, min, max, variance)를 반환
+        return {key: buffer.stats(window) for key, buffer in self.sensor_windows.items()}
+
+    def get_averages(self, window='5m'):
+        # 시간 창 하나에 대한 센서별 평균값 (소수점 둘째 자리까지, 측정값이 없으면 None)
+        averages = {}
+        for key, buffer in self.sensor_windows.items():
+            mean = buffer.mean(window)
+            averages[key] = round(mean, 2) if mean is not None else None
+        return averages
+
+    def get_history(self, key, start, end=None, step=None):
+        # 센서 key의 [start, end] (epoch 초, end 기본값은 현재 시각) 기간을 step초 단위로 요약한 목록.
+        # 범위를 만족하는 가장 큰 집계 단계를 사용하므로 원본 측정값은 읽지 않음
+        if end is None:
+            end = time.time()
+        return self.rollups.query(key, start, end, step)
+
+    def query_history(self, start=None, end=None):
+        # 저장소에서 측정 시각(epoch 초)이 [start, end]인 측정값을 (시각, {센서 이름: 값}) 목록으로 반환
+        if self.store is None:
+            print('센서 저장소가 설정되지 않았습니다.')
+            return []
+        return list(self.store.query(start, end))
+
+    def collect_fleet(self, sensors, interval=5.0, jitter=0.0, duration=None, max_in_flight=1000, timeout=1.0):
+        """
+        여러 센서({센서 ID: DummySensor 또는 값을 반환하는 함수/async 함수})를 asyncio로 동시에 읽어
+        duration초 동안(None이면 중단될 때까지) fleet_values에 센서별 최신 값을 저장하고, 수집 통계를 반환합니다.
+        """
+        poller = SensorFleetPoller(max_in_flight=max_in_flight, timeout=timeout)
+        for sensor_id, sensor in sensors.items():
+            read = dummy_sensor_source(sensor) if isinstance(sensor, DummySensor) else sensor
+            poller.add_sensor(sensor_id, read, interval, jitter)
+        self.fleet_values = {}
+
+        def store(sensor_id, timestamp, values):
+            self.fleet_values[sensor_id] = {'timestamp': timestamp, **values}
 
-    def get_sensor_data(self):
+        try:
+            return asyncio.run(poller.run(store, duration))
+        except KeyboardInterrupt:
+            print('센서 수집을 중단했습니다.')
+            return dict(poller.stats)
+
+    def get_sensor_data(self, policy='skip'):
         """
-        5초마다 센서 데이터를 갱신하고, JSON 형식으로 출력하며 로그 파일에 기록합니다.
+        sample_interval(기본값 5초, 1초 미만도 가능)마다 센서 데이터를 갱신하고, sink들로 내보내며 로그 파일에 기록합니다.
         또한, 5분마다 센서 데이터의 평균값을 계산하여 출력합니다.
-        사용자가 'q'를 입력하면 출력 반복을 중단합니다.
+        주기는 monotonic 시계의 마감 시각에 맞추므로 작업 시간만큼 밀리지 않으며,
+        작업이 늦어 놓친 주기는 policy('skip' 또는 'catch_up')에 따라 처리합니다 (DeadlineScheduler).
+        사용자가 'q'를 입력하면 출력 반복을 중단하고 지연(jitter)/일정 이탈(drift, 1분당 지연 변화) 통계를 출력합니다.
         """
         print("센서 데이터 출력 시작 (종료하려면 'q' 입력):")
-        while True:
-            # 비차단식으로 사용자 입력 확인 (q 입력 시 종료)
-            rlist, _, _ = select.select([sys.stdin], [], [], 0)
-            if rlist:
-                user_input = sys.stdin.readline().strip()
-                if user_input.lower() == 'q':
-                    print("System stopped....")
-                    break
-            
-            # 센서 데이터를 갱신
-            self.ds.set_env()
-            current_data = self.ds.get_env()
-            self.env_values = current_data
-            
-            # 각 센서 값들을 히스토리에 추가 (5분 평균 계산 용)
-            for key, value in current_data.items():
-                self.readings_history[key].append(value)
-            
-            # 현재 날짜 및 시간과 센서 데이터를 JSON 형식으로 출력
-            now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            output = {"timestamp": now, **current_data}
-            print(json.dumps(output, indent=4))
-            
-            # 5분마다 평균값 계산 및 출력
-            current_time = time.time()
-            if current_time - self.last_avg_time >= 300:  # 300초 = 5분
-                avg_data = {}
-                for key, values in self.readings_history.items():
-                    if values:
-                        avg_data[key] = round(sum(values) / len(values), 2)
-                    else:
-                        avg_data[key] = None
-                print("\n5분 평균 값:")
-                print(json.dumps(avg_data, indent=4))
-                # 히스토리 초기화 및 마지막 평균 계산 시간 갱신
-                self.readings_history = {key: [] for key in self.ds.env_values.keys()}
-                self.last_avg_time = current_time
-            
-            time.sleep(5)
+        # 'q' 입력은 별도 스레드가 기다리며, 입력되면 스케줄러의 대기가 바로 끝남
+        stop_event = threading.Event()
+        watch_stdin(stop_event)
+        self.scheduler = DeadlineScheduler(self.sample_interval, policy)
+        try:
+            self.scheduler.run(self._collect_tick, stop_event)
+        except KeyboardInterrupt:
+            print('센서 수집을 중단했습니다.')
+        finally:
+            # Ctrl+C나 오류로 멈춰도 sink와 저장소에 모아 둔 측정값을 파일에 씀
+            for sink in self.sinks:
+                sink.close()
+            self.ds.close()
+        print("System stopped....")
+        stats = self.scheduler.stats()
+        print('실행 %d회, 놓친 주기 %d회, 주기 초과 %d회, 지연 평균 %.2fms (표준편차 %.2fms, 최대 %.2fms), drift %.2fms/분'
+              % (stats['ticks'], stats['missed'], stats['overruns'], stats['jitter_mean'] * 1000,
+                 stats['jitter_stdev'] * 1000, stats['jitter_max'] * 1000, stats['drift'] * 60000))
+
+    def _collect_tick(self, scheduled_time):
+        # 스케줄러가 주기마다 호출하는 작업 (scheduled_time은 이번 주기의 monotonic 마감 시각)
+        # 센서 데이터를 갱신
+        self.ds.set_env()
+        current_data = self.ds.get_env()
+        self.env_values = current_data
+        
+        # 각 센서 값들을 ring buffer에 추가 (시간 창별 평균 계산 용)
+        self.add_reading(current_data)
+        
+        # 현재 시각과 센서 데이터를 sink들로 내보냄 (파일 sink는 모아서 한 번에 씀)
+        now = time.time()
+        for sink in self.sinks:
+            sink.write(now, current_data)
+        
+        # 5분마다 최근 5분 평균값 출력 (ring buffer의 누적값으로 바로 계산)
+        if scheduled_time - self.last_avg_time >= 300:  # 300초 = 5분
+            avg_data = self.get_averages('5m')
+            print("\n5분 평균 값:")
+            print(json.dumps(avg_data, indent=4))
+            self.last_avg_time = scheduled_time
+
+def make_sinks(names):
+    # 이름 목록(console, ndjson, csv, binary)으로 sink들을 만듦
+    sink_classes = {'ndjson': NdjsonSink, 'csv': CsvSink, 'binary': BinarySink}
+    sinks = []
+    for name in names:
+        if name == 'console':
+            sinks.append(ConsolePrettySink(min_interval=1.0))
+        else:
+            sinks.append(sink_classes[name](SINK_FILENAMES[name]))
+    return sinks
 
 if __name__ == '__main__':
     # MissionComputer 클래스 인스턴스를 RunComputer라는 이름으로 생성하고, 
     # get_sensor_data() 메소드를 호출하여 지속적으로 센서 데이터를 출력합니다.
-    RunComputer = MissionComputer()
+    # 첫 번째 인자로 측정 주기(초)를, --sink로 출력 대상을 지정할 수 있습니다
+    # (예: python mars_mission_computer.py 0.2 --sink ndjson --sink console)
+    parser = argparse.ArgumentParser(description='화성 기지 미션 컴퓨터 센서 수집')
+    parser.add_argument('interval', nargs='?', type=float, default=5, help='측정 주기(초) (기본값: 5)')
+    parser.add_argument('--sink', action='append', choices=('console',) + tuple(SINK_FILENAMES),
+                        help='측정값 출력 대상. 여러 번 지정 가능 (기본값: ndjson, 화면 출력은 console)')
+    args = parser.parse_args()
+    RunComputer = MissionComputer(sample_interval=args.interval, store=SensorStore(STORE_DIRNAME),
+                                  sinks=make_sinks(args.sink or DEFAULT_SINKS))
     RunComputer.get_sensor_data()
@@ -0,0 +1,243 @@
+import argparse
+import asyncio
+import heapq
+import inspect
+import random
+import time
+
+# 많은 센서를 asyncio로 동시에 읽어 오는 수집기(fleet poller) 모듈.
+# 센서마다 스레드나 무한 반복 task를 두지 않고, 다음 측정 시각 순으로 정렬한 힙 하나로 모든 센서의 일정을 관리함.
+#   - 센서별 측정 주기(interval)와 흔들림(jitter), 시간 제한(timeout)
+#   - 동시에 진행 중인 측정 수 제한(max_in_flight)
+#   - 읽은 값은 크기가 제한된 큐로 넘기며, 소비자가 느려 큐가 가득 차면 측정을 늦춤(backpressure)
+# 실행: python sensor_fleet.py --sensors 10000 --interval 5 --duration 30
+
+class _PolledSensor:
+    __slots__ = ('sensor_id', 'read', 'is_async', 'interval', 'jitter', 'timeout', 'base')
+
+    def __init__(self, sensor_id, read, interval, jitter, timeout):
+        self.sensor_id = sensor_id
+        self.read = read
+        self.is_async = inspect.iscoroutinefunction(read)
+        self.interval = interval
+        self.jitter = jitter
+        self.timeout = timeout
+        self.base = 0.0  # jitter를 더하기 전의 다음 측정 시각 (loop.time() 기준)
+
+class SensorFleetPoller:
+    """
+    SensorFleetPoller 클래스는 여러 센서를 하나의 이벤트 루프에서 주기적으로 읽어 (센서 ID, 시각, 값)을 큐에 넣습니다.
+      - max_in_flight: 동시에 진행 중인 측정의 최대 수 (비동기 센서에만 의미가 있음)
+      - queue_size: 소비자에게 넘기기 전 쌓아 둘 수 있는 최대 측정값 수. 가득 차면 다음 측정을 미룹니다.
+      - timeout: 센서별 timeout을 지정하지 않았을 때 쓰는 기본 시간 제한 (초)
+    read는 값을 반환하는 일반 함수나 async 함수입니다. 일반 함수는 이벤트 루프에서 바로 호출하므로 빨리 끝나야 하며,
+    시간 제한은 async 함수에만 적용됩니다. 측정이 밀려 놓친 주기는 한꺼번에 따라잡지 않고 건너뛰며 skipped에 셉니다.
+    다음 측정은 이전 측정이 끝난 뒤에 예약하므로, 한 센서의 측정이 동시에 여러 개 진행되지 않습니다.
+    """
+    def __init__(self, max_in_flight=1000, queue_size=10000, timeout=1.0):
+        self.max_in_flight = max_in_flight
+        self.timeout = timeout
+        self.queue = None
+        self.stats = {'polled': 0, 'timeouts': 0, 'errors': 0, 'skipped': 0, 'backpressure': 0}
+        self._queue_size = queue_size
+        self._sensors = []
+        self._heap = []
+        self._order = 0
+        self._tasks = set()
+        self._slots = None
+        self._wakeup = None
+        self._running = False
+
+    def add_sensor(self, sensor_id, read, interval=5.0, jitter=0.0, timeout=None):
+        # 센서 하나를 등록. 실행 중에 추가해도 되며, 첫 측정은 interval 안의 임의 시각에 시작해 측정이 몰리지 않게 함
+        sensor = _PolledSensor(sensor_id, read, interval, jitter, self.timeout if timeout is None else timeout)
+        self._sensors.append(sensor)
+        if self._running:
+            self._push_first(sensor, asyncio.get_running_loop().time())
+            self._wakeup.set()
+        return sensor
+
+    def __len__(self):
+        return len(self._sensors)
+
+    def _push_first(self, sensor, now):
+        sensor.base = now + random.uniform(0, sensor.interval)
+        self._push(sensor, sensor.base)
+
+    def _push(self, sensor, due):
+        self._order += 1
+        heapq.heappush(self._heap, (due, self._order, sensor))
+
+    def _reschedule(self, sensor, now):
+        # 다음 측정 시각 = 이전 기준 시각 + interval (+ jitter). 이미 지난 주기는 건너뜀
+        sensor.base += sensor.interval
+        if sensor.base < now:
+            missed = int((now - sensor.base) // sensor.interval) + 1
+            sensor.base += missed * sensor.interval
+            self.stats['skipped'] += missed
+        due = sensor.base
+        if sensor.jitter:
+            due += random.uniform(-sensor.jitter, sensor.jitter)
+        self._push(sensor, due)
+
+    async def _schedule(self):
+        loop = asyncio.get_running_loop()
+        for sensor in self._sensors:
+            self._push_first(sensor, loop.time())
+        while self._running:
+            if not self._heap:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            delay = self._heap[0][0] - loop.time()
+            if delay > 0:
+                # 다음 측정 시각까지 기다리되, 그 사이에 센서가 추가되면 다시 확인
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            _, _, sensor = heapq.heappop(self._heap)
+            if sensor.is_async:
+                # 비동기 센서는 측정이 끝난 뒤(_poll_async)에 다음 측정을 예약함
+                await self._slots.acquire()
+                task = asyncio.ensure_future(self._poll_async(sensor))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+            else:
+                await self._poll_sync(sensor)
+                self._reschedule(sensor, loop.time())
+
+    async def _deliver(self, sensor, values):
+        self.stats['polled'] += 1
+        item = (sensor.sensor_id, time.time(), values)
+        if self.queue.full():
+            # 소비자가 밀려 있으면 자리가 날 때까지 기다림 (그동안 새 측정도 멈춤)
+            self.stats['backpressure'] += 1
+        await self.queue.put(item)
+
+    async def _poll_sync(self, sensor):
+        try:
+            values = sensor.read()
+        except Exception:
+            self.stats['errors'] += 1
+            return
+        await self._deliver(sensor, values)
+
+    async def _poll_async(self, sensor):
+        try:
+            values = await asyncio.wait_for(sensor.read(), sensor.timeout)
+            await self._deliver(sensor, values)
+        except asyncio.TimeoutError:
+            self.stats['timeouts'] += 1
+        except Exception:
+            self.stats['errors'] += 1
+        finally:
+            self._slots.release()
+            if self._running:
+                # 측정이 interval보다 오래 걸렸으면 그동안의 주기는 건너뜀. 기다리던 스케줄러가 새 시각을 확인하도록 깨움
+                self._reschedule(sensor, asyncio.get_running_loop().time())
+                self._wakeup.set()
+
+    async def _consume(self, consumer):
+        is_async = inspect.iscoroutinefunction(consumer)
+        while True:
+            sensor_id, timestamp, values = await self.queue.get()
+            try:
+                if consumer is None:
+                    continue
+                if is_async:
+                    await consumer(sensor_id, timestamp, values)
+                else:
+                    consumer(sensor_id, timestamp, values)
+            except Exception as e:
+                print('측정값 처리 중 오류가 발생했습니다:', e)
+            finally:
+                self.queue.task_done()
+
+    async def run(self, consumer=None, duration=None, stop_event=None):
+        """
+        센서 측정을 시작하여 duration초가 지나거나 stop_event가 설정될 때까지 실행하고 stats를 반환합니다.
+        consumer(sensor_id, timestamp, values)는 측정값마다 호출되며 일반 함수나 async 함수일 수 있습니다.
+        종료할 때는 진행 중인 측정이 끝나고 큐에 남은 측정값이 모두 처리될 때까지 기다립니다.
+        """
+        self.queue = asyncio.Queue(maxsize=self._queue_size)
+        self._slots = asyncio.Semaphore(self.max_in_flight)
+        self._wakeup = asyncio.Event()
+        self._running = True
+        scheduler = asyncio.ensure_future(self._schedule())
+        worker = asyncio.ensure_future(self._consume(consumer))
+        try:
+            waiters = [scheduler]
+            if stop_event is not None:
+                waiters.append(asyncio.ensure_future(stop_event.wait()))
+            done, _ = await asyncio.wait(waiters, timeout=duration, return_when=asyncio.FIRST_COMPLETED)
+            if scheduler in done:
+                scheduler.result()  # 스케줄러에서 난 예외를 그대로 전달
+        finally:
+            self._running = False
+            for waiter in [scheduler] + waiters[1:]:
+                waiter.cancel()
+            await asyncio.gather(scheduler, *waiters[1:], return_exceptions=True)
+            if self._tasks:
+                await asyncio.gather(*self._tasks, return_exceptions=True)
+            await self.queue.join()
+            worker.cancel()
+            await asyncio.gather(worker, return_exceptions=True)
+            self._heap.clear()
+        return dict(self.stats)
+
+def dummy_sensor_source(sensor):
+    # DummySensor를 수집기에서 읽을 수 있는 함수로 감쌈 (get_env()처럼 출력하거나 로그를 남기지 않음)
+    def read():
+        sensor.set_env()
+        return dict(sensor.env_values)
+    return read
+
+def simulated_async_source(latency=0.01, failure_rate=0.0):
+    # 응답이 latency초 걸리는 원격 센서를 흉내 내는 async 함수 (failure_rate 확률로 예외 발생)
+    from sensor_simulator import SENSOR_RANGES
+
+    async def read():
+        await asyncio.sleep(latency)
+        if failure_rate and random.random() < failure_rate:
+            raise ConnectionError('센서 응답 없음')
+        return {key: round(random.uniform(low, high), digits) for key, (low, high, digits) in SENSOR_RANGES.items()}
+    return read
+
+def main():
+    parser = argparse.ArgumentParser(description='많은 센서를 asyncio로 동시에 읽는 수집기 부하 테스트')
+    parser.add_argument('--sensors', type=int, default=10000, help='센서 수 (기본값: 10000)')
+    parser.add_argument('--interval', type=float, default=5.0, help='센서별 측정 주기(초) (기본값: 5)')
+    parser.add_argument('--jitter', type=float, default=0.1, help='측정 시각 흔들림(초) (기본값: 0.1)')
+    parser.add_argument('--duration', type=float, default=30.0, help='실행 시간(초) (기본값: 30)')
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help='0보다 크면 이 지연(초)을 가진 비동기 센서를 사용 (기본값: 0, DummySensor 사용)')
+    parser.add_argument('--max-in-flight', type=int, default=1000, help='동시에 진행 중인 측정의 최대 수 (기본값: 1000)')
+    args = parser.parse_args()
+
+    poller = SensorFleetPoller(max_in_flight=args.max_in_flight)
+    if args.latency > 0:
+        for number in range(args.sensors):
+            poller.add_sensor(number, simulated_async_source(args.latency), args.interval, args.jitter)
+    else:
+        from mars_mission_computer import DummySensor
+        for number in range(args.sensors):
+            poller.add_sensor(number, dummy_sensor_source(DummySensor()), args.interval, args.jitter)
+
+    try:
+        cpu_started = time.process_time()
+        stats = asyncio.run(poller.run(duration=args.duration))
+        cpu_seconds = time.process_time() - cpu_started
+    except Exception as e:
+        print('센서 수집 중 오류가 발생했습니다:', e)
+        return
+    expected = args.sensors * args.duration / args.interval
+    print('센서 %d개, %.1f초 동안 측정 %d회 (예상 %.0f회)' % (args.sensors, args.duration, stats['polled'], expected))
+    print('시간 초과 %d회, 오류 %d회, 건너뛴 주기 %d회, 소비자 대기 %d회'
+          % (stats['timeouts'], stats['errors'], stats['skipped'], stats['backpressure']))
+    print('CPU 사용 시간: %.2f초 (%.0f%%)' % (cpu_seconds, cpu_seconds / args.duration * 100))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,145 @@
+import atexit
+import os
+import queue
+import threading
+import time
+
+# 센서 로그(sensor_log.txt)를 백그라운드 스레드에서 모아서 쓰는 모듈.
+# 측정할 때마다 파일을 열고 닫는 대신, 기록을 크기가 제한된 큐에 넣기만 하고 바로 돌아오며,
+# 쓰기 스레드가 기록을 묶어(batch) 한 번에 쓴 뒤 일정 크기/시간마다 디스크로 내보냄(flush).
+# 파일이 max_bytes를 넘으면 sensor_log.txt.1, .2, ... 로 교체(rotation)함.
+
+LOG_FILENAME = 'sensor_log.txt'
+
+class BufferedLogWriter:
+    """
+    BufferedLogWriter 클래스는 로그 기록을 큐에 넣고 백그라운드 스레드에서 묶어서 파일에 씁니다.
+      - max_queue: 큐에 쌓아 둘 수 있는 최대 기록 수. 가득 차면 새 기록은 버리고 dropped를 늘립니다 (호출자는 기다리지 않음)
+      - batch_size: 한 번에 모아서 쓰는 최대 기록 수 (이만큼 모이면 바로 씀)
+      - flush_interval: 기록이 적어도 이 시간(초)이 지나면 모인 기록을 씀
+      - max_bytes: 파일이 이 크기(바이트)를 넘으면 교체 (0이면 교체하지 않음)
+      - backup_count: 보관할 이전 로그 파일 수
+    close()를 호출하거나 프로그램이 끝나면 남은 기록을 모두 쓰고 스레드를 종료합니다.
+    """
+    _STOP = object()
+
+    def __init__(self, filepath=LOG_FILENAME, max_queue=10000, batch_size=256, flush_interval=1.0,
+                 max_bytes=10 * 1024 * 1024, backup_count=5):
+        self.filepath = filepath
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.dropped = 0
+        self.written = 0
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._file = None
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name='sensor-log-writer', daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def write(self, record):
+        # 기록 하나(개행 없는 문자열)를 큐에 넣고 바로 반환. 큐가 가득 찼거나 이미 닫혔으면 False
+        if self._closed:
+            return False
+        try:
+            self._queue.put_nowait(record)
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def close(self):
+        # 남은 기록을 모두 쓰고 쓰기 스레드를 종료 (여러 번 호출해도 됨)
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(self._STOP)
+        self._thread.join()
+        atexit.unregister(self.close)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _run(self):
+        # 쓰기 스레드: batch_size만큼 모이거나 flush_interval이 지나면 모인 기록을 한 번에 씀
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        stopping = False
+        while not stopping:
+            timeout = max(deadline - time.monotonic(), 0)
+            try:
+                record = self._queue.get(timeout=timeout)
+                if record is self._STOP:
+                    stopping = True
+                else:
+                    batch.append(record)
+            except queue.Empty:
+                pass
+            if batch and (stopping or len(batch) >= self.batch_size or time.monotonic() >= deadline):
+                self._write_batch(batch)
+                batch = []
+            if time.monotonic() >= deadline:
+                deadline = time.monotonic() + self.flush_interval
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _write_batch(self, batch):
+        data = '\n'.join(batch) + '\n'
+        try:
+            if self._file is None:
+                self._file = open(self.filepath, 'a', encoding='utf-8')
+            if self.max_bytes and self._file.tell() > 0 and self._file.tell() + len(data.encode('utf-8')) > self.max_bytes:
+                self._rotate()
+            self._file.write(data)
+            self._file.flush()
+            self.written += len(batch)
+        except Exception as e:
+            print(f'로그 파일 저장 중 오류: {e}')
+
+    def _rotate(self):
+        # sensor_log.txt -> sensor_log.txt.1 -> sensor_log.txt.2 ... (backup_count개를 넘는 가장 오래된 파일은 삭제)
+        self._file.close()
+        self._file = None
+        if self.backup_count > 0:
+            for number in range(self.backup_count - 1, 0, -1):
+                source = f'{self.filepath}.{number}'
+                if os.path.exists(source):
+                    os.replace(source, f'{self.filepath}.{number + 1}')
+            os.replace(self.filepath, f'{self.filepath}.1')
+        else:
+            os.remove(self.filepath)
+        self._file = open(self.filepath, 'a', encoding='utf-8')
+
+_default_writer = None
+_default_users = 0
+_default_writer_lock = threading.Lock()
+
+def acquire_default_log_writer():
+    # 여러 DummySensor가 같은 sensor_log.txt를 함께 쓰도록 프로세스에 하나만 만드는 기본 writer를 빌려 옴.
+    # 빌려 간 수를 세어 두며, 다 쓴 쪽은 release_default_log_writer()를 호출함
+    global _default_writer, _default_users
+    with _default_writer_lock:
+        if _default_writer is None or _default_writer._closed:
+            _default_writer = BufferedLogWriter(LOG_FILENAME)
+            _default_users = 0
+        _default_users += 1
+        return _default_writer
+
+def release_default_log_writer(writer):
+    # 기본 writer를 반납하고, 더 이상 쓰는 곳이 없으면 남은 로그를 모두 쓴 뒤 닫음.
+    # 반납하지 않은 곳이 남아 있어도 프로그램이 끝날 때(atexit) 닫힘
+    global _default_writer, _default_users
+    with _default_writer_lock:
+        if writer is not _default_writer:
+            return
+        _default_users -= 1
+        if _default_users > 0:
+            return
+        _default_writer = None
+    writer.close()
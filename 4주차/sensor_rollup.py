@@ -0,0 +1,165 @@
+import bisect
+import math
+from collections import deque
+
+# 센서 측정값을 분 단위/시간 단위 구간(bucket)으로 미리 요약해 두는 다단계 집계(rollup) 모듈.
+# 측정값이 들어올 때마다 모든 단계의 현재 구간에 count/sum/min/max/last를 갱신하므로,
+# 긴 기간(예: 한 달)을 조회할 때도 원본 측정값 대신 시간 단위 구간 수백 개만 읽으면 됨.
+# 단계마다 보관 기간이 정해져 있어 메모리 사용량이 일정함 (오래된 구간부터 버림).
+# 원본 측정값이 필요하면 SensorStore(sensor_store.py)를 조회함.
+
+# 기본 집계 단계 (이름: (구간 길이(초), 보관할 구간 수)). 분 단위는 1일, 시간 단위는 90일 보관
+DEFAULT_TIERS = {'1m': (60, 1440), '1h': (3600, 24 * 90)}
+# step을 지정하지 않고 조회할 때 한 번에 돌려줄 최대 구간 수
+MAX_POINTS = 500
+
+class _Bucket:
+    """구간 하나의 센서별 집계값 (센서 순서대로 된 리스트)"""
+    __slots__ = ('start', 'count', 'total', 'minimum', 'maximum', 'last', 'last_time')
+
+    def __init__(self, start, size):
+        self.start = start
+        self.count = [0] * size
+        self.total = [0.0] * size
+        self.minimum = [math.inf] * size
+        self.maximum = [-math.inf] * size
+        self.last = [None] * size
+        self.last_time = [-math.inf] * size
+
+class _Tier:
+    __slots__ = ('name', 'seconds', 'retention', 'buckets', 'starts')
+
+    def __init__(self, name, seconds, retention):
+        self.name = name
+        self.seconds = seconds
+        self.retention = retention
+        self.buckets = deque()
+        self.starts = deque()  # buckets의 시작 시각 (시각 순서, bisect 용)
+
+    def oldest(self):
+        return self.starts[0] if self.starts else math.inf
+
+class SensorRollup:
+    """
+    SensorRollup 클래스는 센서별 측정값을 여러 단계(기본값: 1분, 1시간)의 구간 집계로 유지합니다.
+      - keys: 집계할 센서 이름 목록
+      - tiers: {이름: (구간 길이(초), 보관할 구간 수)}
+      - add(timestamp, values): 측정값 하나(epoch 초, {센서 이름: 값})로 모든 단계를 O(단계 수)로 갱신
+      - query(key, start, end, step): 조건을 만족하는 가장 큰 단계의 구간으로 [start, end]를 요약
+    늦게 도착한 측정값도 해당 구간이 아직 보관 중이면 반영하며, 이미 버린 구간의 측정값은 무시합니다.
+    """
+    def __init__(self, keys, tiers=None):
+        self.keys = list(keys)
+        self._positions = {key: position for position, key in enumerate(self.keys)}
+        self.tiers = sorted((_Tier(name, seconds, retention) for name, (seconds, retention) in (tiers or DEFAULT_TIERS).items()),
+                            key=lambda tier: tier.seconds)
+
+    def add(self, timestamp, values):
+        for tier in self.tiers:
+            bucket = self._bucket(tier, timestamp - timestamp % tier.seconds)
+            if bucket is None:
+                continue
+            for key, value in values.items():
+                if value is None:
+                    continue
+                position = self._positions[key]
+                bucket.count[position] += 1
+                bucket.total[position] += value
+                if value < bucket.minimum[position]:
+                    bucket.minimum[position] = value
+                if value > bucket.maximum[position]:
+                    bucket.maximum[position] = value
+                if timestamp >= bucket.last_time[position]:
+                    bucket.last[position] = value
+                    bucket.last_time[position] = timestamp
+
+    def _bucket(self, tier, start):
+        # start에 시작하는 구간을 반환 (없으면 만들고, 보관 기간이 지난 구간은 버림). 이미 버린 구간이면 None
+        if tier.starts and tier.starts[-1] == start:
+            return tier.buckets[-1]
+        if not tier.starts or start > tier.starts[-1]:
+            bucket = _Bucket(start, len(self.keys))
+            tier.buckets.append(bucket)
+            tier.starts.append(start)
+            expired = start - tier.retention * tier.seconds
+            while tier.starts[0] <= expired:
+                tier.starts.popleft()
+                tier.buckets.popleft()
+            return bucket
+        # 늦게 도착한 측정값: 보관 중인 구간 중에서 찾거나 그 자리에 새로 끼워 넣음
+        if start <= tier.starts[-1] - tier.retention * tier.seconds:
+            return None
+        index = bisect.bisect_left(tier.starts, start)
+        if tier.starts[index] == start:
+            return tier.buckets[index]
+        bucket = _Bucket(start, len(self.keys))
+        tier.buckets.insert(index, bucket)
+        tier.starts.insert(index, start)
+        return bucket
+
+    def choose_tier(self, start, step):
+        # 구간 길이가 step 이하이고 start부터 보관 중인 단계 중 가장 큰 단계를 고름.
+        # 그런 단계가 없으면 start부터 보관 중인 가장 작은 단계, 그것도 없으면 보관 기간이 가장 긴 단계를 사용
+        covering = [tier for tier in self.tiers if tier.oldest() <= start]
+        fitting = [tier for tier in covering if tier.seconds <= step]
+        if fitting:
+            return fitting[-1]
+        if covering:
+            return covering[0]
+        return max(self.tiers, key=lambda tier: tier.seconds * tier.retention)
+
+    def query(self, key, start, end, step=None):
+        """
+        센서 key의 측정 시각 [start, end] 구간을 step초 단위로 요약한 목록을 반환합니다.
+        각 항목은 {'start', 'count', 'mean', 'min', 'max', 'last'}이며 측정값이 없는 구간은 빠집니다.
+        start와 end는 고른 단계의 구간 경계로 맞춰지므로, 양 끝 구간에는 범위 밖의 측정값이 포함될 수 있습니다.
+        step을 지정하지 않으면 결과가 MAX_POINTS개 이하가 되도록 정하며, 고른 단계의 구간을 step 단위로 합칩니다.
+        (step이 고른 단계의 구간 길이보다 작으면 그 단계의 구간 길이를 사용)
+        """
+        position = self._positions[key]
+        if step is None:
+            step = max((end - start) / MAX_POINTS, 1)
+        tier = self.choose_tier(start, step)
+        step = max(step, tier.seconds)
+        # step이 구간 길이의 배수가 아니면 구간이 결과 두 개에 걸치므로 배수로 맞춤
+        step = math.ceil(step / tier.seconds) * tier.seconds
+        results = []
+        index = bisect.bisect_left(tier.starts, start - start % tier.seconds)
+        while index < len(tier.buckets):
+            bucket = tier.buckets[index]
+            index += 1
+            if bucket.start > end:
+                break
+            count = bucket.count[position]
+            if count == 0:
+                continue
+            group_start = bucket.start - bucket.start % step
+            if not results or results[-1]['start'] != group_start:
+                results.append({'start': group_start, 'count': 0, 'total': 0.0, 'min': math.inf, 'max': -math.inf,
+                                'last': None, 'last_time': -math.inf})
+            group = results[-1]
+            group['count'] += count
+            group['total'] += bucket.total[position]
+            group['min'] = min(group['min'], bucket.minimum[position])
+            group['max'] = max(group['max'], bucket.maximum[position])
+            if bucket.last_time[position] >= group['last_time']:
+                group['last'] = bucket.last[position]
+                group['last_time'] = bucket.last_time[position]
+        for group in results:
+            group['mean'] = group.pop('total') / group['count']
+            del group['last_time']
+        return results
+
+    def summary(self, key, start, end):
+        # [start, end] 전체를 하나로 요약한 값 (count, mean, min, max, last). 측정값이 없으면 None
+        groups = self.query(key, start, end)
+        if not groups:
+            return None
+        count = sum(group['count'] for group in groups)
+        return {
+            'count': count,
+            'mean': sum(group['mean'] * group['count'] for group in groups) / count,
+            'min': min(group['min'] for group in groups),
+            'max': max(group['max'] for group in groups),
+            'last': groups[-1]['last'],
+        }
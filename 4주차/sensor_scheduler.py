@@ -0,0 +1,108 @@
+import math
+import sys
+import threading
+import time
+
+# 일정한 주기로 작업을 실행하는 스케줄러 모듈.
+# 작업이 끝난 뒤 time.sleep(주기)를 하면 작업에 걸린 시간만큼 주기가 계속 밀리지만(drift),
+# 여기서는 시작 시각 + N × 주기를 monotonic 시계로 계산한 마감 시각(deadline)까지 기다리므로 밀리지 않음.
+# 기다리는 동안 stop_event가 설정되면 바로 깨어나므로, 'q' 입력을 매 주기마다 확인할 필요가 없음.
+
+POLICIES = ('skip', 'catch_up')
+
+class DeadlineScheduler:
+    """
+    DeadlineScheduler 클래스는 tick(scheduled_time)을 period초마다 마감 시각에 맞춰 호출합니다 (1초 미만 주기 가능).
+      - policy: 작업이 늦어져 마감 시각을 놓쳤을 때의 처리 방법
+          skip: 놓친 주기는 건너뛰고 다음 마감 시각에 실행 (missed에 셈)
+          catch_up: 놓친 주기를 쉬지 않고 바로 실행하되, 한 번에 max_catch_up회까지만 따라잡고 나머지는 건너뜀
+      - stats(): 실행 횟수, 놓친 주기 수, 주기보다 오래 걸린 작업 수, 지연(jitter: 마감 시각보다 늦게 시작한 시간)의
+        평균/표준편차/최댓값, 그리고 일정 이탈(drift: 실행할수록 지연이 늘거나 주는 정도, 경과 1초당 지연 변화(초))를 반환.
+        drift는 (시작 후 경과 시간, 지연) 쌍의 최소제곱 기울기이므로, 한 번 늦은 실행은 jitter에만 나타나고
+        지연이 꾸준히 쌓일 때만 0보다 커짐
+    """
+    def __init__(self, period, policy='skip', max_catch_up=10):
+        if period <= 0:
+            raise ValueError('period는 0보다 커야 합니다.')
+        if policy not in POLICIES:
+            raise ValueError('알 수 없는 정책입니다: ' + policy)
+        self.period = period
+        self.policy = policy
+        self.max_catch_up = max_catch_up
+        self.ticks = 0
+        self.missed = 0
+        self.overruns = 0
+        self._jitter_total = 0.0
+        self._jitter_squares = 0.0
+        self._jitter_max = 0.0
+        # drift(지연의 기울기) 계산용: 경과 시간/지연의 평균과 편차 곱의 합 (한 번에 갱신하는 방식이라 측정값을 보관하지 않음)
+        self._elapsed_mean = 0.0
+        self._lateness_mean = 0.0
+        self._elapsed_squares = 0.0
+        self._products = 0.0
+
+    def run(self, tick, stop_event=None, max_ticks=None):
+        # stop_event가 설정되거나 max_ticks번 실행할 때까지 tick을 실행
+        stop_event = stop_event or threading.Event()
+        origin = time.monotonic()
+        index = 0  # 다음에 실행할 주기 번호 (마감 시각 = origin + index × period)
+        catch_up = 0
+        while not stop_event.is_set() and (max_ticks is None or self.ticks < max_ticks):
+            deadline = origin + index * self.period
+            remaining = deadline - time.monotonic()
+            if remaining > 0 and stop_event.wait(remaining):
+                break
+            started = time.monotonic()
+            self._record(started - deadline, deadline - origin)
+            tick(deadline)
+            finished = time.monotonic()
+            if finished - started > self.period:
+                self.overruns += 1
+            index += 1
+            # 다음 마감 시각을 이미 지났으면 정책에 따라 따라잡거나 건너뜀
+            behind = int((finished - origin) // self.period) + 1 - index
+            if behind <= 0:
+                catch_up = 0
+            elif self.policy == 'catch_up' and catch_up < self.max_catch_up:
+                catch_up += 1
+            else:
+                self.missed += behind
+                index += behind
+                catch_up = 0
+
+    def _record(self, lateness, elapsed):
+        lateness = max(lateness, 0.0)
+        self.ticks += 1
+        self._jitter_total += lateness
+        self._jitter_squares += lateness * lateness
+        self._jitter_max = max(self._jitter_max, lateness)
+        elapsed_delta = elapsed - self._elapsed_mean
+        self._elapsed_mean += elapsed_delta / self.ticks
+        self._lateness_mean += (lateness - self._lateness_mean) / self.ticks
+        self._elapsed_squares += elapsed_delta * (elapsed - self._elapsed_mean)
+        self._products += elapsed_delta * (lateness - self._lateness_mean)
+
+    def stats(self):
+        mean = self._jitter_total / self.ticks if self.ticks else 0.0
+        variance = self._jitter_squares / self.ticks - mean * mean if self.ticks else 0.0
+        return {
+            'ticks': self.ticks,
+            'missed': self.missed,
+            'overruns': self.overruns,
+            'jitter_mean': mean,
+            'jitter_stdev': math.sqrt(max(variance, 0.0)),
+            'jitter_max': self._jitter_max,
+            'drift': self._products / self._elapsed_squares if self._elapsed_squares > 0 else 0.0,
+        }
+
+def watch_stdin(stop_event, command='q'):
+    # 표준 입력을 별도 스레드에서 읽다가 command가 입력되면 stop_event를 설정 (입력이 끝나면 스레드만 종료)
+    def watch():
+        for line in sys.stdin:
+            if line.strip().lower() == command:
+                stop_event.set()
+                return
+
+    thread = threading.Thread(target=watch, name='stdin-watcher', daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,87 @@
+import argparse
+import time
+
+# 부하 테스트용으로 여러 기지(habitat)의 센서 측정값을 한꺼번에 만드는 모듈.
+# DummySensor.set_env()는 측정 한 번에 random.uniform과 round를 6번씩 호출하지만,
+# 여기서는 N개 기지 × T번 측정의 값을 NumPy 배열로 한 번에 생성함 (같은 6개 항목, 같은 범위).
+# numpy는 이 모듈의 함수를 호출할 때만 불러오므로, numpy가 없어도 DummySensor는 그대로 동작함.
+# 실행: python sensor_simulator.py --habitats 1000 --steps 17280 --block-steps 720 --seed 42
+
+# 센서 항목별 (최솟값, 최댓값, 반올림 자릿수). DummySensor.set_env()와 같은 범위를 사용
+SENSOR_RANGES = {
+    'mars_base_internal_temperature': (18, 30, 2),
+    'mars_base_external_temperature': (0, 21, 2),
+    'mars_base_internal_humidity': (50, 60, 2),
+    'mars_base_external_illuminance': (500, 715, 2),
+    'mars_base_internal_co2': (0.02, 0.1, 3),
+    'mars_base_internal_oxygen': (4, 7, 2),
+}
+
+def _require_numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError('대량 센서 시뮬레이션에는 numpy가 필요합니다: pip install numpy') from None
+    return numpy
+
+def _generate(np, rng, habitats, steps):
+    # 측정 시점 순서로 (steps, 항목 수, habitats) 크기의 난수를 한 번에 뽑은 뒤 항목별 (habitats, steps) 배열로 나눔.
+    # 시점 순서로 뽑으므로 블록 단위로 나누어 생성해도 한 번에 생성한 결과와 같은 값이 나옴.
+    lows = np.array([low for low, _, _ in SENSOR_RANGES.values()], dtype=np.float64)[:, None]
+    highs = np.array([high for _, high, _ in SENSOR_RANGES.values()], dtype=np.float64)[:, None]
+    samples = rng.uniform(lows, highs, size=(steps, len(SENSOR_RANGES), habitats))
+    readings = {}
+    for index, (key, (_, _, digits)) in enumerate(SENSOR_RANGES.items()):
+        values = np.ascontiguousarray(samples[:, index, :].T)
+        readings[key] = np.round(values, digits, out=values)
+    return readings
+
+def simulate_readings(habitats, steps, seed=None):
+    """
+    habitats개 기지의 steps번 측정값을 한 번에 생성하여 {센서 항목: (habitats, steps) 크기의 float64 배열}로 반환합니다.
+    seed가 같으면 항상 같은 값을 생성합니다. 값이 많으면 메모리를 habitats × steps × 6 × 8바이트만큼 쓰므로,
+    큰 부하 테스트에는 iter_reading_blocks()를 사용합니다.
+    """
+    np = _require_numpy()
+    return _generate(np, np.random.default_rng(seed), habitats, steps)
+
+def iter_reading_blocks(habitats, steps, block_steps, seed=None):
+    """
+    simulate_readings()와 같은 값을 block_steps번 측정 단위로 나누어 반환하는 제너레이터입니다.
+    (시작 측정 번호, {센서 항목: (habitats, 블록 크기) 배열})을 반환하며, 마지막 블록은 더 작을 수 있습니다.
+    메모리에는 블록 하나만 올라가며, seed가 같으면 블록 크기와 상관없이 simulate_readings()와 같은 값이 나옵니다.
+    """
+    if block_steps < 1:
+        raise ValueError('block_steps는 1 이상이어야 합니다.')
+    np = _require_numpy()
+    rng = np.random.default_rng(seed)
+    for start in range(0, steps, block_steps):
+        yield start, _generate(np, rng, habitats, min(block_steps, steps - start))
+
+def main():
+    parser = argparse.ArgumentParser(description='여러 기지의 센서 측정값을 한꺼번에 생성하는 부하 테스트용 시뮬레이터')
+    parser.add_argument('--habitats', type=int, default=1000, help='기지 수 (기본값: 1000)')
+    parser.add_argument('--steps', type=int, default=720, help='기지마다 측정 횟수 (기본값: 720, 5초 간격으로 1시간)')
+    parser.add_argument('--block-steps', type=int, default=0, help='이 측정 횟수 단위로 나누어 생성 (기본값: 0, 한 번에 생성)')
+    parser.add_argument('--seed', type=int, default=None, help='난수 시드 (같은 시드는 같은 값을 생성)')
+    args = parser.parse_args()
+
+    try:
+        started = time.perf_counter()
+        if args.block_steps > 0:
+            blocks = iter_reading_blocks(args.habitats, args.steps, args.block_steps, args.seed)
+        else:
+            blocks = [(0, simulate_readings(args.habitats, args.steps, args.seed))]
+        block_count = 0
+        for _, readings in blocks:
+            block_count += 1
+        elapsed = time.perf_counter() - started
+    except Exception as e:
+        print('센서 데이터 생성 중 오류가 발생했습니다:', e)
+        return
+    total = args.habitats * args.steps
+    print('생성한 측정값: %d개 (기지 %d개 × %d번, 블록 %d개)' % (total, args.habitats, args.steps, block_count))
+    print('소요 시간: %.3f초 (초당 %.0f개)' % (elapsed, total / elapsed if elapsed > 0 else 0))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+import json
+import os
+import sys
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime
+
+from sensor_store import SENSOR_KEYS, pack_record
+
+# 측정값을 내보내는 출력 대상(sink) 모듈.
+# 측정할 때마다 JSON을 들여쓰기하여 화면에 출력하면 주기가 짧을 때 출력 자체가 병목이 되므로,
+# 측정값을 sink마다 버퍼에 모았다가 개수(max_records)나 시간(max_delay)이 차면 한 번에 씀.
+#   - NdjsonSink: 한 줄에 JSON 하나 (공백 없는 형식)
+#   - CsvSink: timestamp와 센서 값 열로 된 CSV
+#   - BinarySink: 고정 폭 레코드 (측정 시각 float64 + 센서 값 float64 6개, sensor_store.py의 레코드와 같은 형식)
+#   - ConsolePrettySink: 기존처럼 들여쓰기한 JSON을 화면에 출력하되, min_interval초에 한 번만 출력
+# 시간 조건은 write()를 호출할 때 확인하므로, 마지막 측정값은 close()에서 씀.
+
+def format_timestamp(timestamp):
+    return datetime.fromtimestamp(timestamp).isoformat(timespec='milliseconds')
+
+class BatchedSink(ABC):
+    """
+    BatchedSink 클래스는 측정값을 버퍼에 모았다가 max_records개가 모이거나 첫 측정값이 들어온 뒤
+    max_delay초가 지나면 한 번에 쓰는 sink의 기본 클래스입니다.
+    하위 클래스는 반드시 encode(timestamp, values)를 구현하여 측정값 하나를 bytes나 str로 바꾸고, 필요하면 open_output()을 바꿉니다.
+    """
+    binary = False
+
+    def __init__(self, filepath, max_records=256, max_delay=1.0):
+        self.filepath = filepath
+        self.max_records = max_records
+        self.max_delay = max_delay
+        self.written = 0
+        self._buffer = []
+        self._first_time = None
+        self._file = None
+
+    def write(self, timestamp, values):
+        # 측정값 하나(epoch 초, {센서 이름: 값})를 버퍼에 추가하고, 조건이 차면 파일에 씀
+        if not self._buffer:
+            self._first_time = time.monotonic()
+        self._buffer.append(self.encode(timestamp, values))
+        if len(self._buffer) >= self.max_records or time.monotonic() - self._first_time >= self.max_delay:
+            self.flush()
+
+    def flush(self):
+        if not self._buffer:
+            return
+        try:
+            if self._file is None:
+                self._file = self.open_output()
+            self._file.write((b'' if self.binary else '').join(self._buffer))
+            self._file.flush()
+            self.written += len(self._buffer)
+        except Exception as e:
+            print(f'{self.filepath} 저장 중 오류: {e}')
+        self._buffer = []
+
+    def open_output(self):
+        if self.binary:
+            return open(self.filepath, 'ab')
+        return open(self.filepath, 'a', encoding='utf-8')
+
+    @abstractmethod
+    def encode(self, timestamp, values):
+        pass
+
+    def close(self):
+        self.flush()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+class NdjsonSink(BatchedSink):
+    def encode(self, timestamp, values):
+        record = {'timestamp': format_timestamp(timestamp), **values}
+        return json.dumps(record, separators=(',', ':')) + '\n'
+
+class CsvSink(BatchedSink):
+    def open_output(self):
+        # 새 파일이면 헤더를 먼저 씀
+        is_new = not os.path.exists(self.filepath) or os.path.getsize(self.filepath) == 0
+        f = open(self.filepath, 'a', encoding='utf-8')
+        if is_new:
+            f.write(','.join(('timestamp',) + SENSOR_KEYS) + '\n')
+        return f
+
+    def encode(self, timestamp, values):
+        cells = ['' if values.get(key) is None else repr(values[key]) for key in SENSOR_KEYS]
+        return format_timestamp(timestamp) + ',' + ','.join(cells) + '\n'
+
+class BinarySink(BatchedSink):
+    binary = True
+
+    def encode(self, timestamp, values):
+        return pack_record(timestamp, values)
+
+class ConsolePrettySink:
+    """
+    ConsolePrettySink 클래스는 측정값을 들여쓰기한 JSON으로 화면에 출력합니다.
+    min_interval초 안에 들어온 측정값은 출력하지 않고 건너뛰며(skipped에 셈), 0이면 모든 측정값을 출력합니다.
+    """
+    def __init__(self, min_interval=5.0, stream=None):
+        self.min_interval = min_interval
+        self.stream = stream or sys.stdout
+        self.skipped = 0
+        self._last_time = None
+
+    def write(self, timestamp, values):
+        now = time.monotonic()
+        if self._last_time is not None and now - self._last_time < self.min_interval:
+            self.skipped += 1
+            return
+        self._last_time = now
+        output = {'timestamp': datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M:%S'), **values}
+        self.stream.write(json.dumps(output, indent=4) + '\n')
+
+    def flush(self):
+        self.stream.flush()
+
+    def close(self):
+        self.flush()
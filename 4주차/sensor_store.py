@@ -0,0 +1,246 @@
+import argparse
+import json
+import math
+import mmap
+import os
+import struct
+from datetime import datetime
+
+from sensor_simulator import SENSOR_RANGES
+
+# 센서 측정값을 고정 폭 이진 레코드로 세그먼트 파일에 이어 쓰는(append-only) 저장소.
+# 레코드 하나는 측정 시각(epoch 초, float64)과 6개 센서 값(float64, 값이 없으면 NaN)으로 이루어진 56바이트이며,
+# 세그먼트 파일(segment_000000.seg, ...)마다 다음 헤더가 앞에 붙음:
+#   매직, 버전, 플래그(시각 순서로 쓰였는지), 레코드 크기, 레코드 수, 가장 이른/늦은 측정 시각
+# 시간 범위로 조회할 때는 헤더의 최솟값/최댓값만 보고 범위 밖의 세그먼트를 건너뛰고,
+# 나머지 세그먼트는 mmap으로 열어 시각 순서로 쓰인 경우 이진 탐색으로 시작 위치를 찾음.
+# 실행: python sensor_store.py sensor_store --export sensor_readings.ndjson --start "2026-01-01 00:00:00"
+
+STORE_DIRNAME = 'sensor_store'
+SEGMENT_MAGIC = b'MSENSEG1'
+SEGMENT_VERSION = 1
+SEGMENT_RECORDS = 100000
+# 헤더: 매직, 버전, 플래그, 레코드 크기, 레코드 수, 가장 이른 측정 시각, 가장 늦은 측정 시각
+_HEADER = struct.Struct('<8sHHIQdd')
+_FLAG_SORTED = 1
+SENSOR_KEYS = tuple(SENSOR_RANGES.keys())
+# 레코드: 측정 시각, SENSOR_KEYS 순서의 센서 값 (이진 sink(sensor_sinks.BinarySink)도 같은 형식으로 씀)
+RECORD = struct.Struct('<d%dd' % len(SENSOR_KEYS))
+# 쓰기 버퍼에 모아 두는 최대 레코드 수 (이만큼 모이면 파일에 씀)
+BUFFER_RECORDS = 1024
+
+def _segment_name(number):
+    return 'segment_%06d.seg' % number
+
+def pack_record(timestamp, values):
+    # 측정값 하나(epoch 초, {센서 이름: 값})를 레코드 bytes로 변환 (값이 없는 센서는 NaN)
+    return RECORD.pack(timestamp, *(math.nan if values.get(key) is None else values[key] for key in SENSOR_KEYS))
+
+class _Segment:
+    """세그먼트 파일 하나의 헤더 정보 (파일 크기로 계산한 레코드 수를 우선 사용)"""
+    __slots__ = ('path', 'number', 'count', 'min_time', 'max_time', 'sorted')
+
+    def __init__(self, path, number):
+        self.path = path
+        self.number = number
+        with open(path, 'rb') as f:
+            header = f.read(_HEADER.size)
+            size = os.fstat(f.fileno()).st_size
+        if len(header) < _HEADER.size:
+            raise ValueError('세그먼트 헤더가 올바르지 않습니다: ' + path)
+        magic, version, flags, record_size, count, min_time, max_time = _HEADER.unpack(header)
+        if magic != SEGMENT_MAGIC or version != SEGMENT_VERSION or record_size != RECORD.size:
+            raise ValueError('지원하지 않는 세그먼트 파일입니다: ' + path)
+        actual = (size - _HEADER.size) // RECORD.size
+        self.count = actual
+        self.sorted = bool(flags & _FLAG_SORTED)
+        self.min_time = min_time
+        self.max_time = max_time
+        if actual != count:
+            # 헤더를 갱신하기 전에 중단된 경우: 레코드를 훑어 헤더 정보를 다시 계산
+            self._rescan()
+
+    def _rescan(self):
+        self.min_time = math.inf
+        self.max_time = -math.inf
+        self.sorted = True
+        previous = -math.inf
+        for timestamp in self.timestamps():
+            self.min_time = min(self.min_time, timestamp)
+            self.max_time = max(self.max_time, timestamp)
+            self.sorted = self.sorted and timestamp >= previous
+            previous = timestamp
+
+    def timestamps(self):
+        with open(self.path, 'rb') as f:
+            f.seek(_HEADER.size)
+            data = f.read(self.count * RECORD.size)
+        return [record[0] for record in RECORD.iter_unpack(data)]
+
+    def overlaps(self, start, end):
+        return self.count > 0 and self.max_time >= start and self.min_time <= end
+
+    def records(self, start, end):
+        # [start, end] 범위의 레코드를 (측정 시각, 값 튜플)로 반환 (mmap으로 필요한 구간만 읽음)
+        with open(self.path, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                first, last = 0, self.count
+                if self.sorted:
+                    first = self._search(mm, start, False)
+                    last = self._search(mm, end, True)
+                view = memoryview(mm)[_HEADER.size + first * RECORD.size:_HEADER.size + last * RECORD.size]
+                try:
+                    for record in RECORD.iter_unpack(view):
+                        if start <= record[0] <= end:
+                            yield record[0], record[1:]
+                finally:
+                    view.release()
+
+    def _search(self, mm, timestamp, after):
+        # 시각 순서로 쓰인 세그먼트에서 timestamp 이상(after이면 초과)인 첫 레코드의 번호 (이진 탐색)
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            value = struct.unpack_from('<d', mm, _HEADER.size + middle * RECORD.size)[0]
+            if value < timestamp or (after and value == timestamp):
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+class SensorStore:
+    """
+    SensorStore 클래스는 센서 측정값을 directory 안의 세그먼트 파일들에 이어 쓰고 시간 범위로 조회합니다.
+      - segment_records: 세그먼트 하나에 담는 최대 레코드 수 (가득 차면 새 세그먼트를 만듦)
+      - append(timestamp, values): 측정값 하나를 추가 (values는 {센서 이름: 값}, 없는 값은 NaN으로 저장)
+      - query(start, end): 측정 시각이 [start, end]인 (시각, {센서 이름: 값})을 세그먼트 순서대로 반환
+      - export_ndjson(filepath, start, end): 조회 결과를 한 줄에 JSON 하나씩 저장
+    쓰기는 버퍼에 모았다가 BUFFER_RECORDS개마다, 또는 flush()/close()/조회할 때 파일에 씁니다.
+    """
+    def __init__(self, directory=STORE_DIRNAME, segment_records=SEGMENT_RECORDS):
+        self.directory = directory
+        self.segment_records = segment_records
+        os.makedirs(directory, exist_ok=True)
+        self.segments = []
+        for name in sorted(os.listdir(directory)):
+            if name.startswith('segment_') and name.endswith('.seg'):
+                self.segments.append(_Segment(os.path.join(directory, name), int(name[8:-4])))
+        self._buffer = []
+        self._file = None
+
+    def append(self, timestamp, values):
+        self._buffer.append(pack_record(timestamp, values))
+        if len(self._buffer) >= BUFFER_RECORDS:
+            self.flush()
+
+    def flush(self):
+        # 버퍼의 레코드를 현재 세그먼트에 쓰고 헤더(레코드 수, 최솟값/최댓값, 정렬 여부)를 갱신
+        while self._buffer:
+            segment = self._active_segment()
+            room = self.segment_records - segment.count
+            chunk, self._buffer = self._buffer[:room], self._buffer[room:]
+            for record in chunk:
+                timestamp = RECORD.unpack_from(record)[0]
+                segment.sorted = segment.sorted and (segment.count == 0 or timestamp >= segment.max_time)
+                segment.min_time = min(segment.min_time, timestamp)
+                segment.max_time = max(segment.max_time, timestamp)
+                segment.count += 1
+            self._file.seek(0, os.SEEK_END)
+            self._file.write(b''.join(chunk))
+            self._write_header(segment)
+            self._file.flush()
+
+    def _active_segment(self):
+        # 레코드를 더 쓸 수 있는 마지막 세그먼트를 열어 반환 (없거나 가득 찼으면 새로 만듦)
+        if self.segments and self.segments[-1].count < self.segment_records:
+            segment = self.segments[-1]
+            if self._file is None:
+                self._file = open(segment.path, 'r+b')
+                # 레코드를 쓰다 중단되어 남은 불완전한 레코드는 잘라냄
+                self._file.truncate(_HEADER.size + segment.count * RECORD.size)
+            return segment
+        if self._file is not None:
+            self._file.close()
+        number = self.segments[-1].number + 1 if self.segments else 0
+        path = os.path.join(self.directory, _segment_name(number))
+        self._file = open(path, 'w+b')
+        self._file.write(_HEADER.pack(SEGMENT_MAGIC, SEGMENT_VERSION, _FLAG_SORTED, RECORD.size, 0, math.inf, -math.inf))
+        self._file.flush()
+        segment = _Segment(path, number)
+        self.segments.append(segment)
+        return segment
+
+    def _write_header(self, segment):
+        self._file.seek(0)
+        self._file.write(_HEADER.pack(SEGMENT_MAGIC, SEGMENT_VERSION, _FLAG_SORTED if segment.sorted else 0,
+                                      RECORD.size, segment.count, segment.min_time, segment.max_time))
+
+    def close(self):
+        self.flush()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return sum(segment.count for segment in self.segments) + len(self._buffer)
+
+    def query(self, start=None, end=None):
+        # 측정 시각이 [start, end]인 측정값을 (시각, {센서 이름: 값}) 으로 반환하는 제너레이터 (NaN은 None)
+        self.flush()
+        start = -math.inf if start is None else start
+        end = math.inf if end is None else end
+        for segment in list(self.segments):
+            if not segment.overlaps(start, end):
+                continue
+            for timestamp, values in segment.records(start, end):
+                yield timestamp, {key: None if math.isnan(value) else value for key, value in zip(SENSOR_KEYS, values)}
+
+    def export_ndjson(self, filepath, start=None, end=None):
+        # 조회 결과를 NDJSON(한 줄에 JSON 하나) 형식으로 저장하고 저장한 측정값 수를 반환
+        count = 0
+        with open(filepath, 'w', encoding='utf-8') as f:
+            for timestamp, values in self.query(start, end):
+                record = {'timestamp': datetime.fromtimestamp(timestamp).isoformat(timespec='milliseconds'), **values}
+                f.write(json.dumps(record, separators=(',', ':')) + '\n')
+                count += 1
+        return count
+
+def parse_time(text):
+    # '2026-01-01 00:00:00' 형식이나 epoch 초를 epoch 초(float)로 변환
+    if text is None:
+        return None
+    try:
+        return float(text)
+    except ValueError:
+        return datetime.strptime(text, '%Y-%m-%d %H:%M:%S').timestamp()
+
+def main():
+    parser = argparse.ArgumentParser(description='센서 측정값 저장소의 세그먼트를 확인하고 NDJSON으로 내보내는 도구')
+    parser.add_argument('directory', nargs='?', default=STORE_DIRNAME, help='저장소 디렉터리 (기본값: ' + STORE_DIRNAME + ')')
+    parser.add_argument('--start', help='시작 시각 ("YYYY-MM-DD HH:MM:SS" 또는 epoch 초)')
+    parser.add_argument('--end', help='끝 시각 ("YYYY-MM-DD HH:MM:SS" 또는 epoch 초)')
+    parser.add_argument('--export', help='조회 결과를 저장할 NDJSON 파일')
+    args = parser.parse_args()
+
+    try:
+        store = SensorStore(args.directory)
+        start, end = parse_time(args.start), parse_time(args.end)
+        print('%-22s %10s %-19s %-19s' % ('segment', 'records', 'first', 'last'))
+        for segment in store.segments:
+            first = datetime.fromtimestamp(segment.min_time).strftime('%Y-%m-%d %H:%M:%S') if segment.count else '-'
+            last = datetime.fromtimestamp(segment.max_time).strftime('%Y-%m-%d %H:%M:%S') if segment.count else '-'
+            print('%-22s %10d %-19s %-19s' % (os.path.basename(segment.path), segment.count, first, last))
+        if args.export:
+            count = store.export_ndjson(args.export, start, end)
+            print('%d개의 측정값을 %s에 저장했습니다.' % (count, args.export))
+    except Exception as e:
+        print('센서 저장소를 읽는 중 오류가 발생했습니다:', e)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+import math
+from array import array
+from collections import deque
+
+# 센서 하나의 최근 측정값을 고정 크기 배열(ring buffer)에 보관하고,
+# 여러 시간 창(예: 1분, 5분, 1시간)의 합계/최솟값/최댓값/분산을 측정값이 들어올 때마다 갱신하는 모듈.
+# 평균 등을 구할 때 측정값 목록을 다시 훑지 않으므로 O(1)이며, 메모리는 버퍼 크기로 고정됨.
+
+# 기본 시간 창 (이름: 초)
+DEFAULT_WINDOWS = {'1m': 60, '5m': 300, '1h': 3600}
+
+class _Window:
+    """
+    시간 창 하나의 누적값. 창에 들어 있는 측정값은 ring buffer의 순번(seq) start 이상인 값들입니다.
+    최솟값/최댓값은 단조(monotonic) deque로 관리하여 창에서 빠지는 값이 있어도 O(1)(분할 상환)로 구합니다.
+    """
+    __slots__ = ('seconds', 'start', 'total', 'total_squares', 'min_seqs', 'max_seqs', 'evicted')
+
+    def __init__(self, seconds, start):
+        self.seconds = seconds
+        self.start = start
+        self.total = 0.0
+        self.total_squares = 0.0
+        self.min_seqs = deque()
+        self.max_seqs = deque()
+        self.evicted = 0
+
+class SensorRingBuffer:
+    """
+    SensorRingBuffer 클래스는 센서 하나의 (시각, 값)을 array('d') 두 개로 된 ring buffer에 보관합니다.
+      - windows: {이름: 초} 형식의 시간 창 설정 (기본값: 1분/5분/1시간)
+      - capacity: 보관할 최대 측정값 수. 가장 긴 창 동안 들어오는 측정값 수 이상이어야 그 창의 통계가 정확합니다.
+    모든 창이 같은 버퍼를 공유하며, 창마다 시작 위치와 누적 합계/제곱합, 최솟값/최댓값 deque만 따로 가집니다.
+    """
+    def __init__(self, capacity, windows=None):
+        if capacity < 1:
+            raise ValueError('capacity는 1 이상이어야 합니다.')
+        self.capacity = capacity
+        self.times = array('d', bytes(8 * capacity))
+        self.values = array('d', bytes(8 * capacity))
+        self.count = 0  # 지금까지 들어온 측정값 수 (다음 측정값의 순번)
+        self.windows = {name: _Window(seconds, 0) for name, seconds in (windows or DEFAULT_WINDOWS).items()}
+
+    def add(self, timestamp, value):
+        # 측정값 하나를 추가하고 모든 창의 누적값을 갱신 (창 수에 비례하는 O(1) 분할 상환)
+        seq = self.count
+        slot = seq % self.capacity
+        # 덮어쓸 가장 오래된 값은 먼저 모든 창에서 뺌
+        if seq >= self.capacity:
+            for window in self.windows.values():
+                self._evict_until(window, seq - self.capacity + 1)
+        self.times[slot] = timestamp
+        self.values[slot] = value
+        self.count = seq + 1
+        for window in self.windows.values():
+            window.total += value
+            window.total_squares += value * value
+            while window.min_seqs and self._value(window.min_seqs[-1]) >= value:
+                window.min_seqs.pop()
+            window.min_seqs.append(seq)
+            while window.max_seqs and self._value(window.max_seqs[-1]) <= value:
+                window.max_seqs.pop()
+            window.max_seqs.append(seq)
+            # 시간 창을 벗어난 오래된 값을 앞에서부터 뺌
+            start = window.start
+            while start < seq and self.times[start % self.capacity] <= timestamp - window.seconds:
+                start += 1
+            self._evict_until(window, start)
+
+    def _value(self, seq):
+        return self.values[seq % self.capacity]
+
+    def _evict_until(self, window, start):
+        # 창의 시작 순번을 start까지 옮기면서 빠지는 값을 누적값에서 뺌
+        while window.start < start:
+            value = self._value(window.start)
+            window.total -= value
+            window.total_squares -= value * value
+            if window.min_seqs and window.min_seqs[0] == window.start:
+                window.min_seqs.popleft()
+            if window.max_seqs and window.max_seqs[0] == window.start:
+                window.max_seqs.popleft()
+            window.start += 1
+            window.evicted += 1
+        # 더하고 빼기를 반복하면 부동소수점 오차가 쌓이므로, 버퍼 크기만큼 뺄 때마다 창 안의 값으로 다시 계산
+        if window.evicted >= self.capacity:
+            window.evicted = 0
+            window.total = 0.0
+            window.total_squares = 0.0
+            for seq in range(window.start, self.count):
+                value = self._value(seq)
+                window.total += value
+                window.total_squares += value * value
+
+    def stats(self, name):
+        # 창 하나의 통계를 O(1)로 반환: count, mean, min, max, variance(모분산). 값이 없으면 count 0과 None들
+        window = self.windows[name]
+        count = self.count - window.start
+        if count <= 0:
+            return {'count': 0, 'mean': None, 'min': None, 'max': None, 'variance': None}
+        mean = window.total / count
+        variance = max(window.total_squares / count - mean * mean, 0.0)
+        return {
+            'count': count,
+            'mean': mean,
+            'min': self._value(window.min_seqs[0]),
+            'max': self._value(window.max_seqs[0]),
+            'variance': variance,
+        }
+
+    def mean(self, name):
+        return self.stats(name)['mean']
+
+def capacity_for(windows, sample_rate):
+    # 가장 긴 창 동안 sample_rate(Hz)로 들어오는 측정값을 모두 담을 수 있는 버퍼 크기
+    return int(math.ceil(max(windows.values()) * sample_rate)) + 1